@@ -0,0 +1,98 @@
+"""
+Cold-import benchmark for the LifeLine AI engine.
+
+Each sample starts a fresh interpreter, so nothing is cached in sys.modules.
+The engine modules (triage, guidance, summary) are timed against the
+Streamlit UI module (`import lifeline_ai`), and the run fails if the
+engine ever pulls in Streamlit or exceeds --max-ms.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 15] [--max-ms 50]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENGINE_MODULES = 'lifeline.triage, lifeline.guidance, lifeline.summary'
+UI_MODULES = 'lifeline_ai'
+
+# Timed inside the child interpreter so process start-up is excluded
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'streamlit': 'streamlit' in sys.modules}}))
+"""
+
+
+def sample_import(modules):
+    """Import modules in a fresh interpreter; returns (milliseconds, streamlit_loaded)"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=modules)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return data['ms'], data['streamlit']
+
+
+def measure(label, modules, runs):
+    """Median/min/max cold import time over several fresh interpreters"""
+    samples = []
+    streamlit_loaded = False
+    for _ in range(runs):
+        ms, loaded = sample_import(modules)
+        samples.append(ms)
+        streamlit_loaded = streamlit_loaded or loaded
+    return {
+        'label': label,
+        'modules': modules,
+        'median_ms': round(statistics.median(samples), 2),
+        'min_ms': round(min(samples), 2),
+        'max_ms': round(max(samples), 2),
+        'imports_streamlit': streamlit_loaded
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='Fresh interpreters per module')
+    parser.add_argument('--max-ms', type=float, default=50.0,
+                        help='Fail if the engine median import time exceeds this')
+    parser.add_argument('--skip-ui', action='store_true',
+                        help='Only time the engine (e.g. when Streamlit is not installed)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = [measure('engine', ENGINE_MODULES, args.runs)]
+    if not args.skip_ui:
+        results.append(measure('ui', UI_MODULES, args.runs))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            print(f"{r['label']:<8} median {r['median_ms']:>8.2f} ms   "
+                  f"min {r['min_ms']:>8.2f} ms   max {r['max_ms']:>8.2f} ms   "
+                  f"streamlit={'yes' if r['imports_streamlit'] else 'no'}")
+        if len(results) == 2 and results[0]['median_ms'] > 0:
+            print(f"engine is {results[1]['median_ms'] / results[0]['median_ms']:.0f}x faster to import")
+
+    engine = results[0]
+    if engine['imports_streamlit']:
+        print('FAIL: importing the engine pulled in streamlit', file=sys.stderr)
+        return 1
+    if engine['median_ms'] > args.max_ms:
+        print(f"FAIL: engine import {engine['median_ms']} ms > {args.max_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,456 @@
+"""
+Benchmark suite for the triage, guidance, summary and rerun hot paths.
+
+Cases:
+  classify/*      EmergencyClassifier.classify_emergency on seeded synthetic
+                  descriptions (8 / 64 / 512 words at 0%, 10% and 50% keyword
+                  density) and on a corpus of realistic descriptions;
+                  classify/score-* and classify/batch-* run the same corpus
+                  through weighted scoring, one call per text and vectorized;
+                  classify/typos uses misspelled descriptions (fuzzy lookup)
+  negation/*      keyword matching with the negation-scope pass off and on,
+                  on descriptions full of negations (8 / 64 / 512 words); the
+                  on/off ratio is the cost of the extra pass
+  language/*      language detection plus classification with the detected
+                  locale's classifier (English, Spanish, Vietnamese), and the
+                  one-off cost of compiling a locale's classifier
+  speech/*        SpeechIntake on a 10 s call in 100 ms chunks with the
+                  scripted recognizer: re-triage of every partial transcript
+  guidance/*      EmergencyGuidance.get_guidance_steps (known and unknown types)
+  summary/*       the emergency summary with 10 / 100 / 1000 logged actions,
+                  built from scratch ("cold") and viewed again unchanged ("warm")
+  store/*         IncidentStore: queuing one changed incident per rerun (sync)
+                  and resuming an incident with 100 actions from SQLite (load)
+  apptest/*       one full simulated Streamlit rerun of show_emergency_interface
+                  via streamlit.testing AppTest (skipped without Streamlit)
+
+Results can be saved as a JSON baseline and later compared against it; the
+run fails (exit 1) if any case is slower than the baseline by more than
+--threshold. Cases are compared on their fastest round (min), which is far
+less sensitive to scheduler noise than the median. Baselines are
+machine-specific: record one per machine.
+
+Usage:
+    python benchmarks/bench_suite.py [--filter classify] [--repeat 7]
+                                     [--save benchmarks/baseline.json]
+                                     [--compare benchmarks/baseline.json --threshold 0.25]
+                                     [--corpus incidents.jsonl --field description] [--json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Keep AppTest's bare-mode and deprecation warnings out of the report
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+
+from lifeline.events import ACTION_LOGGED  # noqa: E402
+from lifeline.guidance import EmergencyGuidance  # noqa: E402
+from lifeline.language import classifier_for, load_keywords  # noqa: E402
+from lifeline.session import IncidentState  # noqa: E402
+from lifeline.speech import ScriptedBackend, SpeechIntake, iter_chunks  # noqa: E402
+from lifeline.store import IncidentStore  # noqa: E402
+from lifeline.summary import build_emergency_summary  # noqa: E402
+from lifeline.triage import EmergencyClassifier, TriageMatcher  # noqa: E402
+
+SEED = 1337
+WORD_COUNTS = (8, 64, 512)
+DENSITIES = (0.0, 0.1, 0.5)
+ACTION_COUNTS = (10, 100, 1000)
+
+FILLER = (
+    "the a person my friend he she is was on in at near floor kitchen street car "
+    "suddenly after before while we they just now seems very looks really and then"
+).split()
+
+CORPUS = [
+    "Person collapsed, not breathing, unresponsive",
+    "Heavy bleeding from deep cut on arm",
+    "Person is choking and cannot breathe",
+    "Person burned by hot liquid, severe pain",
+    "My dad suddenly has a drooping face and slurred speech, his arm feels weak",
+    "Fell off a ladder, leg looks broken and there is a lot of swelling",
+    "Child swallowed some pills from the cabinet, seems drowsy",
+    "Feeling dizzy and a little nauseous after standing up",
+    "Stung by a bee, now lips swelling and trouble breathing",
+    "Having a seizure on the floor, shaking, has not stopped for three minutes",
+    "Chest pain spreading to the left arm, sweating and short of breath",
+    "Minor scrape on the knee from falling off a bike"
+]
+
+TYPO_CORPUS = [
+    "Person colapsed, not breething, unresponsve",
+    "Heavy bleding from a deep cut",
+    "My son is choaking and cant breath",
+    "He is unconsious on the kitchen floor",
+    "Alergic reaction, lips sweling after peanuts",
+    "Fell and I think it is a fractrue, bad sprian"
+]
+
+LOCALE_CORPUS = {
+    'en': CORPUS,
+    'es': [
+        "Mi hijo no respira y está inconsciente",
+        "Sangrado abundante de una herida en el brazo",
+        "Se quemó la mano con agua hirviendo",
+        "La niña se tragó pastillas del botiquín",
+        "Mi padre tiene la cara caída y dificultad para hablar",
+        "Se cayó de la escalera y tiene la pierna rota"
+    ],
+    'vi': [
+        "Con tôi bị hóc, không thở được",
+        "Bố tôi bị đột quỵ, méo miệng",
+        "Bé bị bỏng nước sôi ở tay",
+        "Ông bị ngộ độc thuốc trừ sâu",
+        "me bi chay mau nhieu o chan",
+        "Anh ấy bị đau đầu và chóng mặt"
+    ]
+}
+
+NEGATIONS = ("not", "no", "denies", "never", "isn't", "without")
+
+
+def all_keywords():
+    keywords = set()
+    for group in (EmergencyClassifier.CRITICAL_KEYWORDS, EmergencyClassifier.URGENT_KEYWORDS,
+                  EmergencyClassifier.MONITOR_KEYWORDS):
+        keywords.update(group)
+    for group in EmergencyClassifier.EMERGENCY_TYPES.values():
+        keywords.update(group)
+    return sorted(keywords)
+
+
+def synthetic_descriptions(words, density, count=32, seed=SEED):
+    """Seeded descriptions of `words` words, each a keyword with probability `density`"""
+    rng = random.Random(f"{seed}-{words}-{density}")
+    keywords = all_keywords()
+    return [
+        ' '.join(rng.choice(keywords) if rng.random() < density else rng.choice(FILLER)
+                 for _ in range(words))
+        for _ in range(count)
+    ]
+
+
+def negated_descriptions(words, count=32, seed=SEED):
+    """Seeded descriptions where every fourth word is a negation cue and 20% are keywords"""
+    rng = random.Random(f"{seed}-negated-{words}")
+    keywords = all_keywords()
+    return [
+        ' '.join(rng.choice(NEGATIONS) if i % 4 == 0 else
+                 rng.choice(keywords) if rng.random() < 0.2 else rng.choice(FILLER)
+                 for i in range(words)).lower()
+        for _ in range(count)
+    ]
+
+
+def load_corpus(path, field):
+    with open(path, encoding='utf-8') as f:
+        return [record[field] for record in map(json.loads, filter(str.strip, f))
+                if isinstance(record.get(field), str)]
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+def classify_case(descriptions, mode=None):
+    classify = EmergencyClassifier.classify_emergency
+
+    def run():
+        for text in descriptions:
+            classify(text, mode=mode)
+    return run, len(descriptions)
+
+
+def classify_batch_case(descriptions, copies=100):
+    batch = descriptions * copies
+
+    def run():
+        EmergencyClassifier.classify_batch(batch, mode='score')
+    return run, len(batch)
+
+
+def language_case(descriptions):
+    def run():
+        for text in descriptions:
+            locale, classifier, text = classifier_for(text)
+            classifier.classify_emergency(text)
+    return run, len(descriptions)
+
+
+def language_compile_case(locale):
+    keywords = load_keywords(locale)
+
+    def run():
+        EmergencyClassifier.with_config(**keywords)
+    return run, 1
+
+
+def speech_case(script, seconds=10, rate=16000):
+    backend = ScriptedBackend(script)
+    chunks = list(iter_chunks(bytes(rate * seconds * 2), rate))
+
+    def run():
+        intake = SpeechIntake(backend, rate)
+        for chunk in chunks:
+            intake.feed(chunk)
+        intake.finish()
+    return run, len(chunks)
+
+
+def negation_case(descriptions, negation):
+    matcher = TriageMatcher(
+        {'critical': EmergencyClassifier.CRITICAL_KEYWORDS, 'urgent': EmergencyClassifier.URGENT_KEYWORDS,
+         'monitor': EmergencyClassifier.MONITOR_KEYWORDS},
+        EmergencyClassifier.EMERGENCY_TYPES, negation=negation
+    )
+
+    def run():
+        for text in descriptions:
+            matcher.match(text)
+    return run, len(descriptions)
+
+
+def guidance_case(types):
+    get_steps = EmergencyGuidance.get_guidance_steps
+
+    def run():
+        for emergency_type in types:
+            get_steps(emergency_type)
+    return run, len(types)
+
+
+def summary_incident(actions):
+    incident = IncidentState.start(
+        "Person collapsed, not breathing, unresponsive", 'critical', 'cardiac_arrest',
+        'Critical keywords detected', window=max(500, actions * 2)
+    )
+    steps = EmergencyGuidance.get_guidance_steps('cardiac_arrest')
+    for i in range(min(len(steps), 4)):
+        incident.complete_step(i, steps[i].title)
+    for i in range(actions):
+        incident.log_action(i % len(steps) + 1, f"Action number {i} taken by responder")
+    return incident, steps
+
+
+def summary_cold_case(actions):
+    """Full build from scratch, numbering every action (no incident caches)"""
+    incident, steps = summary_incident(actions)
+    action_lines = [f"Step {e.step}: {e.text}" for e in incident.log.of_kind(ACTION_LOGGED)]
+    completed = incident.completed_titles(steps)
+
+    def run():
+        build_emergency_summary(incident.emergency_type, incident.severity_level, '03:21',
+                                incident.description, action_lines, completed)
+    return run, 1
+
+
+def summary_warm_case(actions):
+    """Viewing an unchanged incident (what most reruns of the summary do)"""
+    incident, steps = summary_incident(actions)
+    incident.summary.render(incident, steps, '03:21')
+
+    def run():
+        incident.summary.render(incident, steps, '03:21')
+    return run, 1
+
+
+def temporary_store():
+    """(store in a fresh temporary directory, teardown closing both)"""
+    directory = tempfile.TemporaryDirectory()
+    store = IncidentStore(os.path.join(directory.name, 'bench.db'))
+
+    def teardown():
+        store.close()
+        directory.cleanup()
+    return store, teardown
+
+
+def store_sync_case():
+    """One logged action plus the per-rerun sync that queues it"""
+    store, teardown = temporary_store()
+    incident, _ = summary_incident(10)
+
+    def run():
+        incident.log_action(1, "Compressions continued")
+        store.sync(incident)
+    return run, 1, teardown
+
+
+def store_resume_case(actions=100):
+    """Reload recovery: read one incident and replay its event log"""
+    store, teardown = temporary_store()
+    incident, _ = summary_incident(actions)
+    store.sync(incident)
+    store.flush()
+
+    def run():
+        store.load(incident.incident_id)
+    return run, 1, teardown
+
+
+def apptest_case():
+    """One rerun of the guidance screen for an active cardiac-arrest incident"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, 'lifeline_ai.py'), default_timeout=60).run()
+    next(b for b in at.button if 'Cardiac Arrest' in b.label).click().run()
+    if at.exception or not at.session_state.incident.active:
+        raise RuntimeError(f"AppTest setup failed: {at.exception}")
+
+    def run():
+        at.run()
+    return run, 1
+
+
+def build_cases(args):
+    """(name, factory) pairs; factories return (callable, items_per_call[, teardown])"""
+    cases = []
+    for words in WORD_COUNTS:
+        for density in DENSITIES:
+            descriptions = synthetic_descriptions(words, density)
+            cases.append((f"classify/synthetic-{words}w-{int(density * 100)}pct",
+                          lambda d=descriptions: classify_case(d)))
+    corpus = load_corpus(args.corpus, args.field) if args.corpus else CORPUS
+    cases.append(('classify/corpus', lambda: classify_case(corpus)))
+    cases.append(('classify/score-corpus', lambda: classify_case(corpus, mode='score')))
+    cases.append(('classify/batch-corpus', lambda: classify_batch_case(corpus)))
+    cases.append(('classify/typos', lambda: classify_case(TYPO_CORPUS)))
+    for words in WORD_COUNTS:
+        descriptions = negated_descriptions(words)
+        cases.append((f"negation/off-{words}w", lambda d=descriptions: negation_case(d, False)))
+        cases.append((f"negation/on-{words}w", lambda d=descriptions: negation_case(d, True)))
+
+    for locale, descriptions in LOCALE_CORPUS.items():
+        cases.append((f"language/classify-{locale}", lambda d=descriptions: language_case(d)))
+    cases.append(('language/compile-es', lambda: language_compile_case('es')))
+    cases.append(('speech/incremental-en', lambda: speech_case(
+        "hello I need help my father collapsed in the kitchen and he is not breathing "
+        "his lips are turning blue and he does not respond")))
+    cases.append(('speech/incremental-es', lambda: speech_case(
+        "hola necesito ayuda mi padre se desplomó en la cocina y no respira "
+        "tiene los labios morados y no responde")))
+
+    known = list(EmergencyClassifier.EMERGENCY_TYPES) + ['general_emergency']
+    cases.append(('guidance/known', lambda: guidance_case(known)))
+    cases.append(('guidance/unknown', lambda: guidance_case(['not_a_type'] * len(known))))
+
+    for actions in ACTION_COUNTS:
+        cases.append((f"summary/cold-{actions}-actions", lambda n=actions: summary_cold_case(n)))
+        cases.append((f"summary/warm-{actions}-actions", lambda n=actions: summary_warm_case(n)))
+
+    cases.append(('store/sync', store_sync_case))
+    cases.append(('store/resume-100-actions', store_resume_case))
+
+    if not args.skip_apptest:
+        cases.append(('apptest/show_emergency_interface', apptest_case))
+    return [(name, factory) for name, factory in cases if args.filter in name]
+
+
+def measure(name, factory, repeat):
+    """Median and min time per item over `repeat` auto-sized rounds"""
+    run, items, *teardown = factory()
+    try:
+        timer = timeit.Timer(run, timer=time.perf_counter)
+        number, _ = timer.autorange()
+        samples = [t / number / items for t in timer.repeat(repeat=repeat, number=number)]
+    finally:
+        for close in teardown:
+            close()
+    return {
+        'case': name,
+        'median_us': round(statistics.median(samples) * 1e6, 3),
+        'min_us': round(min(samples) * 1e6, 3),
+        'loops': number,
+        'items_per_loop': items
+    }
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'processor': platform.processor()
+    }
+
+
+def compare(results, baseline, threshold):
+    """Regressions: cases whose min time grew by more than `threshold` (a fraction)"""
+    previous = {case['case']: case for case in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        old = previous.get(r['case'])
+        if old is None or not old['min_us']:
+            r['change'] = None
+            continue
+        r['change'] = r['min_us'] / old['min_us'] - 1
+        if r['change'] > threshold:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the LifeLine AI benchmark suite.')
+    parser.add_argument('--filter', default='', help='Only run cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=7, help='Timed rounds per case')
+    parser.add_argument('--corpus', help='JSONL file of real descriptions for classify/corpus')
+    parser.add_argument('--field', default='description', help='Description field in --corpus')
+    parser.add_argument('--skip-apptest', action='store_true', help='Skip the Streamlit AppTest case')
+    parser.add_argument('--save', metavar='PATH', help='Write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown vs. baseline before failing (default: 0.25 = 25%%)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    if not args.skip_apptest:
+        try:
+            import streamlit.testing.v1  # noqa: F401
+        except ImportError:
+            print('Streamlit not installed; skipping the AppTest case', file=sys.stderr)
+            args.skip_apptest = True
+
+    results = [measure(name, factory, args.repeat) for name, factory in build_cases(args)]
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<40}{'median µs':>14}{'min µs':>14}{'vs base':>10}")
+        for r in results:
+            change = r.get('change')
+            change = '' if change is None else f"{change:+.1%}"
+            print(f"{r['case']:<40}{r['median_us']:>14,.2f}{r['min_us']:>14,.2f}{change:>10}")
+
+    for r in regressions:
+        print(f"REGRESSION: {r['case']} is {r['change']:.1%} slower than baseline "
+              f"(threshold {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
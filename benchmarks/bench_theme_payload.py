@@ -0,0 +1,120 @@
+"""
+Per-rerun theme payload benchmark.
+
+Compares what each Streamlit rerun sends for the theme:
+  before   - the full stylesheet inlined in a <style> block, including the
+             Google Fonts @import (the original behaviour, reconstructed
+             from static/theme.css)
+  inline   - minified <style> block (fallback without static serving)
+  static   - <link> to the cached static/theme.min.css (default)
+
+Sizes are reported as raw bytes, gzip bytes and, when Streamlit is
+installed, the serialized ForwardMsg delta that actually goes over the
+websocket, plus the one-time stylesheet and font download for the static
+mode. First paint is not measured (that needs a browser): the
+third-party render-blocking requests column is an estimate counted from
+the markup, as a proxy for what delays first paint.
+
+Usage:
+    python benchmarks/bench_theme_payload.py [--reruns 100] [--json]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lifeline.theme import (  # noqa: E402
+    STATIC_DIR, THEME_BUILD, THEME_SOURCE, inline_style, minify_css, stylesheet_link
+)
+
+# Self-hosted font the static stylesheet downloads once
+FONT_FILE = os.path.join(STATIC_DIR, 'fonts', 'SourceSans3-Variable.woff2')
+
+GOOGLE_FONTS_IMPORT = (
+    "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700;800&display=swap');"
+)
+# Inter stylesheet + one font file per weight requested by the old @import
+LEGACY_BLOCKING_REQUESTS = 1 + 5
+
+
+def legacy_markup():
+    """The original per-rerun payload: @import + unminified CSS in <style>"""
+    with open(THEME_SOURCE, encoding='utf-8') as f:
+        css = f.read()
+    # The old theme used the Google Fonts @import instead of @font-face
+    start = css.index('@font-face')
+    end = css.index('}', start) + 1
+    css = css[:start] + GOOGLE_FONTS_IMPORT + css[end:]
+    indented = '\n'.join('    ' + line if line else line for line in css.splitlines())
+    return f'\n<style>\n{indented}\n</style>\n'
+
+
+def delta_bytes(markup):
+    """Serialized ForwardMsg size for an st.markdown(markup) element, if available"""
+    try:
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    except ImportError:
+        return None
+    msg = ForwardMsg()
+    msg.delta.new_element.markdown.body = markup
+    msg.delta.new_element.markdown.allow_html = True
+    return msg.ByteSize()
+
+
+def describe(name, markup, blocking_requests, one_time_bytes=0):
+    raw = markup.encode('utf-8')
+    return {
+        'mode': name,
+        'per_rerun_bytes': len(raw),
+        'per_rerun_gzip_bytes': len(gzip.compress(raw)),
+        'per_rerun_delta_bytes': delta_bytes(markup),
+        'one_time_bytes': one_time_bytes,
+        'est_third_party_blocking_requests': blocking_requests
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare per-rerun theme payloads.')
+    parser.add_argument('--reruns', type=int, default=100,
+                        help='Reruns per session used for the session total')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    stylesheet_bytes = os.path.getsize(THEME_BUILD)
+    font_bytes = os.path.getsize(FONT_FILE) if os.path.exists(FONT_FILE) else 0
+    with open(THEME_SOURCE, encoding='utf-8') as f:
+        if minify_css(f.read()) + '\n' != open(THEME_BUILD, encoding='utf-8').read():
+            print('warning: static/theme.min.css is stale; run python -m lifeline.theme', file=sys.stderr)
+
+    results = [
+        describe('before', legacy_markup(), LEGACY_BLOCKING_REQUESTS),
+        describe('inline', inline_style(), 0),
+        describe('static', stylesheet_link(), 0, one_time_bytes=stylesheet_bytes + font_bytes)
+    ]
+    for r in results:
+        r['session_bytes'] = r['per_rerun_bytes'] * args.reruns + r['one_time_bytes']
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    before = results[0]
+    print(f"{'mode':<8}{'rerun B':>10}{'gzip B':>10}{'delta B':>10}{'once B':>10}"
+          f"{f'{args.reruns} reruns':>14}{'est. blocking 3rd-party':>25}")
+    for r in results:
+        delta = r['per_rerun_delta_bytes']
+        print(f"{r['mode']:<8}{r['per_rerun_bytes']:>10,}{r['per_rerun_gzip_bytes']:>10,}"
+              f"{'n/a' if delta is None else f'{delta:,}':>10}{r['one_time_bytes']:>10,}"
+              f"{r['session_bytes']:>14,}{r['est_third_party_blocking_requests']:>25}")
+    for r in results[1:]:
+        cut = 100 * (1 - r['per_rerun_bytes'] / before['per_rerun_bytes'])
+        print(f"{r['mode']}: per-rerun payload {cut:.1f}% smaller than before")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Load test for the headless triage service (lifeline.service).
+
+Starts the service with uvicorn on a free local port (or targets --url),
+then runs rounds of keep-alive HTTP/1.1 clients at increasing concurrency.
+Each round reports requests/sec, p50/p99 latency and how many requests
+were shed with 503 by the bounded queue.
+
+Usage:
+    python benchmarks/load_service.py [--levels 1,4,16,64] [--requests 2000]
+                                      [--endpoint triage|batch|guidance]
+                                      [--url http://127.0.0.1:8080] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DESCRIPTIONS = [
+    "Person collapsed, not breathing, unresponsive",
+    "Heavy bleeding from deep cut on arm",
+    "Person is choking and cannot breathe",
+    "Person burned by hot liquid, severe pain",
+    "Sudden facial droop and slurred speech",
+    "Fell off a ladder, possible broken leg",
+    "Feeling dizzy and a bit nauseous"
+]
+
+
+def request_bytes(endpoint, host, i):
+    """One HTTP/1.1 keep-alive request for the chosen endpoint"""
+    if endpoint == 'guidance':
+        return (f"GET /v1/guidance/cardiac_arrest HTTP/1.1\r\nHost: {host}\r\n\r\n").encode()
+    if endpoint == 'batch':
+        body = json.dumps({'records': [{'id': n, 'description': d}
+                                       for n, d in enumerate(DESCRIPTIONS)]})
+        path = '/v1/triage/batch'
+    else:
+        body = json.dumps({'description': DESCRIPTIONS[i % len(DESCRIPTIONS)]})
+        path = '/v1/triage'
+    body = body.encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def read_response(reader):
+    """Read one response; returns the status code"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by server')
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, endpoint, count, latencies, statuses):
+    """One keep-alive connection sending `count` requests back to back"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            start = time.perf_counter()
+            writer.write(request_bytes(endpoint, host, i))
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_level(host, port, endpoint, concurrency, total):
+    # The first `total % concurrency` clients send one extra request
+    share, extra = divmod(max(total, concurrency), concurrency)
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoint, share + (i < extra), latencies, statuses)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'ok': statuses.get(200, 0),
+        'shed_503': statuses.get(503, 0),
+        'other': sum(n for code, n in statuses.items() if code not in (200, 503))
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, queue_size, workers):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'lifeline.service', '--port', str(port),
+         '--queue-size', str(queue_size), '--workers', str(workers)],
+        cwd=ROOT
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit('Service exited during startup (is uvicorn installed?)')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit('Service did not start within 15 s')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the triage service.')
+    parser.add_argument('--url', help='Target a running service instead of starting one')
+    parser.add_argument('--levels', default='1,4,16,64', help='Comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per level')
+    parser.add_argument('--endpoint', choices=('triage', 'batch', 'guidance'), default='triage')
+    parser.add_argument('--queue-size', type=int, default=256, help='Queue size for the started service')
+    parser.add_argument('--workers', type=int, default=4, help='Worker tasks for the started service')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        process = start_server(port, args.queue_size, args.workers)
+
+    try:
+        results = [
+            asyncio.run(run_level(host, port, args.endpoint, int(level), args.requests))
+            for level in args.levels.split(',')
+        ]
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"endpoint: {args.endpoint}")
+    print(f"{'conc':>6}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'503':>8}{'other':>8}")
+    for r in results:
+        print(f"{r['concurrency']:>6}{r['requests']:>10}{r['rps']:>10,.0f}{r['p50_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['shed_503']:>8}{r['other']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""
+Multi-session load simulator for the Streamlit app.
+
+Starts one real `streamlit run` server per level and connects N concurrent
+clients to it over Streamlit's websocket protocol (the BackMsg/ForwardMsg
+protobufs the browser exchanges with the server). Each client drives the
+responder flow: home screen -> start_emergency -> mark steps complete ->
+log actions -> open the summary, and runs the timer fragment whenever the
+server asks for an auto-rerun, as a browser tab does. A throwaway session
+first runs the whole flow so imports and caches are warm; the N clients
+then connect, wait for each other and start together, so the server holds
+all N sessions and serves their reruns concurrently.
+
+Reports, per level:
+  cpu        CPU seconds the server process used while the sessions ran, and
+             utilisation (CPU time / wall time; above 100% means several
+             cores were busy)
+  rss        server resident memory, and what each session added to it
+             (growth from the warmed-up server to the server still holding
+             all N sessions, divided by N)
+  latency    distribution of rerun times seen by the clients, from sending
+             the rerun to the server's script_finished (p50/p90/p99/max),
+             overall and per kind of interaction
+
+Server CPU and memory are read from /proc and shown as n/a elsewhere. The
+clients run in this process on the same machine, so leave a core for them.
+Needs the `websockets` package (installed with Streamlit).
+
+Usage:
+    python benchmarks/load_sessions.py [--levels 1,2,4,8] [--steps 4] [--actions 3]
+                                       [--think-ms 0] [--json]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'lifeline_ai.py')
+
+SCENARIOS = ('Cardiac Arrest', 'Severe Bleeding', 'Choking', 'Burns')
+# Seconds to wait for the server to start, and for any one rerun
+STARTUP_TIMEOUT = 120
+RERUN_TIMEOUT = 120
+
+# ForwardMsg.ScriptFinishedStatus values that end a rerun
+FINISHED = 0
+FINISHED_EARLY_FOR_RERUN = 2
+FINISHED_FRAGMENT_RUN = 3
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def distribution(samples):
+    if not samples:
+        return None
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 2),
+        'p90_ms': round(percentile(samples, 90) * 1000, 2),
+        'p99_ms': round(percentile(samples, 99) * 1000, 2),
+        'max_ms': round(max(samples) * 1000, 2),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 2)
+    }
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """One `streamlit run` process serving the app on a local port"""
+
+    def __init__(self):
+        self.port = free_port()
+        self.process = None
+
+    def __enter__(self):
+        env = dict(os.environ, STREAMLIT_LOGGER_LEVEL='error')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', APP, '--server.headless', 'true',
+             '--server.port', str(self.port), '--server.fileWatcherType', 'none',
+             '--browser.gatherUsageStats', 'false'],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1)
+                return self
+            except OSError:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.__exit__(None, None, None)
+                    raise RuntimeError('Streamlit server did not start')
+                time.sleep(0.2)
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def cpu_seconds(self):
+        """User + system CPU seconds of the server process (None without /proc)"""
+        try:
+            with open(f"/proc/{self.process.pid}/stat") as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def rss_bytes(self):
+        """Resident set size of the server process (None without /proc)"""
+        try:
+            with open(f"/proc/{self.process.pid}/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            return None
+
+
+# ============================================================================
+# ONE SESSION
+# ============================================================================
+
+class Session:
+    """One simulated responder on its own websocket; records (kind, seconds) for every rerun"""
+
+    def __init__(self, index, steps, actions, think):
+        self.index = index
+        self.steps = steps
+        self.actions = actions
+        self.think = think
+        self.timings = []
+        self.error = None
+        self.socket = None
+        self.widgets = {}       # label -> widget id, from the last full run
+        self.values = {}        # widget id -> WidgetState the browser would send back
+        self.fragments = {}     # fragment id -> [interval, next due time]
+
+    async def connect(self, url):
+        import websockets
+
+        self.socket = await websockets.connect(url, subprotocols=['streamlit'], max_size=None)
+
+    async def close(self):
+        if self.socket is not None:
+            await self.socket.close()
+
+    async def rerun(self, kind, trigger=None, fragment_id=None):
+        """Send one rerun and read until the server finishes it; returns the seconds taken"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        states = message.rerun_script.widget_states.widgets
+        for state in self.values.values():
+            states.append(state)
+        if trigger is not None:
+            states.add(id=trigger, trigger_value=True)
+        if fragment_id is not None:
+            message.rerun_script.fragment_id = fragment_id
+            message.rerun_script.is_auto_rerun = True
+
+        start = time.perf_counter()
+        await self.socket.send(message.SerializeToString())
+        await asyncio.wait_for(self.receive(fragment_id is not None), RERUN_TIMEOUT)
+        elapsed = time.perf_counter() - start
+        self.timings.append((kind, elapsed))
+
+    async def receive(self, fragment):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        widgets = {}
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.socket.recv())
+            kind = message.WhichOneof('type')
+            if kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element
+                name = element.WhichOneof('type')
+                if name == 'exception':
+                    raise RuntimeError(f"{element.exception.type}: {element.exception.message}")
+                widget = getattr(element, name)
+                if getattr(widget, 'id', '') and hasattr(widget, 'label'):
+                    widgets[widget.label] = widget.id
+            elif kind == 'auto_rerun':
+                interval = message.auto_rerun.interval
+                self.fragments[message.auto_rerun.fragment_id] = [interval, time.monotonic() + interval]
+            elif kind == 'stop_auto_rerun':
+                for fragment_id in message.stop_auto_rerun.fragment_ids:
+                    self.fragments.pop(fragment_id, None)
+            elif kind == 'script_finished':
+                status = message.script_finished
+                if status == FINISHED_EARLY_FOR_RERUN:
+                    # The app called st.rerun(); the next run follows on the same socket
+                    widgets = {}
+                    continue
+                if not fragment and status == FINISHED:
+                    # The browser only sends back widgets that are still on screen
+                    self.widgets = widgets
+                    live = set(widgets.values())
+                    self.values = {key: state for key, state in self.values.items() if key in live}
+                return status
+
+    async def due_fragments(self):
+        """Run every fragment whose auto-rerun interval has elapsed"""
+        now = time.monotonic()
+        for fragment_id, schedule in list(self.fragments.items()):
+            if schedule[1] <= now:
+                schedule[1] = now + schedule[0]
+                await self.rerun('fragment', fragment_id=fragment_id)
+
+    async def idle(self, seconds):
+        """Think time: wait, running fragments as they come due"""
+        deadline = time.monotonic() + seconds
+        while True:
+            await self.due_fragments()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            due = min((schedule[1] for schedule in self.fragments.values()), default=deadline)
+            await asyncio.sleep(max(0, min(remaining, due - time.monotonic())))
+
+    def widget(self, label):
+        return next(key for text, key in self.widgets.items() if label in text)
+
+    async def click(self, kind, label):
+        await self.due_fragments()
+        await self.rerun(kind, trigger=self.widget(label))
+        await self.idle(self.think)
+
+    async def type_text(self, kind, label, text):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        await self.due_fragments()
+        key = self.widget(label)
+        self.values[key] = WidgetState(id=key, string_value=text)
+        await self.rerun(kind)
+        await self.idle(self.think)
+
+    async def run(self):
+        try:
+            await self.rerun('home')
+            await self.click('start_emergency', SCENARIOS[self.index % len(SCENARIOS)])
+            for step in range(self.steps):
+                for n in range(self.actions):
+                    await self.type_text('type_action', 'Log what you did', f"Action {n} on step {step}")
+                    await self.click('log_action', 'Log Action')
+                await self.click('mark_complete', 'Mark Complete')
+            await self.click('open_summary', 'View Summary')
+        except Exception as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+
+
+# ============================================================================
+# ONE LEVEL
+# ============================================================================
+
+async def drive(server, sessions, steps, actions, think):
+    """Warm the server up, then run `sessions` clients together; returns the measurements"""
+    warm = Session(0, steps, actions, 0)
+    await warm.connect(server.url)
+    await warm.run()
+    await warm.close()
+    if warm.error:
+        raise RuntimeError(f"warm-up: {warm.error}")
+
+    clients = [Session(i, steps, actions, think) for i in range(sessions)]
+    await asyncio.gather(*(client.connect(server.url) for client in clients))
+    rss_before = server.rss_bytes()
+    cpu_before = server.cpu_seconds()
+    wall_before = time.perf_counter()
+    await asyncio.gather(*(client.run() for client in clients))
+    wall = time.perf_counter() - wall_before
+    cpu_after = server.cpu_seconds()
+    # Every session is still connected and held by the server here
+    rss_after = server.rss_bytes()
+    for client in clients:
+        await client.close()
+
+    cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+    timings = [t for client in clients for t in client.timings]
+    kinds = sorted({kind for kind, _ in timings})
+    return {
+        'sessions': sessions,
+        'errors': [client.error for client in clients if client.error],
+        'reruns': len(timings),
+        'wall_s': round(wall, 3),
+        'server_cpu_s': round(cpu, 3) if cpu is not None else None,
+        'server_cpu_utilisation': round(cpu / wall, 2) if cpu is not None and wall else None,
+        'reruns_per_s': round(len(timings) / wall, 1) if wall else None,
+        'server_rss_mb': round(rss_after / 2**20, 1) if rss_after is not None else None,
+        'rss_per_session_kb': (round((rss_after - rss_before) / sessions / 1024, 1)
+                               if rss_before is not None and rss_after is not None else None),
+        'latency': distribution([t for _, t in timings]),
+        'latency_by_kind': {kind: distribution([t for k, t in timings if k == kind]) for kind in kinds}
+    }
+
+
+def run_level(sessions, steps, actions, think):
+    """Run `sessions` concurrent clients against a fresh server"""
+    with Server() as server:
+        return asyncio.run(drive(server, sessions, steps, actions, think))
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def number(value, width, digits=1, suffix=''):
+    if value is None:
+        return f"{'n/a':>{width + len(suffix)}}"
+    return f"{value:>{width}.{digits}f}{suffix}"
+
+
+def print_report(results):
+    print(f"{'sessions':>8}{'reruns':>8}{'wall s':>9}{'srv cpu s':>10}{'cpu %':>7}{'rerun/s':>9}"
+          f"{'srv MB':>9}{'KB/sess':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'err':>5}")
+    for r in results:
+        lat = r['latency'] or {}
+        utilisation = r['server_cpu_utilisation']
+        print(f"{r['sessions']:>8}{r['reruns']:>8}{r['wall_s']:>9.2f}{number(r['server_cpu_s'], 10, 2)}"
+              f"{number(utilisation * 100 if utilisation is not None else None, 6, 0, '%')}"
+              f"{r['reruns_per_s']:>9.1f}{number(r['server_rss_mb'], 9)}{number(r['rss_per_session_kb'], 9)}"
+              f"{lat.get('p50_ms', 0):>9.1f}{lat.get('p90_ms', 0):>9.1f}"
+              f"{lat.get('p99_ms', 0):>9.1f}{lat.get('max_ms', 0):>9.1f}{len(r['errors']):>5}")
+
+    last = results[-1]
+    print(f"\nrerun latency by interaction at {last['sessions']} sessions:")
+    for kind, lat in last['latency_by_kind'].items():
+        print(f"  {kind:<16} p50 {lat['p50_ms']:>8.1f} ms   p99 {lat['p99_ms']:>8.1f} ms   n={lat['count']}")
+    for r in results:
+        for error in r['errors'][:3]:
+            print(f"  error ({r['sessions']} sessions): {error}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate concurrent responder sessions on one server.')
+    parser.add_argument('--levels', default='1,2,4,8', help='Comma-separated session counts')
+    parser.add_argument('--steps', type=int, default=4, help='Guidance steps completed per session')
+    parser.add_argument('--actions', type=int, default=3, help='Actions logged per step')
+    parser.add_argument('--think-ms', type=float, default=0.0,
+                        help='Pause after each interaction (simulated responder think time)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    for module in ('streamlit', 'websockets'):
+        if importlib.util.find_spec(module) is None:
+            print(f"The session simulator needs {module}", file=sys.stderr)
+            return 2
+
+    results = [run_level(int(level), args.steps, args.actions, args.think_ms / 1000)
+               for level in args.levels.split(',')]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 1 if any(r['errors'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
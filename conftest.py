@@ -0,0 +1 @@
+"""Repository root on sys.path for pytest (tests import the lifeline package directly)"""
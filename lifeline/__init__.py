@@ -0,0 +1,27 @@
+"""
+LifeLine AI – Emergency Decision Support Engine
+Streamlit-free core shared by the UI, batch jobs and workers
+"""
+
+import importlib
+
+# Public names are resolved lazily so `python -m lifeline.<tool>` and
+# workers only import the modules they actually use
+_EXPORTS = {
+    'EmergencyClassifier': 'lifeline.triage',
+    'EmergencyGuidance': 'lifeline.guidance',
+    'GuidanceStep': 'lifeline.packs',
+    'build_emergency_summary': 'lifeline.summary',
+    'format_elapsed': 'lifeline.summary'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'lifeline' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,214 @@
+"""
+LifeLine AI – Batch Triage
+Streams JSONL incident files through the triage classifiers without the UI
+
+Usage:
+    python -m lifeline.batch incidents.jsonl -o triaged.jsonl
+    cat incidents.jsonl | python -m lifeline.batch - --field transcript
+
+Each input line is a JSON object; the description is read from --field
+(default "description"), and an optional "locale" field picks the keyword
+set (detected from the description otherwise), as POST /v1/triage does.
+Each output line carries the input line number, the record id (if any),
+the (severity, emergency_type, reasoning) result and the locale used.
+Records are read, classified and written one chunk at a time, so memory
+use stays constant regardless of file size.
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+
+from lifeline.language import classifier_for
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_FIELD = 'description'
+
+
+class BatchStats:
+    """Running totals for a batch triage run"""
+
+    __slots__ = ('records', 'errors', 'started', 'finished')
+
+    def __init__(self):
+        self.records = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def records_per_second(self):
+        elapsed = self.elapsed
+        return self.records / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'records': self.records,
+            'errors': self.errors,
+            'seconds': round(self.elapsed, 3),
+            'records_per_second': round(self.records_per_second, 1)
+        }
+
+    def __str__(self):
+        return (f"{self.records} records ({self.errors} errors) in {self.elapsed:.2f}s "
+                f"- {self.records_per_second:,.0f} records/s")
+
+
+def record_description(record, field=DEFAULT_FIELD):
+    """Description of a parsed record ('' if missing); ValueError if it is not a string"""
+    description = record.get(field)
+    if description is None:
+        return ''
+    if not isinstance(description, str):
+        raise ValueError(f"Field '{field}' is not a string")
+    return description
+
+
+def record_locale(record):
+    """Requested locale of a parsed record (None if missing); ValueError if it is not a string"""
+    locale = record.get('locale')
+    if locale is not None and not isinstance(locale, str):
+        raise ValueError("Field 'locale' is not a string")
+    return locale
+
+
+def triage_record(record, field=DEFAULT_FIELD, include_input=False):
+    """
+    Classify one parsed record and return the output dict.
+    A missing description is triaged as empty; a non-string description or
+    locale, or a locale without a keyword set, raises ValueError.
+    """
+    locale, classifier, description = classifier_for(record_description(record, field),
+                                                     record_locale(record))
+    severity, emergency_type, reasoning = classifier.classify_emergency(description)
+    result = {
+        'id': record.get('id'),
+        'severity': severity,
+        'emergency_type': emergency_type,
+        'reasoning': reasoning,
+        'locale': locale
+    }
+    if include_input:
+        result['input'] = record
+    return result
+
+
+def triage_lines(lines, field=DEFAULT_FIELD, include_input=False, start=1):
+    """
+    Classify JSONL lines one by one.
+    Yields one output dict per non-blank line; malformed lines and records
+    triage_record rejects yield an error entry instead of aborting the run.
+    """
+    for line_number, line in enumerate(lines, start):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield {'line': line_number, 'error': f'Invalid JSON: {exc}'}
+            continue
+        if not isinstance(record, dict):
+            yield {'line': line_number, 'error': 'Record is not a JSON object'}
+            continue
+        try:
+            triaged = triage_record(record, field, include_input)
+        except ValueError as exc:
+            yield {'line': line_number, 'error': str(exc)}
+            continue
+        result = {'line': line_number}
+        result.update(triaged)
+        yield result
+
+
+def triage_stream(input_file, output_file, chunk_size=DEFAULT_CHUNK_SIZE,
+                  field=DEFAULT_FIELD, include_input=False, progress=None):
+    """
+    Triage an open JSONL stream into another, chunk by chunk.
+
+    `progress`, if given, is called with the running BatchStats after every chunk.
+    Returns the final BatchStats.
+    """
+    stats = BatchStats()
+    line_number = 1
+    while True:
+        chunk = list(islice(input_file, chunk_size))
+        if not chunk:
+            break
+
+        output = []
+        for result in triage_lines(chunk, field, include_input, start=line_number):
+            if 'error' in result:
+                stats.errors += 1
+            else:
+                stats.records += 1
+            output.append(json.dumps(result, ensure_ascii=False))
+        line_number += len(chunk)
+
+        if output:
+            output_file.write('\n'.join(output) + '\n')
+        if progress is not None:
+            progress(stats)
+
+    stats.finished = time.perf_counter()
+    return stats
+
+
+def triage_file(input_path, output_path, **options):
+    """Triage a JSONL file into another JSONL file ('-' means stdin/stdout)"""
+    input_file = sys.stdin if input_path == '-' else open(input_path, encoding='utf-8')
+    output_file = sys.stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8')
+    try:
+        return triage_stream(input_file, output_file, **options)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        prog='python -m lifeline.batch',
+        description='Triage a JSONL file of incident descriptions without the Streamlit UI.'
+    )
+    parser.add_argument('input', help="JSONL file to triage ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Where to write results (default: stdout)")
+    parser.add_argument('--field', default=DEFAULT_FIELD,
+                        help=f"Record field holding the description (default: {DEFAULT_FIELD})")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Records classified per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--include-input', action='store_true',
+                        help="Echo each input record under an 'input' key")
+    parser.add_argument('--progress', action='store_true',
+                        help="Print running throughput to stderr after each chunk")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+
+    progress = None
+    if args.progress:
+        def progress(stats):
+            print(f"... {stats}", file=sys.stderr)
+
+    stats = triage_file(
+        args.input, args.output,
+        chunk_size=args.chunk_size,
+        field=args.field,
+        include_input=args.include_input,
+        progress=progress
+    )
+    print(f"Triaged {stats}", file=sys.stderr)
+    return 1 if stats.errors and not stats.records else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+LifeLine AI – Incident Event Log
+Append-only, typed, timestamped record of what happened during an incident
+
+The log keeps a bounded window of recent events in memory. Older events are
+dropped from memory and, when a spill path is configured, appended to a
+JSON Lines file so nothing is lost.
+"""
+
+import json
+import os
+from collections import deque
+from typing import NamedTuple, Optional
+
+# Event kinds
+INCIDENT_STARTED = 'incident_started'
+STEP_COMPLETED = 'step_completed'
+NAVIGATED = 'navigated'
+ACTION_LOGGED = 'action_logged'
+NOTE_ADDED = 'note_added'
+
+EVENT_KINDS = (INCIDENT_STARTED, STEP_COMPLETED, NAVIGATED, ACTION_LOGGED, NOTE_ADDED)
+
+DEFAULT_WINDOW = int(os.environ.get('LIFELINE_EVENT_WINDOW', 500))
+SPILL_BATCH = 64
+
+
+class IncidentEvent(NamedTuple):
+    """One immutable log entry; offset is seconds since the incident started"""
+    seq: int
+    offset: float
+    kind: str
+    step: Optional[int] = None
+    text: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'offset': round(self.offset, 3),
+            'kind': self.kind,
+            'step': self.step,
+            'text': self.text
+        }
+
+
+class IncidentLog:
+    """
+    Append-only event log with a bounded in-memory window.
+
+    Numbered action lines for the summary are rendered once, when the action
+    is logged, so building the summary is linear in the number of actions
+    and never re-renders old ones.
+    """
+
+    __slots__ = ('window', 'spill_path', 'seq', '_events', '_spill_buffer',
+                 '_action_lines', '_action_count', '_action_text')
+
+    def __init__(self, window=DEFAULT_WINDOW, spill_path=None):
+        if window < 1:
+            raise ValueError('Event window must hold at least one event')
+        self.window = window
+        self.spill_path = spill_path
+        self.seq = 0
+        self._events = deque()
+        self._spill_buffer = []
+        self._action_lines = deque()
+        self._action_count = 0
+        self._action_text = None
+
+    def append(self, kind, offset, step=None, text=None):
+        """Record an event and return it"""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind: {kind}")
+        self.seq += 1
+        event = IncidentEvent(self.seq, offset, kind, step, text)
+        self._events.append(event)
+
+        if kind == ACTION_LOGGED:
+            self._action_count += 1
+            self._action_lines.append(f"{self._action_count}. Step {step}: {text}")
+            self._action_text = None
+
+        if len(self._events) > self.window:
+            self._evict(self._events.popleft())
+        return event
+
+    def _evict(self, event):
+        if event.kind == ACTION_LOGGED:
+            self._action_lines.popleft()
+            self._action_text = None
+        if self.spill_path:
+            self._spill_buffer.append(event)
+            if len(self._spill_buffer) >= SPILL_BATCH:
+                self.flush()
+
+    def flush(self):
+        """Write buffered evicted events to the spill file"""
+        if not self._spill_buffer or not self.spill_path:
+            return
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(e.to_dict(), ensure_ascii=False) + '\n' for e in self._spill_buffer)
+        self._spill_buffer.clear()
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def evicted(self):
+        """Number of events no longer held in memory"""
+        return self.seq - len(self._events)
+
+    def history(self):
+        """Every event recorded so far, oldest first, including spilled ones"""
+        self.flush()
+        if self.spill_path and os.path.exists(self.spill_path):
+            with open(self.spill_path, encoding='utf-8') as f:
+                for line in f:
+                    yield IncidentEvent(**json.loads(line))
+        yield from list(self._events)
+
+    def since(self, seq):
+        """In-memory events with a sequence number greater than seq"""
+        return [event for event in self._events if event.seq > seq]
+
+    def of_kind(self, kind):
+        return [event for event in self._events if event.kind == kind]
+
+    # Summary helpers -------------------------------------------------------
+
+    @property
+    def action_count(self):
+        return self._action_count
+
+    def action_lines(self):
+        """Numbered action lines still in the window, oldest first"""
+        return self._action_lines
+
+    def action_text(self):
+        """The action lines joined with newlines (cached until the next change)"""
+        if self._action_text is None:
+            earlier = self._action_count - len(self._action_lines)
+            lines = list(self._action_lines)
+            if earlier:
+                lines.insert(0, f"... {earlier} earlier actions not shown")
+            self._action_text = '\n'.join(lines)
+        return self._action_text
@@ -0,0 +1,166 @@
+"""
+LifeLine AI – Incident Export
+Structured JSON and FHIR-like exports of an incident (no UI dependencies)
+
+Exporters are generators of text chunks: events are serialized one at a
+time, so a long incident can be written straight to a file or socket
+without building the whole document in memory first.
+"""
+
+import json
+from datetime import timedelta
+
+from lifeline.events import ACTION_LOGGED, NOTE_ADDED, STEP_COMPLETED
+
+EXPORT_FORMAT_VERSION = 1
+
+# v3 ActCode for an emergency encounter
+ENCOUNTER_CLASS = {
+    'system': 'http://terminology.hl7.org/CodeSystem/v3-ActCode',
+    'code': 'EMER',
+    'display': 'emergency'
+}
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _event_time(incident, offset):
+    """Absolute ISO timestamp of an event recorded `offset` seconds into the incident"""
+    if incident.started_at is None:
+        return None
+    return (incident.started_at + timedelta(seconds=offset)).isoformat(timespec='seconds')
+
+
+def incident_record(incident, steps):
+    """Flat description of the incident, without its events"""
+    return {
+        'format_version': EXPORT_FORMAT_VERSION,
+        'incident_id': incident.incident_id,
+        'started_at': _event_time(incident, 0),
+        'emergency_type': incident.emergency_type,
+        'severity': incident.severity_level,
+        'reasoning': incident.classification_reasoning,
+        'description': incident.description,
+        'language': incident.locale,
+        'has_image': incident.has_image,
+        'image_analysis': incident.image_analysis,
+        'completed_steps': [
+            {'step': i + 1, 'title': steps[i].title}
+            for i in incident.completed_indices() if i < len(steps)
+        ],
+        'notes': incident.additional_notes,
+        'event_count': incident.log.seq
+    }
+
+
+# ============================================================================
+# JSON
+# ============================================================================
+
+def iter_json(incident, steps):
+    """Stream the incident as one JSON object with an "events" array"""
+    record = _dumps(incident_record(incident, steps))
+    yield record[:-1] + ', "events": ['
+    for i, event in enumerate(incident.log.history()):
+        item = event.to_dict()
+        item['time'] = _event_time(incident, event.offset)
+        yield (',\n' if i else '\n') + _dumps(item)
+    yield '\n]}\n'
+
+
+# ============================================================================
+# FHIR-LIKE BUNDLE
+# ============================================================================
+
+def _bundle_entries(incident, steps):
+    """FHIR-shaped resources for the incident, yielded one at a time"""
+    incident_id = incident.incident_id or 'incident'
+    encounter_ref = {'reference': f"Encounter/{incident_id}"}
+
+    yield {
+        'resourceType': 'Encounter',
+        'id': incident_id,
+        'status': 'in-progress' if incident.active else 'finished',
+        'class': ENCOUNTER_CLASS,
+        'period': {'start': _event_time(incident, 0)},
+        'reasonCode': [{'text': incident.description or ''}]
+    }
+    yield {
+        'resourceType': 'Condition',
+        'id': f"{incident_id}-condition",
+        'encounter': encounter_ref,
+        'code': {'text': (incident.emergency_type or 'unknown').replace('_', ' ').title()},
+        'severity': {'text': (incident.severity_level or 'unknown').upper()},
+        'note': [{'text': incident.classification_reasoning or ''}]
+    }
+
+    completed_at = {}
+    for event in incident.log.history():
+        resource_id = f"{incident_id}-{event.seq}"
+        when = _event_time(incident, event.offset)
+        if event.kind == STEP_COMPLETED:
+            completed_at[event.step] = when
+        elif event.kind == ACTION_LOGGED:
+            yield {
+                'resourceType': 'Observation',
+                'id': resource_id,
+                'status': 'final',
+                'encounter': encounter_ref,
+                'code': {'text': 'Responder action'},
+                'effectiveDateTime': when,
+                'valueString': event.text,
+                'note': [{'text': f"Guidance step {event.step}"}]
+            }
+        elif event.kind == NOTE_ADDED:
+            yield {
+                'resourceType': 'Observation',
+                'id': resource_id,
+                'status': 'final',
+                'encounter': encounter_ref,
+                'code': {'text': 'Responder note'},
+                'effectiveDateTime': when,
+                'valueString': event.text
+            }
+
+    for i in incident.completed_indices():
+        if i >= len(steps):
+            continue
+        procedure = {
+            'resourceType': 'Procedure',
+            'id': f"{incident_id}-step-{i + 1}",
+            'status': 'completed',
+            'encounter': encounter_ref,
+            'code': {'text': steps[i].title}
+        }
+        if completed_at.get(i + 1):
+            procedure['performedDateTime'] = completed_at[i + 1]
+        yield procedure
+
+
+def iter_fhir_bundle(incident, steps):
+    """Stream the incident as a FHIR-like collection Bundle"""
+    head = {
+        'resourceType': 'Bundle',
+        'id': incident.incident_id,
+        'type': 'collection',
+        'timestamp': _event_time(incident, 0)
+    }
+    head = _dumps(head)
+    yield head[:-1] + ', "entry": ['
+    for i, resource in enumerate(_bundle_entries(incident, steps)):
+        yield (',\n' if i else '\n') + _dumps({'resource': resource})
+    yield '\n]}\n'
+
+
+EXPORTERS = {
+    'json': iter_json,
+    'fhir': iter_fhir_bundle
+}
+
+
+def write_export(fmt, incident, steps, fp):
+    """Write an export to an open text file, chunk by chunk"""
+    for chunk in EXPORTERS[fmt](incident, steps):
+        fp.write(chunk)
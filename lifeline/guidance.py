@@ -0,0 +1,136 @@
+"""
+LifeLine AI – Emergency Guidance
+Rule-based step-by-step protocols for each emergency type (no UI dependencies)
+"""
+
+import logging
+import os
+
+from lifeline.language import LOCALE_CODE
+from lifeline.packs import PROTOCOLS_DIR, GuidanceStep, PackLoader, ProtocolPackError
+from lifeline.triage import EmergencyClassifier
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROTOCOL = 'general_emergency'
+
+# Every emergency type the classifier can return; each needs a protocol.
+# The classifier falls back to general_emergency when no type keyword matches.
+CLASSIFIER_TYPES = tuple(EmergencyClassifier.EMERGENCY_TYPES) + (DEFAULT_PROTOCOL,)
+
+# Regional deployments point this at their own pack; content changes are
+# picked up without a restart (see lifeline.packs.PackLoader)
+DEFAULT_PACK = os.environ.get('LIFELINE_PROTOCOL_PACK') or os.path.join(PROTOCOLS_DIR, 'en.jsonl')
+
+PACK_LOADER = PackLoader()
+
+
+class GuidanceRegistry:
+    """
+    Serves protocols from a protocol pack. Each protocol is parsed on first
+    use and the same frozen tuple of GuidanceStep is returned to every
+    session until the pack file changes on disk.
+
+    validate() (and the first lookup) checks the pack's header index: every
+    emergency type the classifier can return must have a protocol, or
+    ProtocolPackError is raised. No steps are parsed for the check. A
+    reloaded pack that fails it is logged and the previous pack keeps being
+    served.
+    """
+
+    def __init__(self, pack_path=DEFAULT_PACK, loader=PACK_LOADER, default=DEFAULT_PROTOCOL,
+                 emergency_types=CLASSIFIER_TYPES):
+        self.pack_path = pack_path
+        self.default = default
+        self.emergency_types = tuple(emergency_types)
+        self._loader = loader
+        # (pack last checked, pack served, its default protocol key)
+        self._checked = None
+
+    @property
+    def pack(self):
+        return self._loader.load(self.pack_path)
+
+    @property
+    def locale(self):
+        return self.pack.locale
+
+    def __contains__(self, emergency_type):
+        return emergency_type in self.pack
+
+    def keys(self):
+        return self.pack.keys()
+
+    def _check(self, pack):
+        """The pack's default protocol key, once its index covers every classifier type"""
+        missing = [key for key in self.emergency_types if key not in pack]
+        if missing:
+            raise ProtocolPackError(f"{pack.path}: no protocol for emergency type(s) {', '.join(missing)}")
+        default = pack.default or self.default
+        if default not in pack:
+            raise ProtocolPackError(f"{pack.path}: default protocol '{default}' is not in the pack")
+        return default
+
+    def _served(self):
+        pack = self.pack
+        checked = self._checked
+        if checked is None or checked[0] is not pack:
+            try:
+                checked = (pack, pack, self._check(pack))
+            except ProtocolPackError as exc:
+                if checked is None:
+                    raise
+                logger.warning("Protocol pack %s version %s rejected (%s); keeping version %s",
+                               pack.path, pack.version, exc, checked[1].version)
+                checked = (pack,) + checked[1:]
+            self._checked = checked
+        return checked
+
+    def validate(self):
+        """Check type coverage now, raising ProtocolPackError if a type has no protocol"""
+        self._served()
+        return self
+
+    def get(self, emergency_type):
+        """Frozen steps for emergency_type (the pack's default protocol if unknown)"""
+        _, pack, default = self._served()
+        return pack.get(emergency_type if emergency_type in pack else default)
+
+
+class EmergencyGuidance:
+    """Rule-based emergency guidance with step-by-step instructions"""
+    
+    @staticmethod
+    def get_guidance_steps(emergency_type, locale=None):
+        """Get step-by-step guidance for emergency type (shared, read-only)"""
+        return registry_for(locale).get(emergency_type)
+
+
+# Validated at import: a pack missing a classifier type stops start-up
+GUIDANCE_REGISTRY = GuidanceRegistry().validate()
+# Registries of other locales' packs, created and validated on first use
+# (or at import for the packs shipped in PROTOCOLS_DIR)
+_LOCALE_REGISTRIES = {}
+
+
+def registry_for(locale=None):
+    """GuidanceRegistry for a locale's pack (the default registry if it has none)"""
+    if not locale:
+        return GUIDANCE_REGISTRY
+    registry = _LOCALE_REGISTRIES.get(locale)
+    if registry is None:
+        path = os.path.join(PROTOCOLS_DIR, f"{locale}.jsonl")
+        if locale == GUIDANCE_REGISTRY.locale or not LOCALE_CODE.match(locale) or not os.path.exists(path):
+            return GUIDANCE_REGISTRY
+        registry = _LOCALE_REGISTRIES[locale] = GuidanceRegistry(path).validate()
+    return registry
+
+
+def validate_shipped_packs(protocols_dir=PROTOCOLS_DIR):
+    """Check every shipped locale pack's index now; steps still load on first use"""
+    for name in sorted(os.listdir(protocols_dir)):
+        if name.endswith('.jsonl'):
+            registry_for(name[:-len('.jsonl')])
+
+
+validate_shipped_packs()
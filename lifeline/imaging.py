@@ -0,0 +1,145 @@
+"""
+LifeLine AI – Image Ingest
+Bounded decoding of uploaded photos into a thumbnail and an analysis tensor
+
+Uploads are checked against byte and pixel limits before any pixel data is
+decoded, decoded at reduced resolution (JPEG draft mode / Image.reduce),
+re-encoded without EXIF metadata, and memoized by SHA-256 so a Streamlit
+rerun never decodes the same upload twice.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import NamedTuple, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+MAX_IMAGE_BYTES = int(os.environ.get('LIFELINE_MAX_IMAGE_BYTES', 10 * 1024 * 1024))
+MAX_IMAGE_PIXELS = int(os.environ.get('LIFELINE_MAX_IMAGE_PIXELS', 40_000_000))
+ALLOWED_FORMATS = ('JPEG', 'PNG')
+
+THUMBNAIL_SIZE = (600, 600)      # bounding box; shown at 300 px wide (2x for HiDPI)
+ANALYSIS_SIZE = (128, 128)       # fixed (width, height) of the analysis tensor
+THUMBNAIL_QUALITY = 85
+
+CACHE_SIZE = int(os.environ.get('LIFELINE_IMAGE_CACHE', 32))
+
+
+class ImageRejected(ValueError):
+    """An upload that is too large, not an image, or in an unsupported format"""
+
+
+class IngestedImage(NamedTuple):
+    """
+    A decoded upload. `analysis` is raw RGB bytes, row-major, with shape
+    `analysis_shape` (height, width, 3); `thumbnail` is a metadata-free JPEG.
+    """
+    digest: str
+    format: str
+    width: int
+    height: int
+    thumbnail: bytes
+    analysis: bytes
+    analysis_shape: Tuple[int, int, int]
+
+
+def _read(data):
+    """Upload bytes from bytes or a file-like object (e.g. st.file_uploader), size-checked"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        raw = bytes(data)
+    elif hasattr(data, 'getvalue'):
+        raw = data.getvalue()
+    else:
+        raw = data.read(MAX_IMAGE_BYTES + 1)
+    if len(raw) > MAX_IMAGE_BYTES:
+        raise ImageRejected(f"Image is larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+    if not raw:
+        raise ImageRejected('Image is empty')
+    return raw
+
+
+def decode_image(raw, digest=None):
+    """Decode checked upload bytes into an IngestedImage (no caching)"""
+    try:
+        img = Image.open(BytesIO(raw))
+    except (UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise ImageRejected(f"Not a readable image: {e}") from None
+
+    with img:
+        if img.format not in ALLOWED_FORMATS:
+            raise ImageRejected(f"Unsupported image format: {img.format}")
+        source_format = img.format
+        width, height = img.size
+        if width * height > MAX_IMAGE_PIXELS:
+            raise ImageRejected(f"Image has {width * height:,} pixels; the limit is {MAX_IMAGE_PIXELS:,}")
+
+        try:
+            # JPEG: let the decoder produce a DCT-scaled image close to the
+            # thumbnail size instead of the full-resolution bitmap
+            img.draft('RGB', THUMBNAIL_SIZE)
+            # Honour the camera orientation before the EXIF block is dropped
+            img = ImageOps.exif_transpose(img)
+            img = img.convert('RGB')
+            # reducing_gap uses Image.reduce for large integer downscales
+            img.thumbnail(THUMBNAIL_SIZE, reducing_gap=2.0)
+        except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+            raise ImageRejected(f"Image could not be decoded: {e}") from None
+
+        thumb = BytesIO()
+        # A freshly encoded JPEG carries no EXIF/GPS metadata
+        img.save(thumb, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+        tensor = img.resize(ANALYSIS_SIZE, Image.Resampling.BILINEAR)
+
+    return IngestedImage(
+        digest=digest or hashlib.sha256(raw).hexdigest(),
+        format=source_format,
+        width=width,
+        height=height,
+        thumbnail=thumb.getvalue(),
+        analysis=tensor.tobytes(),
+        analysis_shape=(ANALYSIS_SIZE[1], ANALYSIS_SIZE[0], 3)
+    )
+
+
+class ImageCache:
+    """Thread-safe LRU of IngestedImage keyed by the upload's SHA-256"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ingest(self, data):
+        """Checked, decoded, memoized IngestedImage for an upload"""
+        raw = _read(data)
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            image = self._images.get(digest)
+            if image is not None:
+                self._images.move_to_end(digest)
+                return image
+
+        image = decode_image(raw, digest)
+        with self._lock:
+            self._images[digest] = image
+            while len(self._images) > self.maxsize:
+                self._images.popitem(last=False)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+
+    def __len__(self):
+        return len(self._images)
+
+
+IMAGE_CACHE = ImageCache()
+
+
+def ingest_image(data):
+    """Ingest an upload through the shared cache (raises ImageRejected)"""
+    return IMAGE_CACHE.ingest(data)
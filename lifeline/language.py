@@ -0,0 +1,229 @@
+"""
+LifeLine AI – Languages
+Locale keyword sets, language detection and per-locale classifiers (no UI dependencies)
+
+Each locale has a keyword file in lifeline/keywords/<locale>.json with the
+same lists as EmergencyClassifier (lowercase keys: critical_keywords,
+urgent_keywords, monitor_keywords, emergency_types, not_typos) plus the
+marker words and characters used to detect the language. An optional
+words_<locale>.txt lists the locale's real words, which typo correction
+does not turn into keywords. A locale's lists extend the English ones, so
+English phrases in a mixed-language call are still recognised, and every
+keyword also gets an accent-free variant ("convulsion", "chay mau") for
+people typing without diacritics.
+
+Nothing is read at import. The detector loads the marker lists on first
+use, and a locale's classifier is compiled the first time a description in
+that language is seen, then kept in a small LRU; English is the module's
+EmergencyClassifier and is always resident.
+"""
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from lifeline.triage import EmergencyClassifier
+
+KEYWORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keywords')
+DEFAULT_LOCALE = 'en'
+
+# Comma-separated locales detection may choose from (default: every keyword file)
+ENABLED_LOCALES = tuple(
+    locale.strip() for locale in os.environ.get('LIFELINE_LOCALES', '').split(',') if locale.strip()
+)
+# Compiled non-English classifiers kept in memory at once
+CLASSIFIER_CACHE_SIZE = int(os.environ.get('LIFELINE_LOCALE_CACHE_SIZE', 4))
+
+# Single accent-free words shorter than this are too ambiguous to add
+# ("bong" could be bỏng, bóng or bông)
+MIN_FOLDED_WORD = 6
+
+MARKER_WORD = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+# Locale codes accepted from callers ("es", "vi", "pt-br"); also keeps them safe in file names
+LOCALE_CODE = re.compile(r"[a-z]{2,3}(?:[-_][a-z0-9]{2,8})?\Z")
+
+
+def available_locales(keywords_dir=KEYWORDS_DIR):
+    """Locales that ship a keyword file, sorted"""
+    return sorted(name[:-5] for name in os.listdir(keywords_dir) if name.endswith('.json'))
+
+
+def fold_accents(text):
+    """text without diacritics ("không thở" -> "khong tho")"""
+    decomposed = unicodedata.normalize('NFD', text.replace('đ', 'd').replace('Đ', 'D'))
+    return ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn')
+
+
+def _with_folded(keywords):
+    """keywords plus their accent-free variants, in order, without duplicates"""
+    result = {}
+    for keyword in keywords:
+        keyword = unicodedata.normalize('NFC', keyword.lower())
+        result[keyword] = None
+        folded = fold_accents(keyword)
+        if ' ' in folded or len(folded) >= MIN_FOLDED_WORD:
+            result[folded] = None
+    return list(result)
+
+
+def _read(locale, keywords_dir=KEYWORDS_DIR):
+    if not LOCALE_CODE.match(locale):
+        raise ValueError(f"Invalid locale code '{locale}'")
+    path = os.path.join(keywords_dir, f"{locale}.json")
+    try:
+        with open(path, encoding='utf-8') as keywords_file:
+            data = json.load(keywords_file)
+    except FileNotFoundError:
+        raise ValueError(f"No keyword set for locale '{locale}'") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: keyword set must be a JSON object")
+    return data
+
+
+def load_keywords(locale, keywords_dir=KEYWORDS_DIR, base=EmergencyClassifier):
+    """with_config() overrides for a locale (the lists of `base`, English by default, extended)"""
+    data = _read(locale, keywords_dir)
+    # Real words of both languages are never read as typos
+    overrides = {'WORD_LISTS': tuple(dict.fromkeys(base.WORD_LISTS + (locale,)))}
+    for field in base.CONFIG_FIELDS:
+        if field == 'WORD_LISTS':
+            continue
+        keywords = getattr(base, field)
+        extra = data.get(field.lower())
+        if not extra:
+            continue
+        if field == 'EMERGENCY_TYPES':
+            unknown = sorted(set(extra) - set(keywords))
+            if unknown:
+                raise ValueError(f"{locale}: unknown emergency types {', '.join(unknown)}")
+            overrides[field] = {key: _with_folded(list(words) + extra.get(key, []))
+                                for key, words in keywords.items()}
+        else:
+            overrides[field] = _with_folded(list(keywords) + extra)
+    return overrides
+
+
+class LanguageDetector:
+    """
+    Picks the locale of a description from marker words ("el", "không")
+    and letters only one language uses ("ñ", "ơ"). Each hit scores one
+    point; ties and descriptions without any hit go to `default`.
+    """
+
+    def __init__(self, locales, keywords_dir=KEYWORDS_DIR, default=DEFAULT_LOCALE):
+        self.locales = tuple(locales)
+        self.default = default
+        self.names = {}
+        self._words = {}
+        self._characters = {}
+        for locale in self.locales:
+            data = _read(locale, keywords_dir)
+            self.names[locale] = data.get('name', locale)
+            markers = data.get('markers', {})
+            for word in markers.get('words', ()):
+                self._words.setdefault(word, []).append(locale)
+            for char in markers.get('characters', ''):
+                self._characters.setdefault(char, []).append(locale)
+        self._character_class = re.compile(
+            '[' + re.escape(''.join(self._characters)) + ']' if self._characters else r'(?!)'
+        )
+
+    def scores(self, text):
+        """{locale: points} for lowercased text"""
+        scores = dict.fromkeys(self.locales, 0)
+        for word in MARKER_WORD.findall(text):
+            for locale in self._words.get(word, ()):
+                scores[locale] += 1
+        for char in self._character_class.findall(text):
+            for locale in self._characters[char]:
+                scores[locale] += 1
+        return scores
+
+    def detect(self, text):
+        """Most likely locale of text"""
+        if len(self.locales) < 2 or not text:
+            return self.locales[0] if self.locales else self.default
+        scores = self.scores(unicodedata.normalize('NFC', text.lower()))
+        best = max(scores.values())
+        leaders = [locale for locale, score in scores.items() if score == best]
+        if best == 0 or len(leaders) > 1:
+            return self.default if self.default in scores else leaders[0]
+        return leaders[0]
+
+
+class LocaleClassifiers:
+    """
+    Thread-safe LRU of compiled classifier classes by locale. English is
+    always `base` itself and does not count against maxsize; the other
+    locales extend base's keyword lists (EmergencyClassifier by default, or
+    a with_config() candidate, as replay uses).
+    """
+
+    def __init__(self, maxsize=CLASSIFIER_CACHE_SIZE, keywords_dir=KEYWORDS_DIR, base=EmergencyClassifier):
+        self.maxsize = maxsize
+        self.keywords_dir = keywords_dir
+        self.base = base
+        self._classifiers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, locale):
+        """Classifier class for locale (ValueError if it has no keyword set)"""
+        if locale == DEFAULT_LOCALE:
+            return self.base
+        with self._lock:
+            classifier = self._classifiers.get(locale)
+            if classifier is not None:
+                self._classifiers.move_to_end(locale)
+                return classifier
+
+        classifier = self.base.with_config(**load_keywords(locale, self.keywords_dir, self.base))
+        with self._lock:
+            self._classifiers[locale] = classifier
+            while len(self._classifiers) > self.maxsize:
+                self._classifiers.popitem(last=False)
+        return classifier
+
+    def __contains__(self, locale):
+        return locale == DEFAULT_LOCALE or locale in self._classifiers
+
+    def clear(self):
+        with self._lock:
+            self._classifiers.clear()
+
+
+CLASSIFIERS = LocaleClassifiers()
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def detector():
+    """The shared LanguageDetector over ENABLED_LOCALES, built on first use"""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = LanguageDetector(ENABLED_LOCALES or available_locales())
+    return _detector
+
+
+def detect_language(description):
+    """Locale of a description among the enabled locales"""
+    return detector().detect(description or '')
+
+
+def language_name(locale):
+    """Display name of an enabled locale ("Español"), or the code itself"""
+    return detector().names.get(locale, locale)
+
+
+def classifier_for(description, locale=None, classifiers=CLASSIFIERS):
+    """
+    (locale, classifier class, NFC-normalized description). The locale is
+    detected when not given; `classifiers` is the LocaleClassifiers to use.
+    """
+    description = unicodedata.normalize('NFC', description or '')
+    locale = locale or detect_language(description)
+    return locale, classifiers.get(locale), description
@@ -0,0 +1,191 @@
+"""
+LifeLine AI – Metrics
+Opt-in stage timing with counters and histograms (no UI dependencies)
+
+Set LIFELINE_METRICS=1 to enable. When disabled, @timed returns the function
+unchanged and stage() is a no-op context manager, so instrumented code pays
+nothing. Collected data can be read as a snapshot dict (debug panel) or as
+Prometheus text exposition format.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get('LIFELINE_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Upper bounds in seconds (0.1 ms .. 2.5 s); +Inf is implicit
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+PREFIX = 'lifeline'
+
+
+class StageHistogram:
+    """Call count, error count, total time and bucketed latencies for one stage"""
+
+    __slots__ = ('counts', 'total', 'calls', 'errors', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, error=False):
+        index = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.calls += 1
+            if error:
+                self.errors += 1
+
+    def state(self):
+        """Consistent copy of (counts, total, calls, errors), taken under the lock"""
+        with self._lock:
+            return list(self.counts), self.total, self.calls, self.errors
+
+    def quantile(self, q):
+        """Upper bucket bound containing quantile q (None when empty)"""
+        counts, _, calls, _ = self.state()
+        return _quantile(counts, calls, q)
+
+
+def _quantile(counts, calls, q):
+    if not calls:
+        return None
+    rank = q * calls
+    seen = 0
+    for bound, count in zip(BUCKETS + (float('inf'),), counts):
+        seen += count
+        if seen >= rank:
+            return bound
+    return float('inf')
+
+
+class MetricsRegistry:
+    """Named stage histograms, created on first use"""
+
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.started = time.time()
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self._stages.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(name, StageHistogram())
+        return histogram
+
+    def observe(self, name, seconds, error=False):
+        self.histogram(name).observe(seconds, error)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started = time.time()
+
+    def _states(self):
+        """(name, counts, total, calls, errors) per stage, copied under the locks"""
+        with self._lock:
+            stages = list(self._stages.items())
+        return [(name,) + histogram.state() for name, histogram in stages]
+
+    def snapshot(self):
+        """
+        Per-stage summary rows for display, slowest total time first.
+        p50/p99 are histogram bucket upper bounds, not exact values.
+        """
+        rows = []
+        for name, counts, total, calls, errors in sorted(self._states(), key=lambda state: -state[2]):
+            p50, p99 = _quantile(counts, calls, 0.5), _quantile(counts, calls, 0.99)
+            rows.append({
+                'stage': name,
+                'calls': calls,
+                'errors': errors,
+                'total_ms': round(total * 1000, 2),
+                'mean_ms': round(total * 1000 / calls, 3) if calls else 0.0,
+                'p50_ms': None if p50 is None else p50 * 1000,
+                'p99_ms': None if p99 is None else p99 * 1000
+            })
+        return rows
+
+    def render_prometheus(self):
+        """All stages in Prometheus text exposition format"""
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds Time spent in an instrumented stage.",
+            f"# TYPE {PREFIX}_stage_seconds histogram"
+        ]
+        errors = []
+        for name, counts, total, calls, failed in sorted(self._states()):
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(BUCKETS, counts):
+                cumulative += count
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{label}",le="+Inf"}} {calls}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{label}"}} {total:.9f}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{label}"}} {calls}')
+            errors.append(f'{PREFIX}_stage_errors_total{{stage="{label}"}} {failed}')
+        lines += [
+            f"# HELP {PREFIX}_stage_errors_total Stage calls that raised an exception.",
+            f"# TYPE {PREFIX}_stage_errors_total counter",
+            *errors
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+
+def timed(name=None, registry=METRICS):
+    """
+    Decorator recording a function's wall time under `name` (default: its
+    __name__). Control-flow exceptions that are not Exception subclasses
+    (e.g. Streamlit's rerun) are timed but not counted as errors.
+    """
+    def decorate(func):
+        if not registry.enabled:
+            return func
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                registry.observe(stage_name, time.perf_counter() - start, error)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def _stage(name, registry):
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        registry.observe(name, time.perf_counter() - start, error)
+
+
+def stage(name, registry=METRICS):
+    """Context manager timing a block (no-op when metrics are disabled)"""
+    if not registry.enabled:
+        return nullcontext()
+    return _stage(name, registry)
@@ -0,0 +1,340 @@
+"""
+LifeLine AI – Protocol Packs
+Versioned guidance content files with an index header for on-demand loading
+
+Pack format (UTF-8 JSON Lines):
+    line 1   header: {"format": "lifeline-protocol-pack", "format_version": 1,
+                      "pack": ..., "version": ..., "locale": ..., "default": ...,
+                      "index": {protocol_key: [byte_offset, byte_length], ...}}
+    line 2+  one protocol per line: {"key": ..., "name": ..., "steps": [...]}
+
+Offsets in the index are relative to the first byte after the header line,
+so a single protocol can be read with one seek without parsing the others.
+After editing protocol lines by hand, rebuild the index with:
+    python -m lifeline.packs reindex lifeline/protocols/en.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import NamedTuple, Optional
+
+PACK_FORMAT = 'lifeline-protocol-pack'
+PACK_FORMAT_VERSION = 1
+
+PROTOCOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'protocols')
+
+logger = logging.getLogger(__name__)
+
+
+class ProtocolPackError(ValueError):
+    """Raised when a protocol pack or one of its protocols is malformed"""
+
+
+class GuidanceStep(NamedTuple):
+    """One immutable guidance step, shared by every session"""
+    title: str
+    instruction: str
+    details: tuple = ()
+    warning: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, step):
+        """Freeze a {'title', 'instruction', 'details', 'warning'} step dict"""
+        return cls(
+            step['title'],
+            step['instruction'],
+            tuple(step.get('details') or ()),
+            step.get('warning')
+        )
+
+    def to_dict(self):
+        return {
+            'title': self.title,
+            'instruction': self.instruction,
+            'details': list(self.details),
+            'warning': self.warning
+        }
+
+
+def _validate_steps(key, steps):
+    """Check the shape of a protocol's step list before freezing it"""
+    if not isinstance(steps, list) or not steps:
+        raise ProtocolPackError(f"Protocol '{key}' must have a non-empty 'steps' list")
+    for number, step in enumerate(steps, 1):
+        where = f"Protocol '{key}' step {number}"
+        if not isinstance(step, dict):
+            raise ProtocolPackError(f"{where} must be an object")
+        for field in ('title', 'instruction'):
+            if not isinstance(step.get(field), str) or not step[field].strip():
+                raise ProtocolPackError(f"{where} needs a non-empty '{field}'")
+        details = step.get('details', [])
+        if not isinstance(details, list) or not all(isinstance(d, str) for d in details):
+            raise ProtocolPackError(f"{where} 'details' must be a list of strings")
+        if step.get('warning') is not None and not isinstance(step['warning'], str):
+            raise ProtocolPackError(f"{where} 'warning' must be a string or null")
+
+
+def _validate_header(header, path):
+    if not isinstance(header, dict) or header.get('format') != PACK_FORMAT:
+        raise ProtocolPackError(f"{path}: not a {PACK_FORMAT} file")
+    if header.get('format_version') != PACK_FORMAT_VERSION:
+        raise ProtocolPackError(
+            f"{path}: unsupported format_version {header.get('format_version')!r} "
+            f"(expected {PACK_FORMAT_VERSION})"
+        )
+    index = header.get('index')
+    if not isinstance(index, dict) or not index:
+        raise ProtocolPackError(f"{path}: header has no protocol index")
+    for key, entry in index.items():
+        if (not isinstance(entry, list) or len(entry) != 2
+                or not all(isinstance(n, int) and n >= 0 for n in entry)):
+            raise ProtocolPackError(f"{path}: bad index entry for '{key}'")
+    default = header.get('default')
+    if default is not None and default not in index:
+        raise ProtocolPackError(f"{path}: default protocol '{default}' is not in the index")
+
+
+def _read_header(f, path):
+    """(validated header, offset of the first protocol line) of an open pack file"""
+    header_line = f.readline()
+    try:
+        header = json.loads(header_line)
+    except ValueError as exc:
+        raise ProtocolPackError(f"{path}: unreadable header ({exc})") from None
+    _validate_header(header, path)
+    return header, len(header_line)
+
+
+class ProtocolPack:
+    """
+    An opened protocol pack.
+
+    Only the header is parsed up front; each protocol is read, validated and
+    frozen into a tuple of GuidanceStep the first time it is requested, then
+    the same tuple is returned on every later lookup. The file stays open, so
+    protocols are read from the version that was indexed even after an
+    update replaces the file (write_pack renames the new version into place).
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._file = open(self.path, 'rb')
+        weakref.finalize(self, self._file.close)
+        stat = os.fstat(self._file.fileno())
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+
+        try:
+            header, self._body_offset = _read_header(self._file, self.path)
+        except ProtocolPackError:
+            self._file.close()
+            raise
+
+        self.header = header
+        self.name = header.get('pack')
+        self.version = header.get('version')
+        self.locale = header.get('locale')
+        self.default = header.get('default')
+        self._index = header['index']
+        self._protocols = {}
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def keys(self):
+        return self._index.keys()
+
+    def get(self, key):
+        """Frozen steps for protocol `key` (KeyError if the pack has no such protocol)"""
+        protocol = self._protocols.get(key)
+        if protocol is None:
+            with self._lock:
+                protocol = self._protocols.get(key)
+                if protocol is None:
+                    protocol = self._protocols[key] = self._read(key)
+        return protocol
+
+    def load_raw(self, key):
+        """Parse one protocol record without freezing it"""
+        offset, length = self._index[key]
+        with self._file_lock:
+            self._file.seek(self._body_offset + offset)
+            data = self._file.read(length)
+        try:
+            record = json.loads(data)
+        except ValueError as exc:
+            raise ProtocolPackError(f"{self.path}: protocol '{key}' is corrupt ({exc})") from None
+        if not isinstance(record, dict) or record.get('key') != key:
+            raise ProtocolPackError(f"{self.path}: index entry for '{key}' points at the wrong record")
+        return record
+
+    def _read(self, key):
+        record = self.load_raw(key)
+        _validate_steps(key, record.get('steps'))
+        return tuple(GuidanceStep.from_dict(step) for step in record['steps'])
+
+    def validate(self):
+        """Load every protocol, raising ProtocolPackError on the first problem"""
+        for key in self._index:
+            self.get(key)
+        return self
+
+
+class PackLoader:
+    """
+    Caches opened packs by path and hot-reloads them when the file changes.
+
+    The file is stat-ed at most once per `check_interval` seconds. If a
+    changed file fails to load (e.g. a half-copied update), the last good
+    pack keeps being served and the error is logged.
+    """
+
+    def __init__(self, check_interval=1.0):
+        self.check_interval = check_interval
+        self._packs = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        path = os.path.abspath(path)
+        now = time.monotonic()
+        entry = self._packs.get(path)
+        if entry is not None and now - entry[1] < self.check_interval:
+            return entry[0]
+
+        with self._lock:
+            entry = self._packs.get(path)
+            if entry is not None:
+                pack = entry[0]
+                if now - entry[1] < self.check_interval:
+                    return pack
+                try:
+                    stat = os.stat(path)
+                    changed = (stat.st_mtime_ns, stat.st_size) != (pack.mtime_ns, pack.size)
+                except OSError as exc:
+                    logger.warning("Cannot stat protocol pack %s (%s); keeping version %s", path, exc, pack.version)
+                    changed = False
+                if changed:
+                    try:
+                        pack = ProtocolPack(path)
+                        logger.info("Reloaded protocol pack %s (version %s)", path, pack.version)
+                    except (OSError, ProtocolPackError) as exc:
+                        logger.warning("Failed to reload protocol pack %s (%s); keeping version %s",
+                                       path, exc, pack.version)
+            else:
+                pack = ProtocolPack(path)
+            self._packs[path] = (pack, now)
+            return pack
+
+    def clear(self):
+        with self._lock:
+            self._packs.clear()
+
+
+def write_pack(path, protocols, pack=None, version=None, locale=None, default=None):
+    """
+    Write a protocol pack atomically.
+
+    `protocols` maps protocol key to {'name': ..., 'steps': [step dicts]}.
+    The file is written to a temporary name and renamed into place, so a
+    hot-reloading reader never sees a partially written pack.
+    """
+    body = []
+    index = {}
+    offset = 0
+    for key, protocol in protocols.items():
+        steps = [s.to_dict() if isinstance(s, GuidanceStep) else s for s in protocol['steps']]
+        _validate_steps(key, steps)
+        steps = [GuidanceStep.from_dict(s).to_dict() for s in steps]
+        record = {'key': key, 'name': protocol.get('name', key), 'steps': steps}
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+        index[key] = [offset, len(line) - 1]
+        body.append(line)
+        offset += len(line)
+
+    header = {
+        'format': PACK_FORMAT,
+        'format_version': PACK_FORMAT_VERSION,
+        'pack': pack,
+        'version': version,
+        'locale': locale,
+        'default': default,
+        'index': index
+    }
+    _validate_header(header, path)
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+        f.writelines(body)
+    os.replace(tmp_path, path)
+
+
+def read_records(path):
+    """Read every protocol record in file order, ignoring the header index"""
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline())
+        records = {}
+        for number, line in enumerate(f, 2):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ProtocolPackError(f"{path}:{number}: invalid JSON ({exc})") from None
+            records[record.get('key')] = record
+    return header, records
+
+
+def reindex(path, version=None):
+    """Rebuild a pack's header index after its protocol lines were edited"""
+    header, records = read_records(path)
+    write_pack(
+        path, records,
+        pack=header.get('pack'),
+        version=version or header.get('version'),
+        locale=header.get('locale'),
+        default=header.get('default')
+    )
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m lifeline.packs',
+                                     description='Inspect and maintain protocol packs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    cmd = commands.add_parser('validate', help='Load and validate every protocol in a pack')
+    cmd.add_argument('path')
+    cmd = commands.add_parser('reindex', help='Rebuild the header index after editing protocols')
+    cmd.add_argument('path')
+    cmd.add_argument('--version', help='Set a new pack version while reindexing')
+    cmd = commands.add_parser('show', help='Print the pack header and protocol list')
+    cmd.add_argument('path')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'reindex':
+            reindex(args.path, args.version)
+        pack = ProtocolPack(args.path)
+        if args.command in ('validate', 'reindex'):
+            pack.validate()
+    except (OSError, ProtocolPackError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"{pack.name} {pack.version} ({pack.locale}) - {len(pack.keys())} protocols, default '{pack.default}'")
+    if args.command == 'show':
+        for key in pack.keys():
+            print(f"  {key}: {len(pack.get(key))} steps")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+LifeLine AI – HTML Fragments
+Pre-rendered, escaped HTML for guidance steps (no UI dependencies)
+
+Each step is rendered once into a single balanced HTML fragment and cached
+by (protocol, step index, locale), so the UI sends one element per step
+instead of one markdown call per line of the card.
+"""
+
+import threading
+from html import escape
+
+STEP_CARD = (
+    '<div class="step-card">'
+    '<div style="display: flex; align-items: center; margin-bottom: 20px;">'
+    '<span class="step-number">{number}</span>'
+    '<h2 style="color: #1a1a2e; margin: 0;">{title}</h2>'
+    '</div>'
+    '<div style="font-size: 20px; color: #1a1a2e; margin-bottom: 20px; line-height: 1.6;">'
+    '<strong>What to do:</strong><br>{instruction}'
+    '</div>'
+    '{warning}{details}'
+    '</div>'
+)
+
+STEP_WARNING = (
+    '<div style="background: #ff6b6b; color: white; padding: 15px; border-radius: 10px; margin: 15px 0;">'
+    '⚠️ <strong>WARNING:</strong> {warning}'
+    '</div>'
+)
+
+STEP_DETAILS = (
+    '<div style="background: rgba(0,255,136,0.1); padding: 15px; border-radius: 10px; margin: 15px 0;">'
+    '<strong style="color: #1a1a2e;">Important Details:</strong>'
+    '<ul style="color: #1a1a2e; font-size: 18px; margin-top: 10px;">{items}</ul>'
+    '</div>'
+)
+
+
+def render_step_html(step, step_number):
+    """Render one GuidanceStep as a single escaped HTML fragment"""
+    warning = STEP_WARNING.format(warning=escape(step.warning)) if step.warning else ''
+    details = ''
+    if step.details:
+        items = ''.join(f'<li>{escape(detail)}</li>' for detail in step.details)
+        details = STEP_DETAILS.format(items=items)
+    return STEP_CARD.format(
+        number=step_number,
+        title=escape(step.title),
+        instruction=escape(step.instruction),
+        warning=warning,
+        details=details
+    )
+
+
+class StepFragmentCache:
+    """
+    Rendered step fragments keyed by (protocol, step index, locale).
+
+    Entries remember the GuidanceStep they were rendered from; when a protocol
+    pack is hot-reloaded the step object changes and the fragment is rebuilt.
+    """
+
+    def __init__(self):
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+    def get(self, protocol, step_index, step, locale='en'):
+        key = (protocol, step_index, locale)
+        entry = self._fragments.get(key)
+        if entry is not None and entry[0] is step:
+            return entry[1]
+        fragment = render_step_html(step, step_index + 1)
+        with self._lock:
+            self._fragments[key] = (step, fragment)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+    def __len__(self):
+        return len(self._fragments)
+
+
+STEP_FRAGMENTS = StepFragmentCache()
@@ -0,0 +1,291 @@
+"""
+LifeLine AI – Replay
+Offline regression check of a candidate classifier configuration (no UI dependencies)
+
+Usage:
+    python -m lifeline.replay incidents.jsonl candidate.json -o changed.jsonl
+    python -m lifeline.replay incidents.jsonl candidate.json --current current.json \\
+        --report report.json --fail-on-change
+
+A configuration is a JSON object replacing any of the classifier keyword
+lists (keys are EmergencyClassifier.CONFIG_FIELDS, case-insensitive) plus
+an optional "mode" ('rank' or 'score'). Without --current the shipped
+configuration is the baseline.
+
+Every record is classified by both configurations and the (severity,
+emergency_type) pairs are compared. As in batch triage, a record's
+"locale" field (or the detected language) picks the keyword set: the
+configuration's lists extended with that locale's keyword file. The run prints severity and type
+confusion matrices (current in rows, candidate in columns) and writes one
+line per changed record.
+
+The input is split into newline-aligned byte ranges that worker processes
+read on their own, so the parent never touches record text and throughput
+grows with the number of cores. Each worker compiles both classifiers once
+per locale it meets.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from lifeline.batch import DEFAULT_FIELD, record_description, record_locale
+from lifeline.language import LocaleClassifiers, classifier_for
+from lifeline.triage import TRIAGE_MODE, EmergencyClassifier
+
+# Byte ranges are at least this large (per-range overhead stays negligible)...
+MIN_RANGE_BYTES = 1 << 20
+# ...and at most this large (bounded memory per worker)
+MAX_RANGE_BYTES = 16 << 20
+# Ranges per worker, so a slow range does not leave other cores idle
+RANGES_PER_WORKER = 8
+MODES = ('rank', 'score')
+
+# Per-process classifiers, set by _init_worker
+_configs = None
+
+
+def load_config(path):
+    """(keyword overrides, mode or None) from a configuration JSON file"""
+    with open(path, encoding='utf-8') as config_file:
+        data = json.load(config_file)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: configuration must be a JSON object")
+    mode = data.pop('mode', None)
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"{path}: mode must be one of {', '.join(MODES)}")
+    return {key.upper(): value for key, value in data.items()}, mode
+
+
+def split_ranges(path, workers):
+    """Newline-aligned (start, end) byte ranges covering the file"""
+    size = os.path.getsize(path)
+    count = max(workers * RANGES_PER_WORKER, -(-size // MAX_RANGE_BYTES))
+    count = max(1, min(count, size // MIN_RANGE_BYTES))
+    ranges = []
+    start = 0
+    with open(path, 'rb') as input_file:
+        for i in range(1, count):
+            input_file.seek(max(start, size * i // count))
+            input_file.readline()
+            end = input_file.tell()
+            if end >= size:
+                break
+            if end > start:
+                ranges.append((start, end))
+                start = end
+    ranges.append((start, size))
+    return ranges
+
+
+def _init_worker(current, candidate, field):
+    global _configs
+    _configs = (
+        LocaleClassifiers(base=EmergencyClassifier.with_config(**current[0])), current[1],
+        LocaleClassifiers(base=EmergencyClassifier.with_config(**candidate[0])), candidate[1],
+        field
+    )
+
+
+def _replay_range(path, start, end):
+    """
+    Replay one byte range. Returns (lines, records, errors, severity
+    Counter, type Counter, changed) with line numbers relative to the range.
+    """
+    current, current_mode, candidate, candidate_mode, field = _configs
+    lines = records = errors = 0
+    severities, types = Counter(), Counter()
+    changed = []
+    with open(path, 'rb') as input_file:
+        input_file.seek(start)
+        position = start
+        while position < end:
+            line = input_file.readline()
+            if not line:
+                break
+            position += len(line)
+            lines += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError('Record is not a JSON object')
+                locale, current_classifier, description = classifier_for(
+                    record_description(record, field), record_locale(record), current)
+                candidate_classifier = candidate.get(locale)
+            except ValueError:
+                errors += 1
+                continue
+            before = current_classifier.classify_emergency(description, mode=current_mode)[:2]
+            after = candidate_classifier.classify_emergency(description, mode=candidate_mode)[:2]
+            records += 1
+            severities[before[0], after[0]] += 1
+            types[before[1], after[1]] += 1
+            if before != after:
+                changed.append((lines, record.get('id'), before, after))
+    return lines, records, errors, severities, types, changed
+
+
+class ReplayReport:
+    """Totals, confusion matrices and changed records of a replay run"""
+
+    def __init__(self):
+        self.records = 0
+        self.errors = 0
+        self.severities = Counter()
+        self.types = Counter()
+        self.changed = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def as_dict(self):
+        elapsed = self.elapsed
+        return {
+            'records': self.records,
+            'errors': self.errors,
+            'changed': len(self.changed),
+            'seconds': round(elapsed, 3),
+            'records_per_second': round(self.records / elapsed, 1) if elapsed > 0 else 0.0,
+            'severity_confusion': _nested(self.severities),
+            'type_confusion': _nested(self.types)
+        }
+
+    def __str__(self):
+        return (f"{self.records} records, {len(self.changed)} changed ({self.errors} errors) "
+                f"in {self.elapsed:.2f}s")
+
+
+def _nested(counts):
+    matrix = {}
+    for (before, after), count in sorted(counts.items()):
+        matrix.setdefault(before, {})[after] = count
+    return matrix
+
+
+def format_matrix(counts, title):
+    """Plain-text confusion matrix, current in rows and candidate in columns"""
+    labels = sorted({label for pair in counts for label in pair})
+    width = max([len(title)] + [len(label) for label in labels])
+    cells = [max(len(label), len(str(max(counts.values(), default=0)))) for label in labels]
+    lines = [title.ljust(width) + ' ' + ' '.join(label.rjust(cell) for label, cell in zip(labels, cells))]
+    for before in labels:
+        row = [str(counts.get((before, after), 0) or '.').rjust(cell) for after, cell in zip(labels, cells)]
+        lines.append(before.ljust(width) + ' ' + ' '.join(row))
+    return '\n'.join(lines)
+
+
+def replay_file(path, candidate, current=({}, None), field=DEFAULT_FIELD, workers=None):
+    """
+    Replay a JSONL file through the current and candidate configurations,
+    each given as (overrides, mode). Returns a ReplayReport whose `changed`
+    holds (line, id, (severity, type) before, (severity, type) after).
+    """
+    workers = workers or os.cpu_count() or 1
+    for overrides, _ in (current, candidate):
+        # Validate in the parent so a bad key fails before any worker starts
+        EmergencyClassifier.with_config(**overrides)
+    current = (current[0], current[1] or TRIAGE_MODE)
+    candidate = (candidate[0], candidate[1] or TRIAGE_MODE)
+
+    report = ReplayReport()
+    ranges = split_ranges(path, workers)
+    if workers == 1 or len(ranges) == 1:
+        _init_worker(current, candidate, field)
+        results = (_replay_range(path, start, end) for start, end in ranges)
+        _merge(report, results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(current, candidate, field)) as pool:
+            results = pool.map(_replay_range, [path] * len(ranges),
+                               [start for start, _ in ranges], [end for _, end in ranges])
+            _merge(report, results)
+    report.finished = time.perf_counter()
+    return report
+
+
+def _merge(report, results):
+    # Results arrive in range order, so line numbers are a running offset
+    offset = 0
+    for lines, records, errors, severities, types, changed in results:
+        report.records += records
+        report.errors += errors
+        report.severities.update(severities)
+        report.types.update(types)
+        report.changed.extend((offset + line, record_id, before, after)
+                              for line, record_id, before, after in changed)
+        offset += lines
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        prog='python -m lifeline.replay',
+        description='Compare triage decisions of a candidate classifier configuration '
+                    'against the current one over a JSONL corpus.'
+    )
+    parser.add_argument('input', help="JSONL file of incident descriptions")
+    parser.add_argument('candidate', help="Candidate configuration JSON")
+    parser.add_argument('--current', help="Baseline configuration JSON (default: shipped keywords)")
+    parser.add_argument('-o', '--output', help="Write changed records as JSONL here ('-' for stdout)")
+    parser.add_argument('--report', help="Write totals and confusion matrices as JSON here")
+    parser.add_argument('--field', default=DEFAULT_FIELD,
+                        help=f"Record field holding the description (default: {DEFAULT_FIELD})")
+    parser.add_argument('--mode', choices=MODES,
+                        help="Triage mode for configurations that set none (default: LIFELINE_TRIAGE_MODE)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--fail-on-change', action='store_true',
+                        help="Exit with status 1 if any decision changed")
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    try:
+        candidate = load_config(args.candidate)
+        current = load_config(args.current) if args.current else ({}, None)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    candidate = (candidate[0], candidate[1] or args.mode)
+    current = (current[0], current[1] or args.mode)
+
+    try:
+        report = replay_file(args.input, candidate, current, field=args.field, workers=args.workers)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.output:
+        output_file = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            for line, record_id, before, after in report.changed:
+                output_file.write(json.dumps({
+                    'line': line,
+                    'id': record_id,
+                    'current': {'severity': before[0], 'emergency_type': before[1]},
+                    'candidate': {'severity': after[0], 'emergency_type': after[1]}
+                }, ensure_ascii=False) + '\n')
+        finally:
+            if output_file is not sys.stdout:
+                output_file.close()
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report_file:
+            json.dump(report.as_dict(), report_file, indent=2)
+
+    print(format_matrix(report.severities, 'severity'), file=sys.stderr)
+    print(file=sys.stderr)
+    print(format_matrix(report.types, 'type'), file=sys.stderr)
+    print(f"\nReplayed {report}", file=sys.stderr)
+    return 1 if args.fail_on_change and report.changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+LifeLine AI – Triage Service
+Headless HTTP/JSON API for dispatch systems, as a plain ASGI application
+
+Usage:
+    python -m lifeline.service --port 8080          # needs `pip install uvicorn`
+    uvicorn lifeline.service:app --port 8080         # or any ASGI server
+
+Endpoints:
+    POST /v1/triage                  {"description": "...", "locale": "es"}   (locale optional)
+    POST /v1/triage/batch            {"records": [{..., "locale": "es"}, ...], "field": "description"}
+    GET  /v1/guidance/<emergency_type>?locale=es
+    GET  /healthz
+    GET  /metrics                    Prometheus text (with LIFELINE_METRICS=1)
+
+Triage requests go through a bounded queue to `workers` threads, so no
+triage work runs on the event loop: a large batch occupies one worker while
+health checks, guidance and other clients are still served. When the queue
+is full the service answers 503 with Retry-After instead of letting latency
+grow without bound. Triage is pure Python and the threads share one core
+(the GIL); to use more cores run several processes (`uvicorn --workers N`).
+Connection keep-alive is handled by the ASGI server.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from lifeline.batch import DEFAULT_FIELD, triage_record
+from lifeline.guidance import registry_for
+from lifeline.language import classifier_for
+from lifeline.metrics import METRICS, stage
+
+DEFAULT_QUEUE_SIZE = int(os.environ.get('LIFELINE_SERVICE_QUEUE', 256))
+DEFAULT_WORKERS = int(os.environ.get('LIFELINE_SERVICE_WORKERS', 4))
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_RECORDS = 1000
+RETRY_AFTER_SECONDS = 1
+PROMETHEUS_HEADERS = ((b'content-type', b'text/plain; version=0.0.4; charset=utf-8'),)
+
+
+class HTTPError(Exception):
+    """Turned into a JSON error response with the given status"""
+
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = tuple(headers)
+
+
+# ============================================================================
+# HANDLERS
+# ============================================================================
+
+def _parse_json(body):
+    try:
+        return json.loads(body)
+    except ValueError as exc:
+        raise HTTPError(400, f'Invalid JSON: {exc}') from None
+
+
+def triage_handler(body):
+    payload = _parse_json(body)
+    description = payload.get('description') if isinstance(payload, dict) else None
+    if not isinstance(description, str):
+        raise HTTPError(400, 'Expected a JSON object with a "description" string')
+    locale = payload.get('locale')
+    if locale is not None and not isinstance(locale, str):
+        raise HTTPError(400, '"locale" must be a string')
+    with stage('service_triage'):
+        try:
+            locale, classifier, description = classifier_for(description, locale)
+        except ValueError as exc:
+            raise HTTPError(400, str(exc)) from None
+        severity, emergency_type, reasoning = classifier.classify_emergency(description)
+    return {
+        'severity': severity,
+        'emergency_type': emergency_type,
+        'reasoning': reasoning,
+        'locale': locale
+    }
+
+
+def batch_handler(body):
+    payload = _parse_json(body)
+    field = DEFAULT_FIELD
+    if isinstance(payload, dict):
+        field = payload.get('field') or DEFAULT_FIELD
+        payload = payload.get('records')
+    if not isinstance(field, str):
+        raise HTTPError(400, '"field" must be a string')
+    if not isinstance(payload, list):
+        raise HTTPError(400, 'Expected a list of records or {"records": [...]}')
+    if len(payload) > MAX_BATCH_RECORDS:
+        raise HTTPError(413, f'At most {MAX_BATCH_RECORDS} records per batch')
+
+    results = []
+    with stage('service_triage_batch'):
+        for index, record in enumerate(payload):
+            if not isinstance(record, dict):
+                results.append({'index': index, 'error': 'Record is not a JSON object'})
+            else:
+                try:
+                    triaged = triage_record(record, field)
+                except ValueError as exc:
+                    results.append({'index': index, 'error': str(exc)})
+                else:
+                    result = {'index': index}
+                    result.update(triaged)
+                    results.append(result)
+    return {'results': results}
+
+
+class GuidanceResponses:
+    """
+    Serialized guidance per protocol and pack, rebuilt when the pack is
+    reloaded. Only the requested type is echoed per request; every unknown
+    type shares the default protocol's entry, so clients cannot grow the
+    cache by inventing types.
+    """
+
+    def __init__(self, registries=registry_for):
+        self.registries = registries
+        self._bodies = {}
+
+    def get(self, emergency_type, locale=None):
+        registry = self.registries(locale)
+        steps = registry.get(emergency_type)
+        known = emergency_type in registry
+        key = (emergency_type if known else None, registry.pack_path)
+        entry = self._bodies.get(key)
+        if entry is None or entry[0] is not steps:
+            # Everything after the leading "emergency_type" member
+            tail = json.dumps({
+                'known': known,
+                'locale': registry.locale,
+                'steps': [step.to_dict() for step in steps]
+            }, ensure_ascii=False)[1:].encode('utf-8')
+            entry = self._bodies[key] = (steps, tail)
+        head = json.dumps(emergency_type, ensure_ascii=False).encode('utf-8')
+        return b'{"emergency_type": ' + head + b', ' + entry[1]
+
+
+GUIDANCE_RESPONSES = GuidanceResponses()
+
+
+# ============================================================================
+# ASGI APPLICATION
+# ============================================================================
+
+class TriageService:
+    """
+    ASGI application. Work items are (handler, body, future) tuples consumed
+    by `workers` tasks from a queue of at most `queue_size` items; each task
+    runs its synchronous handler on a pool of `workers` threads.
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE, workers=DEFAULT_WORKERS):
+        self.queue_size = queue_size
+        self.workers = workers
+        self.rejected = 0
+        self.completed = 0
+        self._queue = None
+        self._tasks = []
+        self._executor = None
+
+    # Worker pool ------------------------------------------------------------
+
+    def _ensure_started(self):
+        """Start the queue and workers on the running loop (lifespan or first request)"""
+        if self._queue is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='lifeline-service')
+            self._queue = asyncio.Queue(self.queue_size)
+            self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            handler, body, future = await self._queue.get()
+            try:
+                if not future.cancelled():
+                    result = await loop.run_in_executor(self._executor, handler, body)
+                    if not future.cancelled():
+                        future.set_result(result)
+            except Exception as exc:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            finally:
+                self._queue.task_done()
+
+    async def _shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._queue = None
+        self._tasks = []
+        self._executor = None
+
+    async def submit(self, handler, body):
+        """Run handler(body) on a worker; raises HTTPError(503) when the queue is full"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((handler, body, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPError(503, 'Triage queue is full; retry shortly',
+                            [(b'retry-after', str(RETRY_AFTER_SECONDS).encode())]) from None
+        result = await future
+        self.completed += 1
+        return result
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'queue_size': self.queue_size,
+            'workers': self.workers,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+
+    # ASGI -------------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._ensure_started()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self._shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        try:
+            status, body, headers = await self._route(scope, receive)
+        except HTTPError as exc:
+            status = exc.status
+            body = json.dumps({'error': exc.message}).encode('utf-8')
+            headers = exc.headers
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                *(() if any(name == b'content-type' for name, _ in headers)
+                  else ((b'content-type', b'application/json'),)),
+                (b'content-length', str(len(body)).encode()),
+                *headers
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _route(self, scope, receive):
+        method = scope['method']
+        path = scope['path'].rstrip('/') or '/'
+
+        if path == '/healthz':
+            return 200, json.dumps(self.health()).encode('utf-8'), ()
+
+        if path == '/metrics':
+            if not METRICS.enabled:
+                raise HTTPError(404, 'Metrics are disabled; set LIFELINE_METRICS=1')
+            return 200, METRICS.render_prometheus().encode('utf-8'), PROMETHEUS_HEADERS
+
+        if path.startswith('/v1/guidance/'):
+            if method != 'GET':
+                raise HTTPError(405, 'Use GET')
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            locale = query.get('locale', [None])[0]
+            return 200, GUIDANCE_RESPONSES.get(path[len('/v1/guidance/'):], locale), ()
+
+        handler = {'/v1/triage': triage_handler, '/v1/triage/batch': batch_handler}.get(path)
+        if handler is None:
+            raise HTTPError(404, f'No route for {path}')
+        if method != 'POST':
+            raise HTTPError(405, 'Use POST')
+
+        result = await self.submit(handler, await read_body(receive))
+        return 200, json.dumps(result, ensure_ascii=False).encode('utf-8'), ()
+
+
+async def read_body(receive):
+    """Collect the request body, refusing anything over MAX_BODY_BYTES"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise HTTPError(400, 'Client disconnected')
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HTTPError(413, f'Request body exceeds {MAX_BODY_BYTES} bytes')
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+app = TriageService()
+
+
+def main(argv=None):
+    """Command-line entry point (serves `app` with uvicorn)"""
+    parser = argparse.ArgumentParser(
+        prog='python -m lifeline.service',
+        description='Serve the triage engine over HTTP/JSON.'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Pending requests before answering 503 (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Worker threads running triage (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--keep-alive', type=int, default=5,
+                        help="Seconds an idle keep-alive connection stays open (default: 5)")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("The service needs an ASGI server: pip install uvicorn", file=sys.stderr)
+        return 2
+
+    app.queue_size = args.queue_size
+    app.workers = args.workers
+    uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=args.keep_alive,
+                log_level='warning')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+LifeLine AI – Incident State
+One compact, slotted object per emergency session (no UI dependencies)
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime
+
+from lifeline.events import (ACTION_LOGGED, DEFAULT_WINDOW, INCIDENT_STARTED, NAVIGATED,
+                             NOTE_ADDED, STEP_COMPLETED, IncidentLog)
+from lifeline.summary import SummaryBuilder
+from lifeline.triage import Contribution
+
+# Where evicted events are spilled to disk (disabled when unset)
+SPILL_DIR = os.environ.get('LIFELINE_EVENT_SPILL_DIR')
+
+
+class IncidentState:
+    """
+    Everything a session tracks about the current emergency.
+
+    Completed steps are a bitset (bit i set = step i done), elapsed time is
+    measured on the monotonic clock, and step completions, navigation,
+    actions and notes go to a bounded, append-only IncidentLog. Starting or
+    resetting an incident replaces the whole object, so fields cannot drift
+    out of sync.
+    """
+
+    __slots__ = (
+        'incident_id', 'active', 'started_at', 'started_monotonic', 'current_step', 'completed',
+        'severity_level', 'emergency_type', 'classification_reasoning', 'contributions',
+        'description', 'locale', 'has_image', 'image_analysis', 'additional_notes', 'show_summary',
+        'log', 'summary'
+    )
+
+    def __init__(self, log=None):
+        self.incident_id = None
+        self.active = False
+        self.started_at = None
+        self.started_monotonic = None
+        self.current_step = 0
+        self.completed = 0
+        self.severity_level = None
+        self.emergency_type = None
+        self.classification_reasoning = None
+        self.contributions = ()
+        self.description = None
+        self.locale = 'en'
+        self.has_image = False
+        # Presence-only image result; None while the analysis is pending
+        self.image_analysis = None
+        self.additional_notes = None
+        self.show_summary = False
+        self.log = log if log is not None else IncidentLog()
+        self.summary = SummaryBuilder()
+
+    @classmethod
+    def start(cls, description, severity_level, emergency_type, reasoning, has_image=False,
+              contributions=(), locale='en', window=DEFAULT_WINDOW, spill_dir=SPILL_DIR):
+        """New active incident, timed from now"""
+        incident_id = uuid.uuid4().hex[:16]
+        spill_path = os.path.join(spill_dir, f"incident-{incident_id}.jsonl") if spill_dir else None
+        incident = cls(IncidentLog(window, spill_path))
+        incident.incident_id = incident_id
+        incident.active = True
+        incident.started_at = datetime.now()
+        incident.started_monotonic = time.monotonic()
+        incident.description = description
+        incident.locale = locale
+        incident.has_image = has_image
+        incident.severity_level = severity_level
+        incident.emergency_type = emergency_type
+        incident.classification_reasoning = reasoning
+        incident.contributions = tuple(contributions)
+        incident.log.append(INCIDENT_STARTED, 0.0, text=description)
+        return incident
+
+    # Persistence -----------------------------------------------------------
+
+    def to_dict(self):
+        """Plain-data snapshot of everything but the event log (see from_dict)"""
+        return {
+            'incident_id': self.incident_id,
+            'active': self.active,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'current_step': self.current_step,
+            'completed': self.completed,
+            'severity_level': self.severity_level,
+            'emergency_type': self.emergency_type,
+            'classification_reasoning': self.classification_reasoning,
+            'contributions': [c._asdict() for c in self.contributions],
+            'description': self.description,
+            'locale': self.locale,
+            'has_image': self.has_image,
+            'image_analysis': self.image_analysis,
+            'additional_notes': self.additional_notes,
+            'show_summary': self.show_summary,
+            'window': self.log.window
+        }
+
+    @classmethod
+    def from_dict(cls, data, events=(), spill_dir=SPILL_DIR):
+        """
+        Rebuild an incident from to_dict() output and its logged events
+        (IncidentEvent-like objects, oldest first). The timer carries on
+        from the original wall-clock start.
+        """
+        incident_id = data['incident_id']
+        log = IncidentLog(data.get('window', DEFAULT_WINDOW))
+        for event in events:
+            log.append(event.kind, event.offset, event.step, event.text)
+        if spill_dir and incident_id:
+            # Replayed events that fell out of the window are already in the store
+            log.spill_path = os.path.join(spill_dir, f"incident-{incident_id}.jsonl")
+
+        incident = cls(log)
+        incident.incident_id = incident_id
+        incident.active = data['active']
+        if data['started_at']:
+            incident.started_at = datetime.fromisoformat(data['started_at'])
+            age = max(0.0, (datetime.now() - incident.started_at).total_seconds())
+            incident.started_monotonic = time.monotonic() - age
+        incident.current_step = data['current_step']
+        incident.completed = data['completed']
+        incident.severity_level = data['severity_level']
+        incident.emergency_type = data['emergency_type']
+        incident.classification_reasoning = data['classification_reasoning']
+        incident.contributions = tuple(Contribution(**c) for c in data.get('contributions', ()))
+        incident.description = data['description']
+        incident.locale = data.get('locale', 'en')
+        incident.has_image = data['has_image']
+        incident.image_analysis = data.get('image_analysis')
+        incident.additional_notes = data['additional_notes']
+        incident.show_summary = data['show_summary']
+        return incident
+
+    def elapsed_seconds(self):
+        if self.started_monotonic is None:
+            return 0.0
+        return time.monotonic() - self.started_monotonic
+
+    # Steps -----------------------------------------------------------------
+
+    def complete_step(self, index, title=None):
+        self.completed |= 1 << index
+        self.log.append(STEP_COMPLETED, self.elapsed_seconds(), index + 1, title)
+
+    def go_to_step(self, index):
+        """Move to step `index` (0-based), recording the navigation"""
+        if index != self.current_step:
+            direction = 'next' if index > self.current_step else 'previous'
+            self.current_step = index
+            self.log.append(NAVIGATED, self.elapsed_seconds(), index + 1, direction)
+
+    def is_completed(self, index):
+        return bool(self.completed >> index & 1)
+
+    @property
+    def completed_count(self):
+        return bin(self.completed).count('1')
+
+    def completed_indices(self):
+        """Indices of completed steps in ascending order"""
+        bits = self.completed
+        index = 0
+        while bits:
+            if bits & 1:
+                yield index
+            bits >>= 1
+            index += 1
+
+    def completed_titles(self, steps):
+        """Titles of completed steps, given the incident's guidance steps"""
+        return [steps[i].title for i in self.completed_indices() if i < len(steps)]
+
+    # Actions & notes -------------------------------------------------------
+
+    def log_action(self, step_number, text):
+        self.log.append(ACTION_LOGGED, self.elapsed_seconds(), step_number, text)
+
+    def set_notes(self, notes):
+        """Update the responder notes, logging only actual changes"""
+        if notes != self.additional_notes:
+            self.additional_notes = notes
+            self.log.append(NOTE_ADDED, self.elapsed_seconds(), text=notes)
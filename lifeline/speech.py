@@ -0,0 +1,298 @@
+"""
+LifeLine AI – Speech Intake
+Streaming speech-to-text with incremental triage of the partial transcript (no UI dependencies)
+
+Audio arrives as chunks of 16-bit mono PCM. A backend turns them into a
+growing transcript, and every time the transcript changes it is triaged
+again, so a critical phrase ("not breathing") raises the severity as soon
+as it is recognised rather than when the caller stops talking.
+
+Backends:
+    vosk      offline CPU recognition with Vosk (`pip install vosk`, and
+              LIFELINE_VOSK_MODEL pointing at an unpacked model directory)
+    scripted  stand-in that "recognises" a given text at a steady speaking
+              rate, for tests, demos and benchmarks
+
+Usage:
+    python -m lifeline.speech recording.wav
+    python -m lifeline.speech recording.wav --backend scripted \\
+        --script "he collapsed and is not breathing"
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import wave
+from typing import NamedTuple
+
+from lifeline.language import classifier_for
+
+DEFAULT_BACKEND = os.environ.get('LIFELINE_SPEECH_BACKEND', 'vosk')
+VOSK_MODEL = os.environ.get('LIFELINE_VOSK_MODEL')
+SAMPLE_WIDTH = 2
+# Audio fed to the backend per step; smaller chunks mean earlier partials
+DEFAULT_CHUNK_SECONDS = 0.1
+# Speaking rate of the scripted backend (about 150 words per minute)
+SCRIPTED_WORDS_PER_SECOND = 2.5
+
+
+class SpeechUnavailable(RuntimeError):
+    """Raised when a speech backend cannot run here (package or model missing)"""
+
+
+class TranscriptUpdate(NamedTuple):
+    """Triage of the transcript as it stood `audio_seconds` into the recording"""
+    audio_seconds: float
+    transcript: str
+    final: bool
+    severity: str
+    emergency_type: str
+    reasoning: str
+    locale: str
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class SpeechBackend:
+    """Base class: stream() returns a recognizer for one utterance"""
+
+    name = None
+
+    def stream(self, sample_rate):
+        """New recognizer with accept(chunk) -> transcript and finish() -> transcript"""
+        raise NotImplementedError
+
+
+class VoskBackend(SpeechBackend):
+    """Offline Kaldi recognition through the `vosk` package; the model is loaded once per path"""
+
+    name = 'vosk'
+    _models = {}
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path or VOSK_MODEL
+
+    def _model(self):
+        try:
+            import vosk
+        except ImportError:
+            raise SpeechUnavailable("Speech recognition needs the vosk package: pip install vosk") from None
+        if not self.model_path or not os.path.isdir(self.model_path):
+            raise SpeechUnavailable("Set LIFELINE_VOSK_MODEL to an unpacked Vosk model directory")
+        model = self._models.get(self.model_path)
+        if model is None:
+            vosk.SetLogLevel(-1)
+            model = self._models[self.model_path] = vosk.Model(self.model_path)
+        return vosk, model
+
+    def stream(self, sample_rate):
+        vosk, model = self._model()
+        return _VoskStream(vosk.KaldiRecognizer(model, sample_rate))
+
+
+class _VoskStream:
+    def __init__(self, recognizer):
+        self._recognizer = recognizer
+        self._final = []
+
+    def _text(self, partial=''):
+        return ' '.join(part for part in self._final + [partial] if part)
+
+    def accept(self, chunk):
+        if self._recognizer.AcceptWaveform(chunk):
+            self._final.append(json.loads(self._recognizer.Result()).get('text', ''))
+            return self._text()
+        return self._text(json.loads(self._recognizer.PartialResult()).get('partial', ''))
+
+    def finish(self):
+        self._final.append(json.loads(self._recognizer.FinalResult()).get('text', ''))
+        return self._text()
+
+
+class ScriptedBackend(SpeechBackend):
+    """
+    Recognises `script` word by word at `words_per_second` of audio,
+    whatever the audio contains. Lets the pipeline be exercised without a
+    speech model.
+    """
+
+    name = 'scripted'
+
+    def __init__(self, script='', words_per_second=SCRIPTED_WORDS_PER_SECOND):
+        self.words = script.split()
+        self.words_per_second = words_per_second
+
+    def stream(self, sample_rate):
+        return _ScriptedStream(self.words, self.words_per_second, sample_rate)
+
+
+class _ScriptedStream:
+    def __init__(self, words, words_per_second, sample_rate):
+        self._words = words
+        self._words_per_second = words_per_second
+        self._bytes_per_second = sample_rate * SAMPLE_WIDTH
+        self._received = 0
+
+    def accept(self, chunk):
+        self._received += len(chunk)
+        heard = int(self._received / self._bytes_per_second * self._words_per_second)
+        return ' '.join(self._words[:heard])
+
+    def finish(self):
+        return ' '.join(self._words)
+
+
+BACKENDS = {
+    VoskBackend.name: VoskBackend,
+    ScriptedBackend.name: ScriptedBackend
+}
+
+
+def register_backend(backend_class):
+    """Make a SpeechBackend subclass selectable by its name"""
+    BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+
+# ============================================================================
+# AUDIO
+# ============================================================================
+
+def read_wav(data):
+    """(16-bit mono PCM bytes, sample rate) from WAV file bytes"""
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as exc:
+        raise ValueError(f"Unreadable WAV audio ({exc})") from None
+    if width != SAMPLE_WIDTH:
+        raise ValueError(f"Expected 16-bit audio, got {width * 8}-bit")
+    if channels > 1:
+        import numpy as np
+        samples = np.frombuffer(frames, dtype='<i2').reshape(-1, channels)
+        frames = samples.mean(axis=1).astype('<i2').tobytes()
+    return frames, rate
+
+
+def iter_chunks(pcm, sample_rate, seconds=DEFAULT_CHUNK_SECONDS):
+    """Split PCM bytes into chunks of `seconds` of audio"""
+    size = max(SAMPLE_WIDTH, int(sample_rate * seconds) * SAMPLE_WIDTH)
+    for start in range(0, len(pcm), size):
+        yield pcm[start:start + size]
+
+
+# ============================================================================
+# INTAKE
+# ============================================================================
+
+class SpeechIntake:
+    """
+    One caller's utterance: feed() audio chunks as they arrive, finish()
+    at the end. Each call returns a TranscriptUpdate when the transcript
+    changed (None otherwise). `locale` fixes the triage language; by default
+    it is detected from the transcript on every update.
+    """
+
+    def __init__(self, backend=None, sample_rate=16000, locale=None):
+        if backend is None or isinstance(backend, str):
+            name = backend or DEFAULT_BACKEND
+            if name not in BACKENDS:
+                raise KeyError(f"Unknown speech backend: {name}")
+            backend = BACKENDS[name]()
+        self.sample_rate = sample_rate
+        self.locale = locale
+        self.transcript = ''
+        self.audio_seconds = 0.0
+        self.updates = []
+        self.first_critical = None
+        self._stream = backend.stream(sample_rate)
+        self._bytes_per_second = sample_rate * SAMPLE_WIDTH
+
+    @property
+    def latest(self):
+        return self.updates[-1] if self.updates else None
+
+    def _update(self, transcript, final):
+        transcript = transcript.strip()
+        if transcript == self.transcript and not final:
+            return None
+        self.transcript = transcript
+        locale, classifier, text = classifier_for(transcript, self.locale)
+        severity, emergency_type, reasoning = classifier.classify_emergency(text)
+        update = TranscriptUpdate(self.audio_seconds, transcript, final, severity, emergency_type,
+                                  reasoning, locale)
+        self.updates.append(update)
+        if severity == 'critical' and self.first_critical is None:
+            self.first_critical = update
+        return update
+
+    def feed(self, chunk):
+        """Recognise one chunk of 16-bit mono PCM"""
+        self.audio_seconds += len(chunk) / self._bytes_per_second
+        return self._update(self._stream.accept(chunk), False)
+
+    def finish(self):
+        """End of speech: final transcript and triage"""
+        return self._update(self._stream.finish(), True)
+
+
+def transcribe(pcm, sample_rate, backend=None, chunk_seconds=DEFAULT_CHUNK_SECONDS, locale=None,
+               on_update=None):
+    """
+    Run recorded PCM through a SpeechIntake chunk by chunk, calling
+    on_update(update) for every change. Returns the finished SpeechIntake.
+    """
+    intake = SpeechIntake(backend, sample_rate, locale)
+    for chunk in iter_chunks(pcm, sample_rate, chunk_seconds):
+        update = intake.feed(chunk)
+        if update is not None and on_update is not None:
+            on_update(update)
+    update = intake.finish()
+    if update is not None and on_update is not None:
+        on_update(update)
+    return intake
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        prog='python -m lifeline.speech',
+        description='Stream a WAV recording through speech recognition and incremental triage.'
+    )
+    parser.add_argument('input', help="16-bit WAV file")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=sorted(BACKENDS),
+                        help=f"Speech backend (default: {DEFAULT_BACKEND})")
+    parser.add_argument('--script', default='',
+                        help="Text the scripted backend recognises")
+    parser.add_argument('--chunk-ms', type=int, default=int(DEFAULT_CHUNK_SECONDS * 1000),
+                        help="Audio per chunk in milliseconds (default: %(default)s)")
+    parser.add_argument('--locale', help="Triage language (default: detected)")
+    args = parser.parse_args(argv)
+
+    if args.chunk_ms < 1:
+        parser.error('--chunk-ms must be at least 1')
+    try:
+        with open(args.input, 'rb') as f:
+            pcm, rate = read_wav(f.read())
+        backend = ScriptedBackend(args.script) if args.backend == 'scripted' else BACKENDS[args.backend]()
+        intake = transcribe(
+            pcm, rate, backend, args.chunk_ms / 1000, args.locale,
+            on_update=lambda u: print(f"{u.audio_seconds:6.2f}s  {u.severity:<8} {u.emergency_type:<20} "
+                                      f"{'final' if u.final else 'partial':<7}  {u.transcript}")
+        )
+    except (OSError, ValueError, SpeechUnavailable) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if intake.first_critical is not None:
+        print(f"Critical after {intake.first_critical.audio_seconds:.2f}s of audio", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
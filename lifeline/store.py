@@ -0,0 +1,259 @@
+"""
+LifeLine AI – Incident Store
+Optional local persistence of incidents on SQLite (no UI dependencies)
+
+Set LIFELINE_STORE=/path/to/lifeline.db to enable. Incident state, the
+event log and rendered summaries survive a browser reload or a server
+restart and can be resumed by incident id.
+
+The database runs in WAL mode, so reads never wait for the writer. All
+writes go through one background thread: callers only put rows on a queue,
+and the writer commits everything that arrives within FLUSH_INTERVAL in a
+single transaction (group commit). Statements are fixed SQL strings, so
+sqlite3's per-connection statement cache prepares each of them once.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from lifeline.events import IncidentEvent
+from lifeline.session import IncidentState
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = os.environ.get('LIFELINE_STORE')
+# Writes queued within this many seconds share one transaction
+FLUSH_INTERVAL = float(os.environ.get('LIFELINE_STORE_FLUSH_INTERVAL', 0.05))
+MAX_BATCH = 1024
+# Incidents whose last synced version is remembered before the table is reset
+MAX_TRACKED = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    incident_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    incident_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    kind TEXT NOT NULL,
+    step INTEGER,
+    text TEXT,
+    PRIMARY KEY (incident_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS summaries (
+    incident_id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+UPSERT_INCIDENT = (
+    "INSERT INTO incidents (incident_id, state, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(incident_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at"
+)
+INSERT_EVENT = (
+    "INSERT OR IGNORE INTO events (incident_id, seq, elapsed, kind, step, text) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+UPSERT_SUMMARY = (
+    "INSERT INTO summaries (incident_id, text, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(incident_id) DO UPDATE SET text = excluded.text, updated_at = excluded.updated_at"
+)
+SELECT_INCIDENT = "SELECT state FROM incidents WHERE incident_id = ?"
+SELECT_EVENTS = "SELECT seq, elapsed, kind, step, text FROM events WHERE incident_id = ? ORDER BY seq"
+SELECT_SUMMARY = "SELECT text FROM summaries WHERE incident_id = ?"
+
+# Rows of these statements replace earlier rows for the same incident
+_LAST_WINS = (UPSERT_INCIDENT, UPSERT_SUMMARY)
+# Queue markers: stop the writer / commit without waiting out the interval
+_STOP = object()
+_FLUSH = object()
+
+
+def _version(incident):
+    """Changes whenever anything persisted about the incident changes"""
+    return (incident.log.seq, incident.current_step, incident.completed, incident.active,
+            incident.show_summary, incident.image_analysis is not None)
+
+
+def connect(path):
+    """SQLite connection in WAL mode with the incident schema"""
+    db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.executescript(SCHEMA)
+    return db
+
+
+class IncidentStore:
+    """
+    Durable incidents keyed by incident id.
+
+    sync(), save_summary() and close_incident() only queue rows and return
+    immediately; load() reads through a per-thread connection.
+    """
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.commits = 0
+        self.errors = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+        self._written = threading.Condition()
+        self._queued = 0
+        self._done = 0
+        self._local = threading.local()
+        self._synced = {}
+        self._summaries = {}
+        connect(path).close()
+
+    # Writing ---------------------------------------------------------------
+
+    def _put(self, statement, row):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run, name='lifeline-store', daemon=True)
+                    self._writer.start()
+                    atexit.register(self.close)
+        with self._written:
+            self._queued += 1
+        self._queue.put((statement, row))
+
+    def sync(self, incident):
+        """Queue whatever changed in `incident` since its last sync (nothing if unchanged)"""
+        incident_id = incident.incident_id
+        if not incident_id:
+            return
+        version = _version(incident)
+        previous = self._synced.get(incident_id)
+        if previous == version:
+            return
+        for event in incident.log.since(previous[0] if previous else 0):
+            self._put(INSERT_EVENT, (incident_id, event.seq, event.offset, event.kind,
+                                     event.step, event.text))
+        self._put(UPSERT_INCIDENT, (incident_id, json.dumps(incident.to_dict(), ensure_ascii=False),
+                                    time.time()))
+        if len(self._synced) >= MAX_TRACKED:
+            self._synced.clear()
+        self._synced[incident_id] = version
+
+    def close_incident(self, incident):
+        """Mark an incident finished so it is no longer offered for resuming"""
+        incident.active = False
+        self.sync(incident)
+        self._synced.pop(incident.incident_id, None)
+        self._summaries.pop(incident.incident_id, None)
+
+    def save_summary(self, incident_id, text):
+        """Queue the latest rendered summary of an incident"""
+        if not incident_id or self._summaries.get(incident_id) == text:
+            return
+        if len(self._summaries) >= MAX_TRACKED:
+            self._summaries.clear()
+        self._summaries[incident_id] = text
+        self._put(UPSERT_SUMMARY, (incident_id, text, time.time()))
+
+    def _run(self):
+        db = connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < MAX_BATCH and batch[-1] is not _STOP and batch[-1] is not _FLUSH:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            writes = [item for item in batch if item is not _STOP and item is not _FLUSH]
+            if writes:
+                self._commit(db, writes)
+            with self._written:
+                self._done += len(writes)
+                self._written.notify_all()
+            if stop:
+                db.close()
+                return
+
+    def _commit(self, db, writes):
+        """One transaction for a batch; last state/summary per incident wins"""
+        rows = {}
+        latest = {}
+        for statement, row in writes:
+            if statement in _LAST_WINS:
+                latest[statement, row[0]] = row
+            else:
+                rows.setdefault(statement, []).append(row)
+        for (statement, _), row in latest.items():
+            rows.setdefault(statement, []).append(row)
+        try:
+            with db:
+                for statement, statement_rows in rows.items():
+                    db.executemany(statement, statement_rows)
+            self.commits += 1
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.error("Incident store write of %d rows failed: %s", len(writes), exc)
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is committed; False on timeout"""
+        with self._written:
+            target = self._queued
+            if self._done >= target:
+                return True
+        self._queue.put(_FLUSH)
+        with self._written:
+            return self._written.wait_for(lambda: self._done >= target, timeout)
+
+    def close(self):
+        """Commit pending writes and stop the writer thread"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join()
+        self._writer = None
+
+    # Reading ---------------------------------------------------------------
+
+    def _reader(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = connect(self.path)
+        return db
+
+    def load(self, incident_id, active_only=True):
+        """
+        The stored incident with its event log, or None. Writes still queued
+        are committed first (a few milliseconds at most).
+        """
+        if self._done < self._queued:
+            self.flush(timeout=1.0)
+        db = self._reader()
+        row = db.execute(SELECT_INCIDENT, (incident_id,)).fetchone()
+        if row is None:
+            return None
+        state = json.loads(row[0])
+        if active_only and not state['active']:
+            return None
+        events = [IncidentEvent(*event) for event in db.execute(SELECT_EVENTS, (incident_id,))]
+        incident = IncidentState.from_dict(state, events)
+        self._synced[incident_id] = _version(incident)
+        return incident
+
+    def load_summary(self, incident_id):
+        row = self._reader().execute(SELECT_SUMMARY, (incident_id,)).fetchone()
+        return row[0] if row else None
+
+
+STORE = IncidentStore(STORE_PATH) if STORE_PATH else None
@@ -0,0 +1,147 @@
+"""
+LifeLine AI – Emergency Summary
+Builds the paramedic hand-off summary from plain incident data (no UI dependencies)
+"""
+
+from datetime import datetime
+
+from lifeline.export import EXPORTERS
+
+
+def format_duration(total_seconds):
+    """Format a number of seconds as MM:SS"""
+    minutes = int(total_seconds // 60)
+    seconds = int(total_seconds % 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def format_elapsed(start_time, now=None):
+    """Format time elapsed since start_time as MM:SS ("00:00" when not started)"""
+    if start_time:
+        return format_duration(((now or datetime.now()) - start_time).total_seconds())
+    return "00:00"
+
+
+SUMMARY_HEADER = """
+╔═══════════════════════════════════════════════════════════╗
+                    EMERGENCY INCIDENT SUMMARY
+╚═══════════════════════════════════════════════════════════╝
+
+INCIDENT DETAILS:
+─────────────────────────────────────────────────────────────
+Emergency Type:     {emergency_type}
+Severity Level:     {severity}
+Time Elapsed:       {elapsed}
+Timestamp:          {timestamp}
+
+SITUATION DESCRIPTION:
+─────────────────────────────────────────────────────────────
+{description}
+
+ACTIONS TAKEN:
+─────────────────────────────────────────────────────────────
+"""
+
+SUMMARY_STEPS = """
+
+COMPLETED STEPS:
+─────────────────────────────────────────────────────────────
+"""
+
+SUMMARY_FOOTER = """
+
+─────────────────────────────────────────────────────────────
+NEXT STEPS:
+• Continue following guidance steps
+• Provide this summary to paramedics when they arrive
+• Do not leave person unattended
+• Continue monitoring condition
+
+⚠️ This summary is for emergency responders only
+⚠️ This is not a medical diagnosis
+╚═══════════════════════════════════════════════════════════╝
+    """
+
+
+def _summary_header(emergency_type, severity, elapsed, description, timestamp):
+    return SUMMARY_HEADER.format(
+        emergency_type=(emergency_type or 'Unknown').replace('_', ' ').title(),
+        severity=(severity or 'Unknown').upper(),
+        elapsed=elapsed,
+        timestamp=timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        description=description or 'No description provided'
+    )
+
+
+def _summary_body(actions_text, steps_completed):
+    steps_text = '\n'.join(f"✓ {step}" for step in steps_completed or ())
+    return ''.join((
+        actions_text or "No actions recorded yet",
+        SUMMARY_STEPS,
+        steps_text or "No steps completed yet",
+        SUMMARY_FOOTER
+    ))
+
+
+def build_emergency_summary(emergency_type, severity, elapsed, description,
+                            user_actions, steps_completed, timestamp=None, actions_text=None):
+    """
+    Generate comprehensive emergency summary.
+
+    `actions_text`, if given, is a pre-numbered block of action lines (see
+    IncidentLog.action_text) used instead of numbering `user_actions` here.
+    """
+    if actions_text is None:
+        actions_text = '\n'.join(f"{i}. {action}" for i, action in enumerate(user_actions or (), 1))
+    return (_summary_header(emergency_type, severity, elapsed, description, timestamp or datetime.now())
+            + _summary_body(actions_text, steps_completed))
+
+
+class SummaryBuilder:
+    """
+    Summary text for one incident, kept up to date as its events arrive.
+
+    The body (actions, completed steps, footer) is re-rendered only when the
+    incident's event log or completed steps change, and the whole text only
+    when the elapsed time ticks over; otherwise render() returns the cached
+    string. Exports are cached the same way, keyed on the log version.
+    """
+
+    __slots__ = ('_version', '_body', '_elapsed', '_text', '_export_version', '_exports')
+
+    def __init__(self):
+        self._version = None
+        self._body = None
+        self._elapsed = None
+        self._text = None
+        self._export_version = None
+        self._exports = {}
+
+    @staticmethod
+    def version(incident):
+        return (incident.log.seq, incident.completed)
+
+    def render(self, incident, steps, elapsed, timestamp=None):
+        """The summary text for `incident`, given its guidance steps and elapsed time"""
+        version = self.version(incident)
+        if version != self._version:
+            self._body = _summary_body(incident.log.action_text(), incident.completed_titles(steps))
+            self._version = version
+            self._elapsed = None
+        if elapsed != self._elapsed:
+            header = _summary_header(incident.emergency_type, incident.severity_level, elapsed,
+                                     incident.description, timestamp or datetime.now())
+            self._text = header + self._body
+            self._elapsed = elapsed
+        return self._text
+
+    def export(self, fmt, incident, steps):
+        """Exported document as a string (see lifeline.export.EXPORTERS)"""
+        version = self.version(incident)
+        if version != self._export_version:
+            self._exports.clear()
+            self._export_version = version
+        document = self._exports.get(fmt)
+        if document is None:
+            document = self._exports[fmt] = ''.join(EXPORTERS[fmt](incident, steps))
+        return document
@@ -0,0 +1,275 @@
+"""
+LifeLine AI – Text
+Tokenizing, typo-tolerant word lookup and negation scopes (no UI dependencies)
+"""
+
+import os
+import re
+import threading
+from functools import lru_cache
+from itertools import combinations
+
+WORD = re.compile(r"[a-z]+")
+
+# keywords/words_<locale>.txt: common real words, accent-free, one per line
+WORD_LISTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keywords')
+
+# Words shorter than this are never corrected (too many real words nearby)
+MIN_FUZZY_LENGTH = 5
+# Words at least this long may be two edits away; shorter ones only one
+LONG_WORD_LENGTH = 9
+# Looked-up tokens remembered per index before the memo is cleared
+MEMO_SIZE = 50000
+
+
+def tokenize(text):
+    """Lowercase word tokens of text"""
+    return WORD.findall(text.lower())
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance (insert, delete, substitute, swap
+    adjacent) between a and b, or limit + 1 once it must exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+@lru_cache(maxsize=None)
+def word_list(locale, directory=WORD_LISTS_DIR):
+    """Frozen set of the real words in keywords/words_<locale>.txt (empty if there is none)"""
+    try:
+        with open(os.path.join(directory, f"words_{locale}.txt"), encoding='utf-8') as words_file:
+            return frozenset(line.strip() for line in words_file
+                             if line.strip() and not line.startswith('#'))
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _deletes(word, distance):
+    """word with every combination of up to `distance` characters removed"""
+    variants = set()
+    for n in range(1, min(distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), n):
+            variants.add(''.join(c for i, c in enumerate(word) if i not in positions))
+    return variants
+
+
+class FuzzyIndex:
+    """
+    SymSpell-style deletion index over a fixed word vocabulary.
+
+    Every vocabulary word is stored under each string obtained by deleting up
+    to two of its characters. A lookup deletes characters from the query the
+    same way, so candidates come from a handful of dict probes instead of an
+    edit-distance comparison against every word; only those candidates are
+    verified.
+
+    Real words are not corrected to a different word, however close they
+    are to the vocabulary ("cooking" vs "choking", "found" vs "wound"); they
+    may only be completed ("breath" -> "breathe"). Real words are those in
+    the word lists of `locales` (see word_list), read on the first lookup
+    that needs them; words in `ignore` are never corrected at all. A typo
+    equally close to two vocabulary words is left alone, and so is a token
+    that only lacks a prefix ("conscious" is not a typo of "unconscious").
+    """
+
+    def __init__(self, vocabulary, ignore=(), max_distance=2, locales=('en',)):
+        self.vocabulary = tuple(dict.fromkeys(vocabulary))
+        self.max_distance = max_distance
+        self.locales = tuple(locales)
+        self._known = frozenset(self.vocabulary) | frozenset(ignore)
+        self._real_words = None
+        self._real_words_lock = threading.Lock()
+        self._deletions = {}
+        for word in self.vocabulary:
+            if len(word) < MIN_FUZZY_LENGTH:
+                continue
+            for key in {word} | _deletes(word, self._distance(word)):
+                self._deletions.setdefault(key, []).append(word)
+        # Tokens known to need no correction, and corrections already found
+        self._clean = set(self._known)
+        self._memo = {}
+
+    def _distance(self, word):
+        return min(self.max_distance, 2 if len(word) >= LONG_WORD_LENGTH else 1)
+
+    def is_real_word(self, token):
+        """Whether token is in one of the index's word lists"""
+        if self._real_words is None:
+            with self._real_words_lock:
+                if self._real_words is None:
+                    lists = [word_list(locale) for locale in self.locales]
+                    self._real_words = lists[0] if len(lists) == 1 else frozenset().union(*lists)
+        return token in self._real_words
+
+    def lookup(self, token):
+        """Vocabulary word `token` is most likely a typo of, or None"""
+        if token in self._clean:
+            return None
+        if token in self._memo:
+            return self._memo[token]
+        if len(token) < MIN_FUZZY_LENGTH:
+            return self._remember(token, None)
+
+        distance = self._distance(token)
+        if self.is_real_word(token):
+            # A real word may only be completed ("breath" -> "breathe"): a
+            # vocabulary word that loses only trailing letters to become token
+            candidates = [word for word in self._deletions.get(token, ()) if word.startswith(token)]
+        else:
+            candidates = set()
+            for key in {token} | _deletes(token, distance):
+                candidates.update(self._deletions.get(key, ()))
+        best, best_distance, tied = None, distance + 1, False
+        for word in candidates:
+            if word.endswith(token):
+                continue
+            limit = min(distance, self._distance(word))
+            d = edit_distance(token, word, limit)
+            if d > limit:
+                continue
+            if d < best_distance:
+                best, best_distance, tied = word, d, False
+            elif d == best_distance:
+                tied = True
+        return self._remember(token, None if tied else best)
+
+    def _remember(self, token, correction):
+        if len(self._clean) + len(self._memo) >= MEMO_SIZE + len(self._known):
+            self._clean = set(self._known)
+            self._memo = {}
+        if correction is None:
+            self._clean.add(token)
+        else:
+            self._memo[token] = correction
+        return correction
+
+    def corrections(self, text):
+        """{typo: word} for every correctable token in lowercased text"""
+        found = {}
+        # Most tokens were seen before and need nothing: one set difference
+        for token in set(WORD.findall(text)) - self._clean:
+            word = self.lookup(token)
+            if word is not None:
+                found[token] = word
+        return found
+
+    def correct(self, text):
+        """Lowercased text with typos of vocabulary words replaced"""
+        found = self.corrections(text)
+        if not found:
+            return text
+        return WORD.sub(lambda m: found.get(m.group(), m.group()), text)
+
+
+# ============================================================================
+# NEGATION SCOPE
+# ============================================================================
+
+# Cue + next word that express doubt or change rather than absence
+PSEUDO_NEGATIONS = frozenset((
+    ('not', 'sure'), ('not', 'certain'), ('not', 'only'), ('not', 'just'), ('no', 'idea'),
+    ('no', 'longer'), ("n't", 'know'), ("n't", 'tell')
+))
+# Tokens closing a scope early. "and" is included on purpose: in
+# "no bleeding and unconscious" the second finding must still count.
+SCOPE_BREAKS = frozenset(('.', ',', ';', ':', '!', '?', 'and', 'but', 'however', 'although',
+                          'though', 'yet', 'except', 'which', 'who'))
+# Words that open a new clause. Spoken and panicked reports often have no
+# punctuation ("i can't wake him he is unresponsive"), so a scope also ends
+# where the next subject or verb begins.
+CLAUSE_STARTS = frozenset(('i', 'he', 'she', 'they', 'we', 'you', 'it', 'there', 'here', 'someone',
+                           'somebody', 'my', 'his', 'her', 'their', 'our', 'your', 'this', 'that',
+                           'is', 'are', 'was', 'were', 'has', 'have', 'had', 'now', 'then', 'so',
+                           'because', 'since', 'while', 'when', 'after', 'before', 'also', 'plus',
+                           'please', 'help'))
+# Tokens a scope covers after its cue: the cue's head phrase ("denies chest
+# pain", "can't find a pulse"), not the rest of the sentence
+NEGATION_WINDOW = 3
+
+# Negation cues: no, not, none, nor, never, neither, without, denies,
+# denied and any "...n't" contraction. Each branch leads with a literal and
+# checks the word start with a lookbehind after it; a leading \b makes the
+# regex engine try every position and is several times slower.
+NEGATION_CUE = re.compile(
+    r"n(?<![a-z]n)(?:o(?:t|ne|r)?|ever|either)\b|n't\b|w(?<![a-z]w)ithout\b|d(?<![a-z]d)enie[sd]\b"
+)
+# Up to NEGATION_WINDOW words after a cue, never crossing punctuation, a
+# SCOPE_BREAKS or CLAUSE_STARTS word, or another cue; group 1 is the first
+# word. Separators and words use disjoint character classes, so matching
+# cannot backtrack catastrophically.
+_STOP_WORDS = '|'.join(sorted(word for word in SCOPE_BREAKS | CLAUSE_STARTS if word.isalpha()))
+_STOP_CUES = r"no|not|none|nor|never|neither|without|denie[sd]|[a-z]+n't"
+_GAP = r"[^a-z.,;:!?]*(?!(?:" + _STOP_WORDS + '|' + _STOP_CUES + r")\b)"
+_WORD = r"[a-z]+(?:'[a-z]+)?"
+SCOPE_WINDOW = re.compile(
+    f"{_GAP}({_WORD})(?:{_GAP}{_WORD}){{0,{NEGATION_WINDOW - 1}}}"
+)
+
+
+def has_negation(text):
+    """Whether lowercased text contains a negation cue (cheap pre-check)"""
+    return NEGATION_CUE.search(text) is not None
+
+
+class NegationScope:
+    """
+    Negation scopes of lowercased text, for a given keyword vocabulary.
+
+    A scope starts after a cue and covers its head phrase: up to
+    NEGATION_WINDOW tokens, stopping at punctuation, a SCOPE_BREAKS or
+    CLAUSE_STARTS word, or the next cue. A keyword that contains a cue (the
+    "not" of "not breathing") opens no scope and is never negated itself;
+    see `phrases` and `start_offsets`. Cues are found by one regex scan and only the tokens after
+    each cue are read, so the pass is linear in the text and cannot backtrack.
+    """
+
+    def __init__(self, keywords=()):
+        # Keywords containing a cue, grouped by the cue's offset inside them
+        phrases = {}
+        for keyword in keywords:
+            for cue in NEGATION_CUE.finditer(keyword):
+                phrases.setdefault(cue.start(), []).append(keyword)
+        self._phrases = tuple((offset, tuple(group)) for offset, group in sorted(phrases.items()))
+        self.phrases = frozenset(keyword for _, group in self._phrases for keyword in group)
+        # Per keyword (same order): characters from its last to its first,
+        # or None for a phrase, which is never negated
+        self.start_offsets = tuple(None if keyword in self.phrases else len(keyword) - 1
+                                   for keyword in keywords)
+
+    def scopes(self, text):
+        """Sorted, non-overlapping (start, end) character ranges under a negation"""
+        scopes = []
+        for cue in NEGATION_CUE.finditer(text):
+            at = cue.start()
+            if any(offset <= at and text.startswith(keywords, at - offset)
+                   for offset, keywords in self._phrases):
+                continue
+            window = SCOPE_WINDOW.match(text, cue.end())
+            if window is None or (cue.group(), window.group(1)) in PSEUDO_NEGATIONS:
+                continue
+            scope_start, scope_end = cue.end(), window.end()
+            if scopes and scope_start <= scopes[-1][1]:
+                scopes[-1] = (scopes[-1][0], max(scopes[-1][1], scope_end))
+            else:
+                scopes.append((scope_start, scope_end))
+        return scopes
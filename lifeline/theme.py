@@ -0,0 +1,111 @@
+"""
+LifeLine AI – Theme Assets
+Minifies the glassmorphism stylesheet and builds the markup that loads it
+
+The readable source is static/theme.css; the app serves static/theme.min.css
+through Streamlit static file serving, so each rerun only sends a short
+<link> tag and browsers fetch (and cache) the stylesheet once. Rebuild the
+minified file after editing the source:
+    python -m lifeline.theme          # rebuild
+    python -m lifeline.theme --check  # exit 1 if theme.min.css is stale
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from functools import lru_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+THEME_SOURCE = os.path.join(STATIC_DIR, 'theme.css')
+THEME_BUILD = os.path.join(STATIC_DIR, 'theme.min.css')
+
+# URL Streamlit serves the static/ folder under (server.enableStaticServing)
+THEME_URL = 'app/static/theme.min.css'
+FONTS_URL = 'app/static/fonts/'
+
+_COMMENTS = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+_AROUND_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_AFTER_COLON = re.compile(r':\s+')
+# url() of a self-hosted font, relative to the stylesheet (and the whole src entry)
+_FONT_URL = re.compile(r"url\('fonts/([^']+)'\)")
+_FONT_SOURCE = re.compile(r",\s*url\('fonts/[^']+'\)\s*format\('[^']+'\)")
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = _COMMENTS.sub('', css)
+    css = _WHITESPACE.sub(' ', css)
+    css = _AROUND_PUNCTUATION.sub(r'\1', css)
+    css = _AFTER_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def build_theme(source=THEME_SOURCE, dest=THEME_BUILD):
+    """Write the minified stylesheet; returns its size in bytes"""
+    with open(source, encoding='utf-8') as f:
+        minified = minify_css(f.read()) + '\n'
+    with open(dest, 'w', encoding='utf-8') as f:
+        f.write(minified)
+    return len(minified.encode('utf-8'))
+
+
+def is_stale(source=THEME_SOURCE, dest=THEME_BUILD):
+    """True if dest is missing or does not match the minified source"""
+    if not os.path.exists(dest):
+        return True
+    with open(source, encoding='utf-8') as f:
+        expected = minify_css(f.read()) + '\n'
+    with open(dest, encoding='utf-8') as f:
+        return f.read() != expected
+
+
+@lru_cache(maxsize=None)
+def stylesheet_link(path=THEME_BUILD, url=THEME_URL):
+    """<link> tag for the served stylesheet, cache-busted by content hash"""
+    with open(path, 'rb') as f:
+        fingerprint = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f'<link rel="stylesheet" href="{url}?v={fingerprint}">'
+
+
+@lru_cache(maxsize=None)
+def inline_style(path=THEME_SOURCE, fonts_url=None):
+    """
+    Minified <style> block, for deployments without the served stylesheet.
+    Inlined, the font url()s would resolve against the page, so they point
+    at `fonts_url` (where static/fonts is served) or, with no static
+    serving at all, are dropped in favour of local fonts and the fallback stack.
+    """
+    with open(path, encoding='utf-8') as f:
+        css = minify_css(f.read())
+    if fonts_url is None:
+        css = _FONT_SOURCE.sub('', css)
+    else:
+        css = _FONT_URL.sub(lambda match: f"url('{fonts_url}{match.group(1)}')", css)
+    return f'<style>{css}</style>'
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m lifeline.theme',
+                                     description='Rebuild static/theme.min.css from static/theme.css.')
+    parser.add_argument('--check', action='store_true',
+                        help='Only check that theme.min.css is up to date')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if is_stale():
+            print(f"{THEME_BUILD} is out of date; run python -m lifeline.theme", file=sys.stderr)
+            return 1
+        print(f"{THEME_BUILD} is up to date")
+        return 0
+
+    size = build_theme()
+    print(f"Wrote {THEME_BUILD} ({size:,} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,763 @@
+"""
+LifeLine AI – Triage Engine
+Keyword-driven severity and emergency-type classification (no UI dependencies)
+"""
+
+import os
+from collections import Counter, deque
+from typing import NamedTuple, Tuple
+
+from lifeline.text import FuzzyIndex, NegationScope, has_negation, tokenize
+
+# 'rank' keeps the original first-list-wins behaviour; 'score' uses TriageScorer
+TRIAGE_MODE = os.environ.get('LIFELINE_TRIAGE_MODE', 'rank')
+
+# Severity weight of a keyword, by the list it appears in
+SEVERITY_WEIGHTS = {'critical': 3.0, 'urgent': 2.0, 'monitor': 1.0}
+
+# Correct typos of keyword words ("not breething") before matching
+FUZZY_MATCHING = os.environ.get('LIFELINE_FUZZY_MATCHING', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Discount keywords inside a negation scope ("not unconscious", "denies chest pain")
+NEGATION_SCOPE = os.environ.get('LIFELINE_NEGATION_SCOPE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Severity weight of a negated keyword occurrence relative to an affirmed one.
+# Never zero: a negated critical keyword still keeps the call urgent.
+NEGATED_WEIGHT = 0.25
+
+# Rank mode rescans only the negation scopes unless the rescan would cover
+# more than 1/RESCAN_RATIO of the text
+RESCAN_RATIO = 2
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword vocabulary.
+
+    Built once, it finds every keyword occurrence (including overlapping ones)
+    in a single left-to-right pass, so matching cost depends on the length of
+    the text and not on how many keywords we know about.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self.longest = max(map(len, self.keywords), default=0)
+
+        # Keyword trie: goto[node] maps a character to the child node
+        goto = [{}]
+        outputs = [()]
+        for index, keyword in enumerate(self.keywords):
+            node = 0
+            for char in keyword:
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    outputs.append(())
+                node = child
+            outputs[node] += (index,)
+
+        # Breadth-first pass resolves failure links into direct transitions.
+        # Only transitions into nodes below the first trie level are stored;
+        # anything else falls back to the root's children.
+        root = goto[0]
+        fail = [0] * len(goto)
+        transitions = [{} for _ in goto]
+        queue = deque(root.values())
+        while queue:
+            node = queue.popleft()
+            transitions[node] = dict(transitions[fail[node]])
+            for char, child in goto[node].items():
+                transitions[node][char] = child
+                fail[child] = transitions[fail[node]].get(char) or root.get(char, 0)
+                outputs[child] += outputs[fail[child]]
+                queue.append(child)
+
+        self._root = root
+        self._transitions = transitions
+        self._outputs = outputs
+
+    def scan(self, text):
+        """Yield (end_position, keyword_index) for every keyword occurrence"""
+        root = self._root
+        transitions = self._transitions
+        outputs = self._outputs
+        node = 0
+        for position, char in enumerate(text):
+            node = transitions[node].get(char) or root.get(char, 0)
+            for index in outputs[node]:
+                yield position, index
+
+    def find(self, text):
+        """Return the set of keyword indices present anywhere in text"""
+        root = self._root
+        transitions = self._transitions
+        outputs = self._outputs
+        found = set()
+        node = 0
+        for char in text:
+            node = transitions[node].get(char) or root.get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+
+def _split_hits(automaton, negation, text, scopes=None):
+    """
+    (affirmed, negated) keyword indices of every occurrence in lowercased
+    text. An occurrence is negated when it starts inside a negation scope,
+    unless the keyword contains a cue itself ("not breathing").
+    """
+    if scopes is None:
+        scopes = negation.scopes(text)
+    # covered[i] is 1 where character i lies in a negation scope
+    covered = bytearray(len(text))
+    for start, end in scopes:
+        covered[start:end] = b'\x01' * (end - start)
+    back = negation.start_offsets
+    root = automaton._root
+    transitions = automaton._transitions
+    outputs = automaton._outputs
+    affirmed, negated = [], []
+    node = 0
+    # Same walk as KeywordAutomaton.scan, inlined: scopes are only consulted
+    # where a keyword ends
+    for end, char in enumerate(text):
+        node = transitions[node].get(char) or root.get(char, 0)
+        hits = outputs[node]
+        if not hits:
+            continue
+        for index in hits:
+            offset = back[index]
+            if offset is not None and covered[end - offset]:
+                negated.append(index)
+            else:
+                affirmed.append(index)
+    return affirmed, negated
+
+
+def _split_found(automaton, negation, text):
+    """
+    (affirmed, negated) sets of keyword indices in lowercased text, split as
+    _split_hits does. One find() covers the text; only the negation scopes
+    are scanned again, and a keyword counts as negated-only when all of its
+    occurrences start in a scope.
+    """
+    scopes = negation.scopes(text)
+    window = automaton.longest - 1
+    if sum(end - start + window for start, end in scopes) * RESCAN_RATIO > len(text):
+        # Negations everywhere: one pass over every occurrence is cheaper
+        affirmed, negated = _split_hits(automaton, negation, text, scopes)
+        return set(affirmed), set(negated)
+    found = automaton.find(text)
+    back = negation.start_offsets
+    in_scope = Counter()
+    for start, end in scopes:
+        for last, index in automaton.scan(text[start:end + window]):
+            offset = back[index]
+            if offset is not None and last - offset < end - start:
+                in_scope[index] += 1
+    keywords = automaton.keywords
+    for index, count in in_scope.items():
+        if count == _count_overlapping(text, keywords[index]):
+            found.discard(index)
+    return found, set(in_scope)
+
+
+class TriageMatcher:
+    """
+    Precompiled severity + emergency-type matcher.
+
+    Every severity keyword and every EMERGENCY_TYPES keyword lives in one
+    automaton. Each keyword carries the rank of the first severity list and
+    the first type bucket it appears in, so list order still decides ties
+    exactly as the original keyword-by-keyword scan did. With `negation`,
+    occurrences inside a negation scope ("not unconscious") are discounted:
+    they never decide the type, and they decide severity only when no
+    affirmed keyword does, one level below the most severe list at most.
+    """
+
+    def __init__(self, severity_keywords, emergency_types, default_type='general_emergency',
+                 negation=NEGATION_SCOPE):
+        self.severity_levels = tuple(severity_keywords)
+        self.emergency_types = tuple(emergency_types)
+        self.default_type = default_type
+        self.negation = negation
+
+        vocabulary = [kw for kws in severity_keywords.values() for kw in kws]
+        vocabulary += [kw for kws in emergency_types.values() for kw in kws]
+        self.automaton = KeywordAutomaton(vocabulary)
+        self._negation = NegationScope(self.automaton.keywords)
+
+        no_severity = len(self.severity_levels)
+        no_type = len(self.emergency_types)
+        position = {keyword: i for i, keyword in enumerate(self.automaton.keywords)}
+        self._severity_rank = [no_severity] * len(position)
+        self._type_rank = [no_type] * len(position)
+        for rank, keywords in enumerate(severity_keywords.values()):
+            for keyword in keywords:
+                i = position[keyword]
+                self._severity_rank[i] = min(self._severity_rank[i], rank)
+        for rank, keywords in enumerate(emergency_types.values()):
+            for keyword in keywords:
+                i = position[keyword]
+                self._type_rank[i] = min(self._type_rank[i], rank)
+
+    def match(self, text):
+        """
+        Scan lowercased text once.
+        Returns: (severity_level or None, emergency_type)
+        """
+        no_severity = severity_rank = len(self.severity_levels)
+        type_rank = len(self.emergency_types)
+        negated = ()
+        if self.negation and has_negation(text):
+            affirmed, negated = _split_found(self.automaton, self._negation, text)
+        else:
+            affirmed = self.automaton.find(text)
+        for index in affirmed:
+            severity_rank = min(severity_rank, self._severity_rank[index])
+            type_rank = min(type_rank, self._type_rank[index])
+        if negated and severity_rank == no_severity:
+            negated_severity = min(self._severity_rank[index] for index in negated)
+            if negated_severity < no_severity:
+                severity_rank = max(negated_severity, 1)
+
+        severity = self.severity_levels[severity_rank] if severity_rank < len(self.severity_levels) else None
+        emergency_type = self.emergency_types[type_rank] if type_rank < len(self.emergency_types) else self.default_type
+        return severity, emergency_type
+
+
+class Contribution(NamedTuple):
+    """One matched keyword and what it added to the scores"""
+    keyword: str
+    count: int
+    severity: str          # severity column it scores, or None
+    severity_weight: float
+    emergency_type: str    # type column it scores, or None
+    negated: int = 0       # occurrences of `count` inside a negation scope
+
+
+class ScoredTriage(NamedTuple):
+    severity: str                  # None when no severity keyword matched
+    emergency_type: str
+    severity_scores: Tuple[float, ...]
+    type_scores: Tuple[float, ...]
+    contributions: Tuple[Contribution, ...]
+
+
+class TriageScorer:
+    """
+    Weighted, order-independent alternative to TriageMatcher.
+
+    One automaton pass counts every matched keyword. Each keyword has a
+    severity role and a type role; an occurrence lying inside a longer
+    matched keyword loses the roles that keyword already scores ("small burn"
+    counts as monitor severity, while the "burn" inside it still signals the
+    burns type). The resulting sparse feature vector is multiplied by a weight
+    matrix with one column per severity level and one per emergency type:
+
+      severity  critical if it scores at least one affirmed critical keyword;
+                otherwise urgent (counting any critical score) unless monitor
+                evidence outweighs it; otherwise monitor; else None
+      type      highest type score; ties go to the earlier EMERGENCY_TYPES entry
+
+    A negated occurrence counts NEGATED_WEIGHT of an affirmed one in the
+    severity columns and nothing in the type columns, so "not unconscious"
+    alone is urgent, not critical, and leaves the default type.
+    score_batch() does the same for many texts at once with NumPy.
+    """
+
+    def __init__(self, severity_keywords, emergency_types, severity_weights=SEVERITY_WEIGHTS,
+                 default_type='general_emergency', negation=NEGATION_SCOPE):
+        if len(severity_keywords) != 3:
+            raise ValueError('Expected three severity levels, most severe first')
+        self.severity_levels = tuple(severity_keywords)
+        self.emergency_types = tuple(emergency_types)
+        self.default_type = default_type
+        self.negation = negation
+        # Critical score of one affirmed critical keyword
+        self._critical_weight = severity_weights[self.severity_levels[0]]
+
+        vocabulary = [kw for kws in severity_keywords.values() for kw in kws]
+        vocabulary += [kw for kws in emergency_types.values() for kw in kws]
+        self.automaton = KeywordAutomaton(vocabulary)
+        self._negation = NegationScope(self.automaton.keywords)
+        keywords = self.automaton.keywords
+        size = len(keywords)
+
+        # Feature i < size is keyword i's severity role, size + i its type role;
+        # each role scores at most one column
+        position = {keyword: i for i, keyword in enumerate(keywords)}
+        self._severity_column = [None] * size
+        self._severity_weight = [0.0] * size
+        self._type_column = [None] * size
+        for column, (level, level_keywords) in enumerate(severity_keywords.items()):
+            for keyword in level_keywords:
+                i = position[keyword]
+                if self._severity_column[i] is None:
+                    self._severity_column[i] = column
+                    self._severity_weight[i] = severity_weights[level]
+        for column, type_keywords in enumerate(emergency_types.values()):
+            for keyword in type_keywords:
+                i = position[keyword]
+                if self._type_column[i] is None:
+                    self._type_column[i] = column
+
+        # Keyword containment, longest container first: for each keyword, the
+        # (feature, contained feature, occurrences inside) pairs it cancels
+        self._order = sorted(range(size), key=lambda i: -len(keywords[i]))
+        self._cancels = [[] for _ in range(size)]
+        for outer in range(size):
+            for inner in range(size):
+                if inner == outer or keywords[inner] not in keywords[outer]:
+                    continue
+                inside = _count_overlapping(keywords[outer], keywords[inner])
+                if self._severity_column[outer] is not None and self._severity_column[inner] is not None:
+                    self._cancels[outer].append((outer, inner, inside))
+                if self._type_column[outer] is not None and self._type_column[inner] is not None:
+                    self._cancels[outer].append((size + outer, size + inner, inside))
+        self._order_rank = {index: rank for rank, index in enumerate(self._order)}
+        self._containers = frozenset(i for i in range(size) if self._cancels[i])
+
+        # Fast path when no containment applies: each hit adds its weight to a
+        # severity slot and 1 to a type slot; keywords without a role use the
+        # spare slot at the end
+        spare = len(self.severity_levels) + len(self.emergency_types)
+        self._hit_slots = [
+            (spare if self._severity_column[i] is None else self._severity_column[i],
+             self._severity_weight[i],
+             spare if self._type_column[i] is None else len(self.severity_levels) + self._type_column[i])
+            for i in range(size)
+        ]
+        self._matrix = None
+
+    def _hits(self, text):
+        """(affirmed, negated) keyword index of every occurrence in lowercased text"""
+        if self.negation and has_negation(text):
+            return _split_hits(self.automaton, self._negation, text)
+        automaton = self.automaton
+        root = automaton._root
+        transitions = automaton._transitions
+        outputs = automaton._outputs
+        hits = []
+        node = 0
+        for char in text:
+            node = transitions[node].get(char) or root.get(char, 0)
+            if outputs[node]:
+                hits += outputs[node]
+        return hits, ()
+
+    def features(self, text):
+        """Sparse feature vector {feature_index: weighted count} for lowercased text"""
+        return self._weighted(*self._hit_features(text))
+
+    def _hit_features(self, text):
+        """(affirmed, negated) sparse feature vectors for lowercased text"""
+        affirmed, negated = self._hits(text)
+        return (self._features_from_counts(Counter(affirmed)),
+                self._features_from_counts(Counter(negated)) if negated else {})
+
+    def _weighted(self, affirmed, negated):
+        """Affirmed features plus the discounted severity roles of negated ones"""
+        if not negated:
+            return affirmed
+        size = len(self._severity_column)
+        features = dict(affirmed)
+        for feature, count in negated.items():
+            if feature < size:
+                features[feature] = features.get(feature, 0) + NEGATED_WEIGHT * count
+        return features
+
+    def _features_from_counts(self, counts):
+        size = len(self._severity_column)
+        features = {}
+        for index, count in counts.items():
+            if self._severity_column[index] is not None:
+                features[index] = count
+            if self._type_column[index] is not None:
+                features[size + index] = count
+        if len(counts) > 1:
+            cancels = self._cancels
+            for index in sorted(counts, key=self._order_rank.__getitem__):
+                for outer, inner, inside in cancels[index]:
+                    if inner in features and features.get(outer):
+                        features[inner] -= features[outer] * inside
+            features = {feature: count for feature, count in features.items() if count > 0}
+        return features
+
+    def _scores(self, features):
+        size = len(self._severity_column)
+        severity_scores = [0.0] * len(self.severity_levels)
+        type_scores = [0.0] * len(self.emergency_types)
+        for feature, count in features.items():
+            if feature < size:
+                severity_scores[self._severity_column[feature]] += self._severity_weight[feature] * count
+            else:
+                type_scores[self._type_column[feature - size]] += count
+        return severity_scores, type_scores
+
+    def _decide(self, severity_scores, type_scores):
+        critical, urgent, monitor = severity_scores
+        if critical >= self._critical_weight:
+            severity = self.severity_levels[0]
+        elif critical > 0 or urgent > 0 and urgent >= monitor:
+            severity = self.severity_levels[1]
+        elif monitor > 0:
+            severity = self.severity_levels[2]
+        else:
+            severity = None
+        best = max(type_scores)
+        emergency_type = self.emergency_types[type_scores.index(best)] if best > 0 else self.default_type
+        return severity, emergency_type
+
+    def classify(self, text):
+        """Lowercased text -> (severity or None, emergency_type)"""
+        hits, negated = self._hits(text)
+        if negated or not self._containers.isdisjoint(hits):
+            return self._decide(*self._scores(self.features(text)))
+        scores = [0.0] * (len(self.severity_levels) + len(self.emergency_types) + 1)
+        slots = self._hit_slots
+        for index in hits:
+            severity_slot, weight, type_slot = slots[index]
+            scores[severity_slot] += weight
+            scores[type_slot] += 1.0
+        return self._decide(scores[:3], scores[3:-1])
+
+    def score(self, text):
+        """Score lowercased text; returns a ScoredTriage with per-keyword contributions"""
+        affirmed, negated = self._hit_features(text)
+        features = self._weighted(affirmed, negated)
+        severity_scores, type_scores = self._scores(features)
+        severity, emergency_type = self._decide(severity_scores, type_scores)
+
+        size = len(self._severity_column)
+        keywords = self.automaton.keywords
+        contributions = []
+        for index in sorted({feature % size for feature in features}):
+            severity_count = features.get(index, 0)
+            type_count = features.get(size + index, 0)
+            contributions.append(Contribution(
+                keywords[index],
+                max(affirmed.get(index, 0) + negated.get(index, 0),
+                    affirmed.get(size + index, 0) + negated.get(size + index, 0)),
+                self.severity_levels[self._severity_column[index]] if severity_count else None,
+                self._severity_weight[index] * severity_count,
+                self.emergency_types[self._type_column[index]] if type_count else None,
+                max(negated.get(index, 0), negated.get(size + index, 0))
+            ))
+        contributions.sort(key=lambda c: (-c.severity_weight, c.keyword))
+        return ScoredTriage(severity, emergency_type, tuple(severity_scores), tuple(type_scores),
+                            tuple(contributions))
+
+    # Batch path ----------------------------------------------------------------
+
+    @property
+    def matrix(self):
+        """Dense (features x columns) weight matrix as a NumPy array"""
+        if self._matrix is None:
+            import numpy as np
+
+            size = len(self._severity_column)
+            levels = len(self.severity_levels)
+            matrix = np.zeros((2 * size, levels + len(self.emergency_types)), dtype=np.float32)
+            for index in range(size):
+                if self._severity_column[index] is not None:
+                    matrix[index, self._severity_column[index]] = self._severity_weight[index]
+                if self._type_column[index] is not None:
+                    matrix[size + index, levels + self._type_column[index]] = 1.0
+            self._matrix = matrix
+        return self._matrix
+
+    def feature_matrix(self, texts):
+        """
+        Dense (texts x features) counts for lowercased texts.
+
+        Each keyword is counted across the whole batch with one vectorized
+        string count, so the per-character work runs in C instead of the
+        Python automaton. (Counts are non-overlapping; no keyword in the
+        vocabulary can overlap itself.) Texts with a negation cue are
+        counted by the automaton instead, weighting negated occurrences in
+        the severity roles and leaving them out of the type roles.
+        """
+        import numpy as np
+
+        count = getattr(np, 'strings', np.char).count
+        keywords = self.automaton.keywords
+        size = len(keywords)
+        array = np.array(texts, dtype=str)
+        counts = np.empty((len(texts), size), dtype=np.float32)
+        for index, keyword in enumerate(keywords):
+            counts[:, index] = count(array, keyword)
+        type_counts = counts
+        if self.negation:
+            for row, text in enumerate(texts):
+                if not has_negation(text):
+                    continue
+                affirmed, negated = _split_hits(self.automaton, self._negation, text)
+                if negated:
+                    if type_counts is counts:
+                        type_counts = counts.copy()
+                    counts[row] = 0
+                    np.add.at(counts[row], affirmed, 1.0)
+                    type_counts[row] = counts[row]
+                    np.add.at(counts[row], negated, NEGATED_WEIGHT)
+
+        features = np.zeros((len(texts), 2 * size), dtype=np.float32)
+        for index in range(size):
+            if self._severity_column[index] is not None:
+                features[:, index] = counts[:, index]
+            if self._type_column[index] is not None:
+                features[:, size + index] = type_counts[:, index]
+        for index in self._order:
+            for outer, inner, inside in self._cancels[index]:
+                features[:, inner] -= features[:, outer] * inside
+        np.maximum(features, 0, out=features)
+        return features
+
+    def score_batch(self, texts):
+        """
+        Score many lowercased texts at once.
+        Returns: list of (severity or None, emergency_type)
+        """
+        import numpy as np
+
+        if not texts:
+            return []
+        scores = self.feature_matrix(texts) @ self.matrix
+
+        levels = len(self.severity_levels)
+        critical, urgent, monitor = scores[:, 0], scores[:, 1], scores[:, 2]
+        severity_index = np.select(
+            [critical >= self._critical_weight, (critical > 0) | (urgent > 0) & (urgent >= monitor),
+             monitor > 0],
+            [0, 1, 2],
+            default=-1
+        )
+        type_scores = scores[:, levels:]
+        type_index = np.where(type_scores.max(axis=1) > 0, type_scores.argmax(axis=1), -1)
+        return [
+            (self.severity_levels[s] if s >= 0 else None,
+             self.emergency_types[t] if t >= 0 else self.default_type)
+            for s, t in zip(severity_index.tolist(), type_index.tolist())
+        ]
+
+
+def _count_overlapping(text, keyword):
+    """Occurrences of keyword in text, overlapping ones included"""
+    count = 0
+    at = text.find(keyword)
+    while at >= 0:
+        count += 1
+        at = text.find(keyword, at + 1)
+    return count
+
+
+def _is_word_list(value):
+    """Whether value is a list (or tuple) of strings; a bare string is not"""
+    return isinstance(value, (list, tuple)) and all(isinstance(word, str) for word in value)
+
+
+class EmergencyClassifier:
+    """AI-assisted emergency triage and classification system"""
+    
+    # Emergency keywords and patterns
+    CRITICAL_KEYWORDS = [
+        'not breathing', 'unconscious', 'collapsed', 'unresponsive',
+        'severe bleeding', 'chest pain', 'heart attack', 'stroke',
+        'seizure', 'heavy bleeding', 'can\'t breathe', 'choking badly'
+    ]
+    
+    URGENT_KEYWORDS = [
+        'bleeding', 'burn', 'broken bone', 'fracture', 'choking',
+        'difficulty breathing', 'severe pain', 'head injury',
+        'allergic reaction', 'high fever', 'vomiting blood'
+    ]
+    
+    MONITOR_KEYWORDS = [
+        'minor cut', 'small burn', 'sprain', 'bruise', 'headache',
+        'nausea', 'dizziness', 'minor pain', 'small wound'
+    ]
+    
+    # Emergency type patterns
+    EMERGENCY_TYPES = {
+        'cardiac_arrest': ['not breathing', 'unconscious', 'no pulse', 'collapsed', 'unresponsive', 'heart stopped'],
+        'severe_bleeding': ['severe bleeding', 'heavy bleeding', 'blood gushing', 'arterial bleeding', 'profuse bleeding'],
+        'choking': ['choking', 'can\'t breathe', 'something stuck', 'airway blocked'],
+        'burns': ['burn', 'burned', 'scalded', 'fire', 'hot liquid'],
+        'fracture': ['broken bone', 'fracture', 'bone broke', 'deformed limb'],
+        'head_injury': ['head injury', 'hit head', 'head trauma', 'fell on head'],
+        'breathing_difficulty': ['difficulty breathing', 'hard to breathe', 'gasping', 'wheezing'],
+        'allergic_reaction': ['allergic reaction', 'swelling', 'hives', 'anaphylaxis'],
+        'stroke': ['stroke', 'face drooping', 'arm weakness', 'speech difficulty'],
+        'poisoning': ['poisoning', 'swallowed', 'overdose', 'toxic']
+    }
+
+    # Explanation shown for each keyword-driven severity level
+    SEVERITY_REASONING = {
+        'critical': 'Critical keywords detected: life-threatening indicators present',
+        'urgent': 'Urgent keywords detected: prompt medical attention needed',
+        'monitor': 'Monitoring keywords detected: assess and watch situation'
+    }
+
+    # Real words are never treated as typos: the word lists of these locales
+    # (lifeline/keywords/words_<locale>.txt) plus any NOT_TYPOS extras
+    WORD_LISTS = ('en',)
+    NOT_TYPOS = []
+
+    UNCLEAR_REASONING = 'Unclear situation - recommending urgent assessment'
+    DEFAULT_REASONING = 'Unable to determine clear severity - defaulting to urgent for safety'
+
+    # Keyword lists a candidate configuration may replace (see with_config)
+    CONFIG_FIELDS = ('CRITICAL_KEYWORDS', 'URGENT_KEYWORDS', 'MONITOR_KEYWORDS', 'EMERGENCY_TYPES',
+                     'NOT_TYPOS', 'WORD_LISTS')
+
+    @classmethod
+    def _compile(cls):
+        """Build the matcher, scorer and typo index from the class keyword lists"""
+        severity_keywords = {
+            'critical': cls.CRITICAL_KEYWORDS,
+            'urgent': cls.URGENT_KEYWORDS,
+            'monitor': cls.MONITOR_KEYWORDS
+        }
+        cls._matcher = TriageMatcher(severity_keywords, cls.EMERGENCY_TYPES)
+        cls._scorer = TriageScorer(severity_keywords, cls.EMERGENCY_TYPES)
+        cls._fuzzy = FuzzyIndex(tokenize(' '.join(cls._scorer.automaton.keywords)), cls.NOT_TYPOS,
+                                locales=cls.WORD_LISTS)
+
+    @classmethod
+    def with_config(cls, **overrides):
+        """
+        A classifier class with some keyword lists replaced, compiled once.
+        Keys are CONFIG_FIELDS; values are lists of strings (EMERGENCY_TYPES:
+        a dict of them). This class is left untouched.
+        """
+        unknown = sorted(set(overrides) - set(cls.CONFIG_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown classifier settings: {', '.join(unknown)}")
+        for key, value in overrides.items():
+            if key == 'EMERGENCY_TYPES':
+                if not isinstance(value, dict) or not all(
+                        isinstance(name, str) and _is_word_list(keywords) for name, keywords in value.items()):
+                    raise ValueError(f"{key} must map emergency types to lists of strings")
+            elif not _is_word_list(value):
+                raise ValueError(f"{key} must be a list of strings")
+        candidate = type(cls.__name__, (cls,), dict(overrides))
+        candidate._compile()
+        return candidate
+
+    @classmethod
+    def classify_emergency(cls, description, image_analysis=None, mode=None):
+        """
+        Classify emergency based on text description and optional image analysis
+        `mode` is 'rank' (first matching list wins) or 'score' (weighted
+        scoring); defaults to LIFELINE_TRIAGE_MODE.
+        Returns: (severity_level, emergency_type, reasoning)
+        """
+        description_lower = cls._normalize(description)
+
+        # FAIL-SAFE FIRST: If input is unclear or empty, default to URGENT + recommend 911
+        if not description or len(description.strip()) < 5:
+            return ('urgent', 'general_emergency', cls.UNCLEAR_REASONING)
+
+        # Single pass over the text finds every severity and type keyword at once
+        if (mode or TRIAGE_MODE) == 'score':
+            severity, emergency_type = cls._scorer.classify(description_lower)
+        else:
+            severity, emergency_type = cls._matcher.match(description_lower)
+
+        return cls._with_reasoning(severity, emergency_type)
+
+    @classmethod
+    def _with_reasoning(cls, severity, emergency_type):
+        if severity is None:
+            # FAIL-SAFE DEFAULT: When unclear, always err on side of caution
+            return ('urgent', emergency_type, cls.DEFAULT_REASONING)
+        return (severity, emergency_type, cls.SEVERITY_REASONING[severity])
+
+    @classmethod
+    def score_emergency(cls, description):
+        """Weighted scores and per-keyword contributions for a description (ScoredTriage)"""
+        return cls._scorer.score(cls._normalize(description or ''))
+
+    @classmethod
+    def _normalize(cls, description):
+        """Lowercased description with keyword typos corrected"""
+        description_lower = description.lower()
+        if FUZZY_MATCHING:
+            return cls._fuzzy.correct(description_lower)
+        return description_lower
+
+    @classmethod
+    def spelling_corrections(cls, description):
+        """{typo: keyword word} the classifier reads into a description"""
+        if not FUZZY_MATCHING or not description:
+            return {}
+        return cls._fuzzy.corrections(description.lower())
+
+    @classmethod
+    def classify_batch(cls, descriptions, mode=None):
+        """
+        Classify many descriptions; same results as classify_emergency() in
+        the same `mode` (default LIFELINE_TRIAGE_MODE). Score mode is
+        vectorized with NumPy; rank mode classifies one at a time.
+        Returns: list of (severity_level, emergency_type, reasoning)
+        """
+        if (mode or TRIAGE_MODE) != 'score':
+            return [cls.classify_emergency(description or '', mode='rank') for description in descriptions]
+        results = [None] * len(descriptions)
+        pending, texts = [], []
+        for i, description in enumerate(descriptions):
+            if not description or len(description.strip()) < 5:
+                results[i] = ('urgent', 'general_emergency', cls.UNCLEAR_REASONING)
+            else:
+                pending.append(i)
+                texts.append(cls._normalize(description))
+        if texts:
+            for i, (severity, emergency_type) in zip(pending, cls._scorer.score_batch(texts)):
+                results[i] = cls._with_reasoning(severity, emergency_type)
+        return results
+
+    @classmethod
+    def _detect_emergency_type(cls, description):
+        """Detect specific emergency type from description"""
+        return cls._matcher.match(description)[1]
+    
+    @staticmethod
+    def analyze_image_for_injuries(image_data, wait=True):
+        """
+        Image analysis for PRESENCE of visible injury patterns only.
+        
+        This detects whether visible injury patterns are present (blood, burns, wounds)
+        but does NOT assess severity, make diagnoses, or provide medical interpretation.
+        
+        Purpose: Help triage by confirming visual evidence mentioned in description.
+        
+        Returns basic presence indicators only. `image_data` is an
+        IngestedImage from lifeline.imaging (never the raw upload). With
+        wait=False the call never blocks and returns None while the
+        analysis is still running (see ImageAnalyzer.poll).
+        
+        IMPORTANT: Image analysis is optional and never changes severity classification alone.
+        The classification is always primarily based on the text description.
+        """
+        # If no image provided, return no injury detected
+        if image_data is None:
+            return {
+                'visible_injury_present': False,
+                'pattern_type': None,
+                'note': 'No image provided for analysis'
+            }
+        
+        # Presence-only colour heuristics run in a worker process with a
+        # timeout; on timeout or error this is NO_ANALYSIS.
+        # CRITICAL: Image analysis never escalates severity by itself
+        # Text description always drives the classification decision
+        from lifeline.vision import IMAGE_ANALYZER
+        if not wait:
+            return IMAGE_ANALYZER.poll(image_data)
+        return IMAGE_ANALYZER.analyze(image_data)
+
+# Compiled once at import; every classification reuses the same automaton
+EmergencyClassifier._compile()
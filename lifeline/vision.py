@@ -0,0 +1,268 @@
+"""
+LifeLine AI – Image Analysis Backends
+Presence-only visual checks run off the script thread (no UI dependencies)
+
+A backend turns an IngestedImage (see lifeline.imaging) into the
+presence-only dict used by EmergencyClassifier.analyze_image_for_injuries.
+Backends run in a worker process with a timeout; if the analysis is slow,
+crashes or is unavailable, the caller gets NO_ANALYSIS and classification
+proceeds on the text description alone. The UI never waits: it prefetches
+on upload and poll()s on later reruns until the result or the timeout.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_BACKEND = os.environ.get('LIFELINE_IMAGE_BACKEND', 'hue')
+DEFAULT_TIMEOUT = float(os.environ.get('LIFELINE_IMAGE_TIMEOUT', 3.0))
+PENDING_LIMIT = 32
+
+logger = logging.getLogger(__name__)
+
+NO_ANALYSIS = {
+    'visible_injury_present': False,
+    'pattern_type': None,
+    'note': 'Image analysis unavailable - assessment based on description only'
+}
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class ImageBackend(ABC):
+    """Base class: analyze() returns the presence-only result dict"""
+
+    name = None
+
+    @abstractmethod
+    def analyze(self, image):
+        """Presence-only result dict for an IngestedImage (see result())"""
+
+    @staticmethod
+    def result(pattern_type):
+        if pattern_type is None:
+            return {
+                'visible_injury_present': False,
+                'pattern_type': None,
+                'note': 'No visible injury pattern detected - not diagnostic'
+            }
+        return {
+            'visible_injury_present': True,
+            'pattern_type': pattern_type,  # Not a diagnosis
+            'note': 'Visual confirmation only - not diagnostic'
+        }
+
+
+class HueRegionBackend(ImageBackend):
+    """
+    Colour-region heuristics on the analysis tensor.
+
+    Pixels are classified in HSV space as skin-toned, dark saturated red
+    (blood-like) or light saturated red (reddened skin). Only the share of
+    each region is used, never its shape or intensity, so the result stays a
+    presence signal rather than a severity estimate.
+    """
+
+    name = 'hue'
+
+    BLOOD_MIN_FRACTION = 0.02
+    SKIN_MIN_FRACTION = 0.05
+    REDNESS_MIN_FRACTION = 0.03
+
+    @staticmethod
+    def hsv(rgb):
+        """Hue in degrees, saturation and value in [0, 1] for an (H, W, 3) uint8 array"""
+        import numpy as np
+
+        rgb = rgb.astype(np.float32) / 255.0
+        r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+        value = rgb.max(axis=-1)
+        delta = value - rgb.min(axis=-1)
+        saturation = np.where(value > 0, delta / np.maximum(value, 1e-6), 0.0)
+
+        safe = np.maximum(delta, 1e-6)
+        hue = np.select(
+            [value == r, value == g],
+            [((g - b) / safe) % 6, (b - r) / safe + 2],
+            (r - g) / safe + 4
+        ) * 60.0
+        hue = np.where(delta > 0, hue, 0.0)
+        return hue, saturation, value
+
+    def region_fractions(self, image):
+        import numpy as np
+
+        rgb = np.frombuffer(image.analysis, dtype=np.uint8).reshape(image.analysis_shape)
+        hue, sat, val = self.hsv(rgb)
+        red = (hue <= 20) | (hue >= 340)
+
+        blood = ((hue <= 10) | (hue >= 345)) & (sat >= 0.55) & (val >= 0.15) & (val <= 0.75)
+        redness = red & (sat >= 0.35) & (sat < 0.55) & (val > 0.5)
+        skin = (hue <= 50) & (sat >= 0.2) & (sat <= 0.6) & (val > 0.35)
+        return {
+            'blood': float(blood.mean()),
+            'redness': float(redness.mean()),
+            'skin': float(skin.mean())
+        }
+
+    def analyze(self, image):
+        fractions = self.region_fractions(image)
+        if fractions['blood'] >= self.BLOOD_MIN_FRACTION:
+            return self.result('blood_like_region')
+        if (fractions['skin'] >= self.SKIN_MIN_FRACTION
+                and fractions['redness'] >= self.REDNESS_MIN_FRACTION):
+            return self.result('reddened_skin_region')
+        return self.result(None)
+
+
+BACKENDS = {
+    HueRegionBackend.name: HueRegionBackend
+}
+
+
+def register_backend(backend_class):
+    """Make an ImageBackend subclass selectable by its name"""
+    BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+
+def run_backend(backend_class, image):
+    """Worker entry point; the class is pickled by reference, so backends
+    registered from any importable module work in spawned workers"""
+    return backend_class().analyze(image)
+
+
+# ============================================================================
+# PROCESS-POOL ANALYZER
+# ============================================================================
+
+class ImageAnalyzer:
+    """
+    Runs a backend in a small process pool, one job per distinct upload.
+
+    submit() can be called as soon as an image is uploaded so the work
+    overlaps with the user typing; analyze() waits at most `timeout`
+    seconds for the result and returns NO_ANALYSIS on timeout or error.
+    poll() never waits: it returns None while a job is younger than
+    `timeout` seconds.
+    """
+
+    def __init__(self, backend=DEFAULT_BACKEND, timeout=DEFAULT_TIMEOUT, workers=1):
+        self.backend = backend
+        self.timeout = timeout
+        self.workers = workers
+        self._pool = None
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            # spawn: never fork the multi-threaded Streamlit server process
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._pool
+
+    def _submit(self, image):
+        """(Future, monotonic start time) of the analysis of an IngestedImage"""
+        if self.backend not in BACKENDS:
+            raise KeyError(f"Unknown image backend: {self.backend}")
+        with self._lock:
+            job = self._pending.get(image.digest)
+            if job is not None:
+                self._pending.move_to_end(image.digest)
+                return job
+            future = self._executor().submit(run_backend, BACKENDS[self.backend], image)
+            job = self._pending[image.digest] = (future, time.monotonic())
+            while len(self._pending) > PENDING_LIMIT:
+                self._pending.popitem(last=False)
+            return job
+
+    def submit(self, image):
+        """Start (or reuse) the analysis of an IngestedImage; returns a Future"""
+        return self._submit(image)[0]
+
+    def prefetch(self, image):
+        """Start the analysis early; never raises (the UI must not fail on it)"""
+        try:
+            self.submit(image)
+        except (KeyError, RuntimeError) as exc:
+            # Unknown backend, or the pool is shut down or broken
+            logger.warning("Image analysis not started: %s", exc)
+        except Exception:
+            logger.exception("Image analysis not started")
+
+    def _job(self, image):
+        """_submit(), or None (logged) when the analysis cannot start"""
+        try:
+            return self._submit(image)
+        except (KeyError, RuntimeError) as exc:
+            # Unknown backend, or the pool is shut down or broken
+            logger.warning("Image analysis not started: %s", exc)
+            if isinstance(exc, RuntimeError):
+                self.reset()
+            return None
+
+    def analyze(self, image):
+        """Presence-only result for an IngestedImage, or NO_ANALYSIS"""
+        job = self._job(image)
+        if job is None:
+            return dict(NO_ANALYSIS)
+        return self._result(image, job[0], self.timeout)
+
+    def poll(self, image):
+        """
+        Presence-only result for an IngestedImage without waiting: None
+        while the analysis is running and younger than `timeout` seconds,
+        NO_ANALYSIS once it is older or has failed.
+        """
+        job = self._job(image)
+        if job is None:
+            return dict(NO_ANALYSIS)
+        future, started = job
+        if not future.done() and time.monotonic() - started < self.timeout:
+            return None
+        return self._result(image, future, 0)
+
+    def _result(self, image, future, timeout):
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            logger.warning("Image backend %s timed out after %.1fs", self.backend, self.timeout)
+            # A stuck worker would block every later job; start a fresh pool
+            self.reset(kill=True)
+        except BrokenProcessPool:
+            logger.warning("Image analysis worker died; restarting the pool")
+            self.reset()
+        except Exception:
+            # Raised by the backend itself: a bug worth a traceback in the log
+            logger.exception("Image backend %s failed", self.backend)
+            with self._lock:
+                self._pending.pop(image.digest, None)
+        return dict(NO_ANALYSIS)
+
+    def reset(self, kill=False):
+        """Drop pending jobs and the pool (terminating workers when kill=True)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._pending.clear()
+        if pool is None:
+            return
+        if kill:
+            # ProcessPoolExecutor has no public way to stop a running job
+            for process in list(getattr(pool, '_processes', {}).values()):
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+IMAGE_ANALYZER = ImageAnalyzer()
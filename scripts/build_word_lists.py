@@ -0,0 +1,75 @@
+"""
+Rebuilds lifeline/keywords/words_<locale>.txt from wordfreq.
+
+Each list holds the most frequent words of a language, folded to plain
+ASCII the way keyword matching folds them, and only those of at least
+MIN_FUZZY_LENGTH letters (shorter words are never corrected anyway).
+Typo correction never turns a listed word into a different keyword.
+
+wordfreq is only needed to rebuild the lists, not at runtime:
+    pip install wordfreq
+    python scripts/build_word_lists.py [--top 50000] [--locales en,es,vi]
+"""
+
+import argparse
+import os
+import re
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from lifeline.language import fold_accents  # noqa: E402
+from lifeline.text import MIN_FUZZY_LENGTH, WORD_LISTS_DIR  # noqa: E402
+
+NAMES = {'en': 'English', 'es': 'Spanish', 'vi': 'Vietnamese'}
+WORD = re.compile(f"[a-z]{{{MIN_FUZZY_LENGTH},}}\\Z")
+
+
+def build(locale, top):
+    """Folded, filtered words of a locale, most frequent first, without duplicates"""
+    from wordfreq import top_n_list
+
+    words = {}
+    for word in top_n_list(locale, top):
+        folded = fold_accents(word.lower())
+        if WORD.match(folded):
+            words.setdefault(folded, None)
+    return list(words)
+
+
+def write(locale, words, top, directory=WORD_LISTS_DIR):
+    path = os.path.join(directory, f"words_{locale}.txt")
+    with open(path, 'w', encoding='utf-8') as words_file:
+        words_file.write(
+            f"# Common {NAMES.get(locale, locale)} words, accent-free, {MIN_FUZZY_LENGTH}+ letters, "
+            f"most frequent first.\n"
+            f"# Typo correction never turns these into a different word (lifeline.text.FuzzyIndex).\n"
+            f"# Source: wordfreq top_n_list('{locale}', {top}) (CC BY-SA 4.0,\n"
+            f"# https://github.com/rspeer/wordfreq), folded and filtered by\n"
+            f"# scripts/build_word_lists.py.\n"
+        )
+        words_file.write('\n'.join(words) + '\n')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild the typo-guard word lists from wordfreq.')
+    parser.add_argument('--top', type=int, default=50000, help='Most frequent words taken per language')
+    parser.add_argument('--locales', default=','.join(NAMES), help='Comma-separated locales')
+    args = parser.parse_args(argv)
+
+    try:
+        import wordfreq  # noqa: F401
+    except ImportError:
+        print('Rebuilding the word lists needs wordfreq: pip install wordfreq', file=sys.stderr)
+        return 2
+
+    for locale in args.locales.split(','):
+        words = build(locale, args.top)
+        print(f"{write(locale, words, args.top)}: {len(words)} words")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
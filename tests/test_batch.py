@@ -0,0 +1,56 @@
+"""Batch triage over JSONL: bad records become error lines, never abort the run"""
+
+import io
+import json
+
+from lifeline.batch import triage_lines, triage_stream
+
+
+def test_triage_lines_classifies_records():
+    [result] = triage_lines(['{"id": 7, "description": "he collapsed and is not breathing"}'])
+    assert result['line'] == 1
+    assert result['id'] == 7
+    assert (result['severity'], result['emergency_type']) == ('critical', 'cardiac_arrest')
+
+
+def test_missing_description_is_triaged_as_unclear():
+    [result] = triage_lines(['{"id": 1}'])
+    assert (result['severity'], result['emergency_type']) == ('urgent', 'general_emergency')
+
+
+def test_non_string_descriptions_are_per_record_errors():
+    lines = [
+        '{"description": 5}',
+        '{"description": ["not", "breathing"]}',
+        '{"description": {"text": "stroke"}}',
+        'not json',
+        '[1, 2]',
+        '{"description": "severe bleeding from the leg"}',
+    ]
+    results = list(triage_lines(lines))
+    assert [r['line'] for r in results] == [1, 2, 3, 4, 5, 6]
+    assert all('error' in r for r in results[:5])
+    assert results[0]['error'] == "Field 'description' is not a string"
+    assert results[5]['severity'] == 'critical'
+
+
+def test_triage_stream_counts_errors_and_keeps_going():
+    source = io.StringIO('{"description": 5}\n\n{"description": "minor cut on finger"}\n')
+    output = io.StringIO()
+    stats = triage_stream(source, output, chunk_size=1)
+    assert (stats.records, stats.errors) == (1, 1)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line['line'] for line in lines] == [1, 3]
+    assert lines[1]['severity'] == 'monitor'
+
+
+def test_records_are_triaged_in_their_language():
+    lines = [
+        '{"description": "se desmayó y no respira"}',
+        '{"description": "no respira", "locale": "es"}',
+        '{"description": "not breathing", "locale": "xx"}',
+    ]
+    results = list(triage_lines(lines))
+    assert [(r['severity'], r['emergency_type'], r['locale']) for r in results[:2]] == [
+        ('critical', 'cardiac_arrest', 'es'), ('critical', 'cardiac_arrest', 'es')]
+    assert results[2]['error'] == "No keyword set for locale 'xx'"
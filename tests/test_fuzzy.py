@@ -0,0 +1,55 @@
+"""Typo correction fixes misspelled keywords and leaves real words alone"""
+
+import pytest
+
+from lifeline.language import classifier_for
+from lifeline.text import FuzzyIndex, word_list
+from lifeline.triage import EmergencyClassifier
+
+# Real English words one or two edits from a keyword word
+REAL_WORDS = [
+    'found', 'would', 'never', 'lives', 'stick', 'struck', 'flood', 'smell', 'spelling',
+    'dropping', 'strike', 'cooking', 'joking', 'pushing', 'grasping', 'breeding', 'stepped',
+    'heard', 'purse', 'brake', 'cruise', 'strain', 'material', 'direction', 'relations',
+    'sneezing'
+]
+
+TYPOS = [
+    ("he is not breething", {'breething': 'breathing'}),
+    ("she is unconsious", {'unconsious': 'unconscious'}),
+    ("my son is choaking", {'choaking': 'choking'}),
+    ("I cant breath", {'breath': 'breathe'}),
+]
+
+
+@pytest.mark.parametrize('word', REAL_WORDS)
+def test_real_words_are_not_corrected(word):
+    assert EmergencyClassifier.spelling_corrections(f"i {word} it") == {}
+
+
+@pytest.mark.parametrize('description, corrections', TYPOS)
+def test_typos_are_corrected(description, corrections):
+    assert EmergencyClassifier.spelling_corrections(description) == corrections
+
+
+def test_real_word_does_not_change_triage():
+    assert EmergencyClassifier.classify_emergency("I was cooking dinner")[1] != 'choking'
+
+
+def test_word_lists_are_shipped():
+    for locale in ('en', 'es', 'vi'):
+        words = word_list(locale)
+        assert words and all(len(word) >= 5 and word.isascii() for word in words)
+
+
+def test_locale_word_list_guards_locale_words():
+    # "techo" (ceiling) is one edit from the keyword word "pecho" (chest)
+    _, classifier, text = classifier_for("se cayo del techo", 'es')
+    assert classifier.spelling_corrections(text) == {}
+
+
+def test_index_without_word_lists_corrects_real_words():
+    index = FuzzyIndex(['choking'], locales=())
+    assert index.lookup('cooking') == 'choking'
+    assert FuzzyIndex(['choking']).lookup('cooking') is None
+    assert FuzzyIndex(['choking'], ignore=['cookin'], locales=()).lookup('cookin') is None
@@ -0,0 +1,62 @@
+"""Guidance registries check type coverage from the pack index and parse steps lazily"""
+
+import os
+
+import pytest
+
+from lifeline import guidance
+from lifeline.guidance import CLASSIFIER_TYPES, GuidanceRegistry
+from lifeline.packs import PROTOCOLS_DIR, PackLoader, ProtocolPackError, write_pack
+
+
+def protocol(title):
+    return {'steps': [{'title': title, 'instruction': f"{title} now"}]}
+
+
+def write(path, types, version='1', title='Step'):
+    write_pack(str(path), {key: protocol(f"{title} {key}") for key in types},
+               version=version, locale='en', default='general_emergency')
+
+
+def registry(path):
+    return GuidanceRegistry(str(path), loader=PackLoader(check_interval=0))
+
+
+def test_validate_parses_no_steps(tmp_path):
+    path = tmp_path / 'pack.jsonl'
+    write(path, CLASSIFIER_TYPES)
+    checked = registry(path).validate()
+    assert checked.pack._protocols == {}
+    steps = checked.get('choking')
+    assert steps[0].title == 'Step choking'
+    assert checked.get('choking') is steps
+    assert list(checked.pack._protocols) == ['choking']
+
+
+def test_missing_type_fails_validation(tmp_path):
+    path = tmp_path / 'pack.jsonl'
+    write(path, [key for key in CLASSIFIER_TYPES if key != 'stroke'])
+    with pytest.raises(ProtocolPackError, match='stroke'):
+        registry(path).validate()
+
+
+def test_unknown_type_gets_the_default_protocol(tmp_path):
+    path = tmp_path / 'pack.jsonl'
+    write(path, CLASSIFIER_TYPES)
+    assert registry(path).get('not_a_type')[0].title == 'Step general_emergency'
+
+
+def test_rejected_reload_keeps_serving_the_previous_pack(tmp_path):
+    path = tmp_path / 'pack.jsonl'
+    write(path, CLASSIFIER_TYPES)
+    checked = registry(path).validate()
+    # Different size, so the loader sees the change; nothing was parsed before it
+    write(path, [key for key in CLASSIFIER_TYPES if key != 'burns'], version='2', title='New')
+    assert checked.pack.version == '2'
+    assert checked.get('burns')[0].title == 'Step burns'
+    assert checked.get('choking')[0].title == 'Step choking'
+
+
+def test_shipped_packs_are_checked_at_import():
+    shipped = {name[:-len('.jsonl')] for name in os.listdir(PROTOCOLS_DIR) if name.endswith('.jsonl')}
+    assert shipped - {guidance.GUIDANCE_REGISTRY.locale} <= set(guidance._LOCALE_REGISTRIES)
@@ -0,0 +1,43 @@
+"""Metrics can be read while other threads record"""
+
+import re
+import threading
+
+from lifeline.metrics import MetricsRegistry
+
+
+def test_reading_while_recording_is_consistent():
+    registry = MetricsRegistry(enabled=True)
+    stop = threading.Event()
+
+    def record(worker):
+        n = 0
+        while not stop.is_set():
+            # New stages keep appearing while the reader iterates
+            registry.observe(f"stage_{worker}_{n % 50}", 0.001 * (n % 7), error=n % 5 == 0)
+            n += 1
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(50):
+            for row in registry.snapshot():
+                assert row['errors'] <= row['calls']
+            text = registry.render_prometheus()
+            infinite = dict(re.findall(r'bucket\{stage="([^"]+)",le="\+Inf"\} (\d+)', text))
+            counts = dict(re.findall(r'_count\{stage="([^"]+)"\} (\d+)', text))
+            assert infinite == counts
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def test_buckets_add_up_to_calls():
+    registry = MetricsRegistry(enabled=True)
+    for seconds in (0.00005, 0.003, 0.2, 10):
+        registry.observe('rerun', seconds)
+    [row] = registry.snapshot()
+    assert (row['calls'], row['p50_ms'], row['p99_ms']) == (4, 5.0, float('inf'))
+    assert 'lifeline_stage_seconds_bucket{stage="rerun",le="2.5"} 3' in registry.render_prometheus()
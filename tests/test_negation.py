@@ -0,0 +1,107 @@
+"""Negation scopes discount keywords without hiding affirmed critical findings"""
+
+import pytest
+
+from lifeline.text import NegationScope
+from lifeline.triage import EmergencyClassifier, _split_found, _split_hits
+
+MODES = ('rank', 'score')
+
+# Unpunctuated reports (as speech-to-text produces them): a negation early
+# in the sentence must not reach the critical finding after it
+STILL_CRITICAL = [
+    ("no response he is not breathing", 'cardiac_arrest'),
+    ("i can't wake him he is unresponsive", 'cardiac_arrest'),
+    ("he won't respond he collapsed", 'cardiac_arrest'),
+    ("I can't find a pulse he collapsed", 'cardiac_arrest'),
+    ("there's no time he's having a stroke", 'stroke'),
+    ("my dad is not well he has chest pain", 'general_emergency'),
+    ("she is not ok there is severe bleeding", 'severe_bleeding'),
+]
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('description, emergency_type', STILL_CRITICAL)
+def test_negation_does_not_reach_next_clause(description, emergency_type, mode):
+    severity, found_type, _ = EmergencyClassifier.classify_emergency(description, mode=mode)
+    assert (severity, found_type) == ('critical', emergency_type)
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('description, emergency_type', STILL_CRITICAL)
+def test_batch_agrees_with_single_calls(description, emergency_type, mode):
+    [(severity, found_type, _)] = EmergencyClassifier.classify_batch([description], mode=mode)
+    assert (severity, found_type) == ('critical', emergency_type)
+
+
+NEGATED_CRITICAL = [
+    "He is breathing, not unconscious",
+    "denies chest pain",
+    "no seizure that i saw",
+    "she is not choking badly",
+]
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('description', NEGATED_CRITICAL)
+def test_negated_critical_keyword_is_discounted_to_urgent(description, mode):
+    # Negated-only findings stay urgent (fail-safe) and never pick the type
+    severity, found_type, _ = EmergencyClassifier.classify_emergency(description, mode=mode)
+    assert (severity, found_type) == ('urgent', 'general_emergency')
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_batch_discounts_negated_critical_keywords(mode):
+    results = EmergencyClassifier.classify_batch(NEGATED_CRITICAL, mode=mode)
+    assert {(severity, found_type) for severity, found_type, _ in results} == \
+        {('urgent', 'general_emergency')}
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_affirmed_keyword_picks_the_type_over_a_negated_one(mode):
+    severity, found_type, _ = EmergencyClassifier.classify_emergency(
+        "not choking, there is severe bleeding", mode=mode)
+    assert (severity, found_type) == ('critical', 'severe_bleeding')
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_negated_urgent_keyword_is_discounted(mode):
+    severity, _, _ = EmergencyClassifier.classify_emergency("no bleeding, has a headache", mode=mode)
+    assert severity == 'monitor'
+
+
+def test_keyword_containing_a_cue_is_never_negated():
+    contributions = EmergencyClassifier.score_emergency("not well not breathing").contributions
+    breathing = [c for c in contributions if c.keyword == 'not breathing']
+    assert breathing and breathing[0].negated == 0
+
+
+def test_negated_contribution_has_lower_weight():
+    contributions = {c.keyword: c for c in
+                     EmergencyClassifier.score_emergency("denies bleeding, has a headache").contributions}
+    assert contributions['bleeding'].negated == 1
+    assert contributions['bleeding'].severity_weight < contributions['headache'].severity_weight
+
+
+def test_scope_covers_head_phrase_only():
+    text = "i can't find a pulse he collapsed"
+    scopes = NegationScope().scopes(text)
+    assert [text[start:end].strip() for start, end in scopes] == ['find a pulse']
+
+
+@pytest.mark.parametrize('text', ["not sure if he is breathing", "no idea what happened"])
+def test_doubt_is_not_negation(text):
+    assert NegationScope().scopes(text) == []
+
+
+@pytest.mark.parametrize('text', [
+    "not unconscious but he is unconscious now",
+    "no chest pain, no bleeding, not choking",
+    "no no no not not " * 20 + "unconscious",
+    "denies chest pain " * 30,
+    "she is not breathing and not bleeding",
+])
+def test_rank_split_matches_per_occurrence_split(text):
+    matcher = EmergencyClassifier._matcher
+    affirmed, negated = _split_hits(matcher.automaton, matcher._negation, text)
+    assert _split_found(matcher.automaton, matcher._negation, text) == (set(affirmed), set(negated))
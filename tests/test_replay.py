@@ -0,0 +1,88 @@
+"""Replay compares configurations record by record across worker ranges"""
+
+import json
+
+import pytest
+
+from lifeline import replay
+from lifeline.triage import EmergencyClassifier
+
+# Without critical keywords every critical record changes
+CANDIDATE = ({'CRITICAL_KEYWORDS': []}, None)
+
+RECORDS = [
+    {'id': 'a', 'description': 'he collapsed and is not breathing'},
+    {'id': 'b', 'description': 'minor cut on finger'},
+    {'id': 'c', 'description': 5},
+    {'id': 'd', 'description': 'severe bleeding from the leg'},
+    {'id': 'e', 'description': ['not', 'breathing']},
+]
+
+
+def write_corpus(path, repeat):
+    """JSONL with blank and malformed lines mixed in; returns {id: line number}"""
+    lines = []
+    expected = {}
+    for n in range(repeat):
+        for record in RECORDS:
+            record = dict(record, id=f"{record['id']}{n}")
+            lines.append(json.dumps(record))
+            expected[record['id']] = len(lines)
+        lines += ['', 'not json', '[1, 2]']
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return expected
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_line_numbers_survive_the_range_merge(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(replay, 'MIN_RANGE_BYTES', 256)
+    path = tmp_path / 'corpus.jsonl'
+    expected = write_corpus(path, 40)
+    assert len(replay.split_ranges(str(path), workers)) > 1
+
+    report = replay.replay_file(str(path), CANDIDATE, workers=workers)
+    changed = {record_id: line for line, record_id, _, _ in report.changed}
+    assert changed == {record_id: line for record_id, line in expected.items()
+                       if record_id[0] in 'ad'}
+    assert report.records == 3 * 40
+    # Two non-string descriptions, a malformed line and a non-object per repeat
+    assert report.errors == 4 * 40
+
+
+def test_non_string_description_is_an_error_not_a_crash(tmp_path):
+    path = tmp_path / 'corpus.jsonl'
+    path.write_text('{"description": 5}\n{"description": "not breathing"}\n', encoding='utf-8')
+    report = replay.replay_file(str(path), CANDIDATE, workers=1)
+    assert (report.records, report.errors, len(report.changed)) == (1, 1, 1)
+    assert report.changed[0][0] == 2
+
+
+@pytest.mark.parametrize('overrides', [
+    {'CRITICAL_KEYWORDS': 'not breathing'},
+    {'NOT_TYPOS': [1, 2]},
+    {'EMERGENCY_TYPES': ['stroke']},
+    {'EMERGENCY_TYPES': {'stroke': 'face drooping'}},
+])
+def test_with_config_rejects_values_that_are_not_word_lists(overrides):
+    [key] = overrides
+    with pytest.raises(ValueError, match=key):
+        EmergencyClassifier.with_config(**overrides)
+
+
+def test_replay_rejects_a_bad_candidate_before_starting(tmp_path):
+    path = tmp_path / 'corpus.jsonl'
+    path.write_text('{"description": "not breathing"}\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='URGENT_KEYWORDS'):
+        replay.replay_file(str(path), ({'URGENT_KEYWORDS': 'chest pain'}, None), workers=1)
+
+
+def test_records_replay_in_their_language(tmp_path):
+    path = tmp_path / 'corpus.jsonl'
+    path.write_text('{"id": 1, "description": "se desmayó y no respira"}\n'
+                    '{"id": 2, "description": "no respira", "locale": "xx"}\n', encoding='utf-8')
+    # The candidate's English lists are still extended with the Spanish ones
+    candidate = ({'URGENT_KEYWORDS': ['chest pain']}, None)
+    report = replay.replay_file(str(path), candidate, workers=1)
+    assert (report.records, report.errors) == (1, 1)
+    assert report.types == {('cardiac_arrest', 'cardiac_arrest'): 1}
+    assert report.severities == {('critical', 'critical'): 1}
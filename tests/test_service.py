@@ -0,0 +1,133 @@
+"""The ASGI triage service: input validation, worker threads and bounded caches"""
+
+import asyncio
+import json
+import threading
+
+from lifeline.service import GuidanceResponses, TriageService
+
+
+def request(method, path, payload=None, query=b''):
+    """(status, decoded JSON body) of one request against a fresh service"""
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        service = TriageService(queue_size=4, workers=1)
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query}
+        await service(scope, receive, send)
+        await service._shutdown()
+
+    asyncio.run(run())
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+def test_triage():
+    status, body = request('POST', '/v1/triage', {'description': 'he collapsed and is not breathing'})
+    assert status == 200
+    assert (body['severity'], body['emergency_type']) == ('critical', 'cardiac_arrest')
+
+
+def test_triage_rejects_non_string_description():
+    status, body = request('POST', '/v1/triage', {'description': 5})
+    assert status == 400
+
+
+def test_batch_rejects_non_string_field():
+    for field in (5, ['description'], {'a': 1}):
+        status, body = request('POST', '/v1/triage/batch', {'records': [], 'field': field})
+        assert status == 400
+        assert body['error'] == '"field" must be a string'
+
+
+def test_batch_reports_bad_records_individually():
+    records = [{'description': 5}, 'text', {'description': ['x']}, {'description': 'severe bleeding'}]
+    status, body = request('POST', '/v1/triage/batch', {'records': records})
+    assert status == 200
+    results = body['results']
+    assert [r['index'] for r in results] == [0, 1, 2, 3]
+    assert results[0]['error'] == "Field 'description' is not a string"
+    assert results[1]['error'] == 'Record is not a JSON object'
+    assert 'error' in results[2]
+    assert results[3]['severity'] == 'critical'
+
+
+PARITY = [
+    {'description': 'se desmayó y no respira'},
+    {'description': 'se desmayo y no respira'},
+    {'description': 'ông ấy bất tỉnh và không thở'},
+    {'description': 'she collapsed and is not breathing'},
+    {'description': 'mi hijo se está ahogando', 'locale': 'es'},
+    {'description': 'chest pain and sweating', 'locale': 'en'},
+]
+
+
+def test_batch_classifies_like_single_triage():
+    status, body = request('POST', '/v1/triage/batch', {'records': PARITY})
+    assert status == 200
+    for record, batched in zip(PARITY, body['results']):
+        status, single = request('POST', '/v1/triage', record)
+        assert status == 200
+        assert {key: batched[key] for key in single} == single
+
+
+def test_spanish_batch_record_is_critical():
+    status, body = request('POST', '/v1/triage/batch', {'records': [PARITY[0]]})
+    [result] = body['results']
+    assert (result['severity'], result['emergency_type'], result['locale']) == \
+        ('critical', 'cardiac_arrest', 'es')
+
+
+def test_batch_reports_bad_locales_individually():
+    records = [{'description': 'not breathing', 'locale': 5},
+               {'description': 'not breathing', 'locale': 'xx'}]
+    status, body = request('POST', '/v1/triage/batch', {'records': records})
+    assert status == 200
+    assert [r['error'] for r in body['results']] == [
+        "Field 'locale' is not a string", "No keyword set for locale 'xx'"]
+
+
+def test_blocked_handler_does_not_block_other_requests():
+    release = threading.Event()
+
+    def blocking(body):
+        release.wait(5)
+        return {'done': body}
+
+    async def run():
+        service = TriageService(queue_size=4, workers=2)
+        slow = asyncio.ensure_future(service.submit(blocking, b'slow'))
+        # The event loop and the second worker stay free while the first blocks
+        fast = await asyncio.wait_for(service.submit(lambda body: {'done': body}, b'fast'), 5)
+        blocked = not slow.done()
+        release.set()
+        results = fast, await slow, blocked
+        await service._shutdown()
+        return results
+
+    assert asyncio.run(run()) == ({'done': b'fast'}, {'done': b'slow'}, True)
+
+
+def test_guidance_echoes_type():
+    status, body = request('GET', '/v1/guidance/choking')
+    assert status == 200
+    assert body['emergency_type'] == 'choking' and body['known'] is True
+    status, body = request('GET', '/v1/guidance/not_a_type')
+    assert body['emergency_type'] == 'not_a_type' and body['known'] is False
+    assert body['steps']
+
+
+def test_unknown_guidance_types_share_one_cache_entry():
+    responses = GuidanceResponses()
+    for n in range(1000):
+        body = json.loads(responses.get(f"made_up_{n}"))
+        assert body['emergency_type'] == f"made_up_{n}"
+    responses.get('choking')
+    assert len(responses._bodies) == 2
@@ -0,0 +1,30 @@
+"""Theme markup: the inlined stylesheet's font URLs must resolve"""
+
+import os
+import re
+
+from lifeline.theme import FONTS_URL, STATIC_DIR, THEME_SOURCE, inline_style, is_stale
+
+FONT_URLS = re.compile(r"url\('([^']+\.woff2)'\)")
+
+
+def test_stylesheet_fonts_are_shipped():
+    with open(THEME_SOURCE, encoding='utf-8') as f:
+        urls = FONT_URLS.findall(f.read())
+    assert urls
+    for url in urls:
+        assert os.path.exists(os.path.join(STATIC_DIR, url))
+
+
+def test_inlined_fonts_point_at_the_served_folder():
+    urls = FONT_URLS.findall(inline_style(fonts_url=FONTS_URL))
+    assert urls and all(url.startswith(FONTS_URL) for url in urls)
+
+
+def test_inlined_fonts_are_dropped_without_static_serving():
+    css = inline_style()
+    assert '@font-face' in css and not FONT_URLS.search(css)
+
+
+def test_built_stylesheet_is_current():
+    assert not is_stale()
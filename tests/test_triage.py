@@ -0,0 +1,39 @@
+"""EmergencyClassifier: modes, batch parity and configuration overrides"""
+
+import pytest
+
+from lifeline.triage import EmergencyClassifier
+
+DESCRIPTIONS = [
+    "Person collapsed and is not breathing",
+    "Heavy bleeding from deep cut on arm",
+    "Child is choking on food",
+    "small burn on the hand from the stove, some bleeding",
+    "minor cut and a bruise, also a headache",
+    "sprain and severe pain in the ankle",
+    "he swallowed bleach and is vomiting blood",
+    "face drooping and arm weakness",
+    "my friend feels dizzy",
+    "help",
+    "",
+    "no bleeding, has a headache",
+]
+
+
+@pytest.mark.parametrize('mode', ('rank', 'score'))
+def test_batch_matches_single_calls(mode):
+    single = [EmergencyClassifier.classify_emergency(d, mode=mode) for d in DESCRIPTIONS]
+    assert EmergencyClassifier.classify_batch(DESCRIPTIONS, mode=mode) == single
+
+
+def test_batch_defaults_to_configured_mode(monkeypatch):
+    import lifeline.triage as triage
+
+    for mode in ('rank', 'score'):
+        monkeypatch.setattr(triage, 'TRIAGE_MODE', mode)
+        expected = [EmergencyClassifier.classify_emergency(d) for d in DESCRIPTIONS]
+        assert EmergencyClassifier.classify_batch(DESCRIPTIONS) == expected
+
+
+def test_unclear_input_escalates():
+    assert EmergencyClassifier.classify_emergency('hm')[:2] == ('urgent', 'general_emergency')
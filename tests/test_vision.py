@@ -0,0 +1,117 @@
+"""Image analysis backends and the process-pool analyzer"""
+
+import io
+import logging
+import time
+
+import pytest
+
+PIL = pytest.importorskip('PIL.Image')
+pytest.importorskip('numpy')
+
+from lifeline.imaging import ingest_image  # noqa: E402
+from lifeline import vision  # noqa: E402
+from lifeline.session import IncidentState  # noqa: E402
+from lifeline.triage import EmergencyClassifier  # noqa: E402
+from lifeline.vision import NO_ANALYSIS, ImageAnalyzer, ImageBackend, register_backend  # noqa: E402
+
+
+@register_backend
+class FailingBackend(ImageBackend):
+    name = 'test-failing'
+
+    def analyze(self, image):
+        raise ValueError('backend bug')
+
+
+@register_backend
+class SlowBackend(ImageBackend):
+    name = 'test-slow'
+
+    def analyze(self, image):
+        time.sleep(5)
+        return self.result(None)
+
+
+def poll_until(analyzer, image, seconds=30):
+    deadline = time.monotonic() + seconds
+    while (result := analyzer.poll(image)) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return result
+
+
+def upload(colour):
+    buffer = io.BytesIO()
+    PIL.new('RGB', (64, 64), colour).save(buffer, 'PNG')
+    buffer.seek(0)
+    return ingest_image(buffer)
+
+
+def test_backend_must_implement_analyze():
+    with pytest.raises(TypeError):
+        ImageBackend()
+
+
+def test_hue_backend_runs_in_the_pool():
+    analyzer = ImageAnalyzer()
+    try:
+        result = analyzer.analyze(upload((140, 10, 10)))
+    finally:
+        analyzer.reset()
+    assert result['visible_injury_present'] is True
+    assert result['pattern_type'] == 'blood_like_region'
+
+
+def test_backend_failure_is_logged_and_falls_back(caplog):
+    analyzer = ImageAnalyzer(backend=FailingBackend.name)
+    try:
+        with caplog.at_level(logging.ERROR, logger='lifeline.vision'):
+            assert analyzer.analyze(upload((10, 10, 140))) == NO_ANALYSIS
+    finally:
+        analyzer.reset()
+    assert 'backend bug' in caplog.text
+
+
+def test_unknown_backend_falls_back(caplog):
+    analyzer = ImageAnalyzer(backend='no-such-backend')
+    with caplog.at_level(logging.WARNING, logger='lifeline.vision'):
+        analyzer.prefetch(upload((10, 140, 10)))
+        assert analyzer.analyze(upload((10, 140, 10))) == NO_ANALYSIS
+    assert 'Unknown image backend' in caplog.text
+
+
+def test_poll_returns_the_result_once_the_pool_answers(monkeypatch):
+    analyzer = ImageAnalyzer()
+    monkeypatch.setattr(vision, 'IMAGE_ANALYZER', analyzer)
+    image = upload((140, 10, 10))
+    try:
+        analyzer.prefetch(image)
+        result = poll_until(analyzer, image)
+        # The triage entry point reads the same presence dict without blocking
+        assert EmergencyClassifier.analyze_image_for_injuries(image, wait=False) == result
+    finally:
+        analyzer.reset()
+    assert result['pattern_type'] == 'blood_like_region'
+
+
+def test_poll_times_out_to_no_analysis():
+    analyzer = ImageAnalyzer(backend=SlowBackend.name, timeout=0.2)
+    image = upload((140, 10, 10))
+    try:
+        assert analyzer.poll(image) is None
+        assert poll_until(analyzer, image) == NO_ANALYSIS
+    finally:
+        analyzer.reset(kill=True)
+
+
+def test_no_image_needs_no_poll():
+    result = EmergencyClassifier.analyze_image_for_injuries(None, wait=False)
+    assert result['visible_injury_present'] is False
+
+
+def test_image_analysis_survives_a_reload():
+    incident = IncidentState()
+    incident.image_analysis = {'visible_injury_present': True,
+                               'pattern_type': 'burn_like_region', 'note': 'seen'}
+    assert IncidentState.from_dict(incident.to_dict()).image_analysis == incident.image_analysis